@@ -8,6 +8,7 @@ from .exceptions import (
     AuthenticationError,
     FileNotFoundError,
     PermissionError,
+    OperationTimeoutError,
     ConfigurationError,
     ValidationError
 )
@@ -24,6 +25,7 @@ __all__ = [
     "AuthenticationError", 
     "FileNotFoundError",
     "PermissionError",
+    "OperationTimeoutError",
     "ConfigurationError",
     "ValidationError"
 ]
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""Directory-listing and attribute cache for network shares."""
+
+import logging
+import posixpath
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .smb_fs import SMBFileInfo
+
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(path: str) -> str:
+    return path.replace('\\', '/').strip('/')
+
+
+class CacheEntry:
+    """A cached listing or attribute lookup."""
+    
+    def __init__(self, value: Any, version: Optional[float], expires_at: float):
+        self.value = value
+        self.version = version
+        self.expires_at = expires_at
+
+
+class MetadataCache:
+    """LRU cache of SMBFileInfo listings and attributes keyed by share and path.
+    
+    Entries are served for ``ttl`` seconds. An expired listing that recorded
+    its directory's last_write_time is revalidated by comparing it with the
+    directory's current attributes, which is one getAttributes call instead of
+    a new listing. At most ``max_entries`` entries are kept, least recently used
+    first out. Changes made through the server invalidate the affected entries;
+    changes made by other clients show up once an entry expires (or, for file
+    sizes inside a still-valid listing, once the directory changes).
+    """
+    
+    def __init__(self, max_entries: int = 10000, ttl: float = 30.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str, str], CacheEntry]" = OrderedDict()
+        self._generation = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+    
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+    
+    def _count(self, share: str, outcome: str) -> None:
+        stats = self._stats.setdefault(share, {"hits": 0, "revalidated": 0, "misses": 0, "invalidations": 0})
+        stats[outcome] += 1
+    
+    def _lookup(self, key: Tuple[str, str, str]) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+    
+    def _store(self, key: Tuple[str, str, str], value: Any, version: Optional[float], generation: int) -> None:
+        # Skip results loaded while an invalidation happened; they may predate the change
+        if generation != self._generation:
+            return
+        self._entries[key] = CacheEntry(value, version, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    async def get_listing(
+        self,
+        share: str,
+        path: str,
+        load: Callable[[], Awaitable[Tuple[List[SMBFileInfo], Optional[float]]]],
+        current_version: Callable[[], Awaitable[Optional[float]]]
+    ) -> List[SMBFileInfo]:
+        """Directory listing from cache, revalidated or loaded as needed.
+        
+        ``load`` returns the entries and the directory's last_write_time;
+        ``current_version`` returns the directory's last_write_time now.
+        """
+        if not self.enabled:
+            entries, _ = await load()
+            return entries
+        
+        key = (share, "listing", _normalize(path))
+        entry = self._lookup(key)
+        if entry is not None and time.monotonic() < entry.expires_at:
+            self._count(share, "hits")
+            return entry.value
+        
+        generation = self._generation
+        if entry is not None and entry.version is not None:
+            try:
+                version = await current_version()
+            except Exception as e:
+                logger.debug(f"Could not revalidate listing of {share}:{path}: {e}")
+                version = None
+            if version is not None and version == entry.version and key in self._entries:
+                entry.expires_at = time.monotonic() + self.ttl
+                self._count(share, "revalidated")
+                return entry.value
+        
+        self._count(share, "misses")
+        entries, version = await load()
+        self._store(key, entries, version, generation)
+        return entries
+    
+    async def get_info(self, share: str, path: str, load: Callable[[], Awaitable[SMBFileInfo]]) -> SMBFileInfo:
+        """Attributes from cache, from a cached listing of the parent, or loaded."""
+        if not self.enabled:
+            return await load()
+        
+        normalized = _normalize(path)
+        key = (share, "info", normalized)
+        now = time.monotonic()
+        
+        entry = self._lookup(key)
+        if entry is not None and now < entry.expires_at:
+            self._count(share, "hits")
+            return entry.value
+        
+        parent = self._lookup((share, "listing", posixpath.dirname(normalized)))
+        if parent is not None and now < parent.expires_at:
+            name = posixpath.basename(normalized)
+            for info in parent.value:
+                if info.name == name:
+                    self._count(share, "hits")
+                    return info
+        
+        self._count(share, "misses")
+        generation = self._generation
+        info = await load()
+        self._store(key, info, None, generation)
+        return info
+    
+    def invalidate(self, share: str, path: str) -> None:
+        """Drop the entries a change to ``path`` makes stale: its own and its parent's listing."""
+        normalized = _normalize(path)
+        self._generation += 1
+        self._count(share, "invalidations")
+        for key in (
+            (share, "info", normalized),
+            (share, "listing", normalized),
+            (share, "listing", posixpath.dirname(normalized)),
+        ):
+            self._entries.pop(key, None)
+    
+    def clear(self, share: Optional[str] = None) -> None:
+        """Drop all entries, or those of one share."""
+        self._generation += 1
+        if share is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key[0] == share]:
+            del self._entries[key]
+    
+    def get_stats(self, share: str) -> Dict[str, Any]:
+        """Entry counts and hit rate for one share."""
+        stats = self._stats.get(share, {"hits": 0, "revalidated": 0, "misses": 0, "invalidations": 0})
+        served = stats["hits"] + stats["revalidated"]
+        lookups = served + stats["misses"]
+        return {
+            **stats,
+            "entries": sum(1 for key in self._entries if key[0] == share),
+            "total_entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hit_rate": round(served / lookups, 3) if lookups else None,
+        }
@@ -32,13 +32,18 @@ def create_sample_config(output_path: str) -> None:
             "allowed_extensions": [".txt", ".py", ".json", ".md", ".yaml", ".yml", ".xml", ".csv"],
             "blocked_extensions": [".exe", ".bat", ".cmd", ".ps1", ".sh"],
             "max_file_size": "100MB",
+            "max_chunk_size": "1MB",
             "allowed_paths": [],
             "blocked_paths": ["/etc", "/root", "/sys", "/proc"],
             "enable_write": True,
             "enable_delete": False
         },
         "logging_level": "INFO",
-        "max_connections": 10
+        "max_connections": 10,
+        "keepalive_interval": 60,
+        "operation_timeout": 300,
+        "cache_ttl": 30,
+        "cache_max_entries": 10000
     }
     
     with open(output_path, 'w') as f:
@@ -73,6 +73,9 @@ class SecurityConfig(BaseModel):
         description="Blocked file extensions"
     )
     max_file_size: str = Field(default="100MB", description="Maximum file size")
+    max_chunk_size: str = Field(
+        default="1MB", description="Maximum bytes read or written by one chunked (offset/length) operation"
+    )
     allowed_paths: List[str] = Field(
         default_factory=list,
         description="Allowed paths (empty means all paths allowed)"
@@ -95,7 +98,17 @@ class NetworkMCPConfig(BaseModel):
         default_factory=SecurityConfig, description="Security settings"
     )
     logging_level: str = Field(default="INFO", description="Logging level")
-    max_connections: int = Field(default=10, description="Maximum concurrent connections")
+    max_connections: int = Field(default=10, description="Maximum pooled SMB sessions (and worker threads) per share")
+    keepalive_interval: int = Field(
+        default=60, description="Seconds between SMB echo keepalives on idle pooled sessions (0 disables)"
+    )
+    operation_timeout: int = Field(
+        default=300, description="Seconds before an SMB operation, including waiting for a session, is abandoned (0 disables)"
+    )
+    cache_ttl: int = Field(
+        default=30, description="Seconds directory listings and file attributes are cached (0 disables)"
+    )
+    cache_max_entries: int = Field(default=10000, description="Maximum cached listings and attribute entries")
 
 
 def parse_file_size(size_str: str) -> int:
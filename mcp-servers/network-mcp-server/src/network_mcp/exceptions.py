@@ -26,6 +26,11 @@ class PermissionError(NetworkFileSystemError):
     pass
 
 
+class OperationTimeoutError(NetworkFileSystemError):
+    """Network operation timed out."""
+    pass
+
+
 class ConfigurationError(NetworkMCPError):
     """Configuration error."""
     pass
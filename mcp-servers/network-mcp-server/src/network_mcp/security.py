@@ -18,6 +18,7 @@ class SecurityValidator:
     def __init__(self, config: SecurityConfig):
         self.config = config
         self.max_file_size_bytes = parse_file_size(config.max_file_size)
+        self.max_chunk_size_bytes = parse_file_size(config.max_chunk_size)
     
     def validate_file_extension(self, file_path: str) -> None:
         """Validate file extension against allow/block lists."""
@@ -69,6 +70,13 @@ class SecurityValidator:
                 f"File size {file_size_mb:.2f}MB exceeds maximum {max_size_mb:.2f}MB"
             )
     
+    def validate_chunk_size(self, chunk_size: int) -> None:
+        """Validate a chunked read/write length against the chunk limit."""
+        if chunk_size > self.max_chunk_size_bytes:
+            raise ValidationError(
+                f"Chunk of {chunk_size} bytes exceeds maximum chunk size {self.config.max_chunk_size}"
+            )
+    
     def validate_write_operation(self, file_path: str) -> None:
         """Validate if write operations are allowed."""
         if not self.config.enable_write:
@@ -93,6 +101,7 @@ class SecurityValidator:
         """Get a summary of current validation rules."""
         summary = []
         summary.append(f"Max file size: {self.config.max_file_size}")
+        summary.append(f"Max chunk size: {self.config.max_chunk_size}")
         summary.append(f"Write enabled: {self.config.enable_write}")
         summary.append(f"Delete enabled: {self.config.enable_delete}")
         
@@ -1,9 +1,12 @@
 """Main MCP server implementation for network filesystem access."""
 
 import asyncio
+import codecs
 import json
 import logging
 import os
+import posixpath
+import time
 from typing import Any, Dict, List, Optional, Union
 
 import mcp.server.stdio
@@ -14,6 +17,8 @@ from mcp.server.models import InitializationOptions
 from .config import NetworkMCPConfig, SMBShareConfig
 from .smb_fs import AsyncSMBConnection, SMBFileInfo
 from .security import SecurityValidator
+from .cache import MetadataCache
+from .walk import EntryFilter, TreeSummary, TreeWalker
 from .exceptions import (
     NetworkMCPError, 
     NetworkFileSystemError, 
@@ -36,6 +41,7 @@ class NetworkMCPServer:
         self.server = Server("network-mcp-server")
         self.security = SecurityValidator(config.security)
         self.connections: Dict[str, AsyncSMBConnection] = {}
+        self.metadata_cache = MetadataCache(config.cache_max_entries, config.cache_ttl)
         
         self._setup_logging()
         self._register_tools()
@@ -74,9 +80,125 @@ class NetworkMCPServer:
                         "required": ["share_name"]
                     }
                 ),
+                types.Tool(
+                    name="walk_network_directory",
+                    description=(
+                        "Recursively list a network directory, listing subdirectories concurrently. "
+                        "Use mode 'summarize_tree' for per-directory file counts and byte totals"
+                    ),
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "share_name": {
+                                "type": "string",
+                                "description": "Name of the configured network share"
+                            },
+                            "path": {
+                                "type": "string",
+                                "description": "Directory to start from (relative to share root)",
+                                "default": ""
+                            },
+                            "max_depth": {
+                                "type": "integer",
+                                "description": "Levels to descend (1 lists only the starting directory)",
+                                "default": 3,
+                                "minimum": 1
+                            },
+                            "mode": {
+                                "type": "string",
+                                "enum": ["entries", "summarize_tree"],
+                                "description": "List entries, or summarize file counts and bytes per directory",
+                                "default": "entries"
+                            },
+                            "pattern": {
+                                "type": "string",
+                                "description": "Glob matched against entry names, or paths if it contains '/' (entries mode)"
+                            },
+                            "regex": {
+                                "type": "string",
+                                "description": "Regular expression searched in entry paths (entries mode)"
+                            },
+                            "entry_type": {
+                                "type": "string",
+                                "enum": ["any", "file", "directory"],
+                                "description": "Only return files or directories (entries mode)",
+                                "default": "any"
+                            },
+                            "max_results": {
+                                "type": "integer",
+                                "description": "Stop after this many entries (directories in summarize_tree mode)",
+                                "default": 500,
+                                "minimum": 1
+                            },
+                            "concurrency": {
+                                "type": "integer",
+                                "description": "Directories listed in parallel (capped at max_connections)",
+                                "default": 4,
+                                "minimum": 1
+                            }
+                        },
+                        "required": ["share_name"]
+                    }
+                ),
+                types.Tool(
+                    name="find_network_files",
+                    description=(
+                        "Search a network share recursively for entries matching a glob or regular expression, "
+                        "stopping at max_results. Matches are streamed as progress notifications when requested"
+                    ),
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "share_name": {
+                                "type": "string",
+                                "description": "Name of the configured network share"
+                            },
+                            "pattern": {
+                                "type": "string",
+                                "description": "Glob matched against entry names, or paths if it contains '/' (e.g. '*.csv')"
+                            },
+                            "regex": {
+                                "type": "string",
+                                "description": "Regular expression searched in entry paths"
+                            },
+                            "path": {
+                                "type": "string",
+                                "description": "Directory to search from (relative to share root)",
+                                "default": ""
+                            },
+                            "max_depth": {
+                                "type": "integer",
+                                "description": "Levels to descend (unlimited if omitted)",
+                                "minimum": 1
+                            },
+                            "entry_type": {
+                                "type": "string",
+                                "enum": ["any", "file", "directory"],
+                                "description": "Kind of entries to match",
+                                "default": "file"
+                            },
+                            "max_results": {
+                                "type": "integer",
+                                "description": "Stop searching after this many matches",
+                                "default": 100,
+                                "minimum": 1
+                            },
+                            "concurrency": {
+                                "type": "integer",
+                                "description": "Directories listed in parallel (capped at max_connections)",
+                                "default": 4,
+                                "minimum": 1
+                            }
+                        },
+                        "required": ["share_name"]
+                    }
+                ),
                 types.Tool(
                     name="read_network_file",
-                    description="Read contents of a network file",
+                    description=(
+                        "Read contents of a network file. Pass offset and/or length to read one chunk "
+                        "of a large file; the response reports the next offset to continue from"
+                    ),
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -92,6 +214,16 @@ class NetworkMCPServer:
                                 "type": "string",
                                 "description": "Text encoding for the file",
                                 "default": "utf-8"
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "description": "Byte offset to start reading from (chunked read)",
+                                "minimum": 0
+                            },
+                            "length": {
+                                "type": "integer",
+                                "description": "Maximum bytes to read (chunked read, capped at the configured max chunk size)",
+                                "minimum": 1
                             }
                         },
                         "required": ["share_name", "file_path"]
@@ -99,7 +231,10 @@ class NetworkMCPServer:
                 ),
                 types.Tool(
                     name="write_network_file",
-                    description="Write contents to a network file",
+                    description=(
+                        "Write contents to a network file. Pass offset to write one chunk of a large "
+                        "file in place (offset 0 with truncate starts a new file)"
+                    ),
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -119,6 +254,16 @@ class NetworkMCPServer:
                                 "type": "string",
                                 "description": "Text encoding for the file",
                                 "default": "utf-8"
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "description": "Byte offset to write the content at (chunked write)",
+                                "minimum": 0
+                            },
+                            "truncate": {
+                                "type": "boolean",
+                                "description": "Truncate the file before a chunked write",
+                                "default": False
                             }
                         },
                         "required": ["share_name", "file_path", "content"]
@@ -199,6 +344,10 @@ class NetworkMCPServer:
             try:
                 if name == "list_network_directory":
                     return await self._handle_list_directory(**arguments)
+                elif name == "walk_network_directory":
+                    return await self._handle_walk_directory(**arguments)
+                elif name == "find_network_files":
+                    return await self._handle_find_files(**arguments)
                 elif name == "read_network_file":
                     return await self._handle_read_file(**arguments)
                 elif name == "write_network_file":
@@ -230,9 +379,22 @@ class NetworkMCPServer:
             share_config = self.config.shares[share_name]
             
             if isinstance(share_config, SMBShareConfig):
-                connection = AsyncSMBConnection(share_config)
-                await connection.connect()
+                connection = AsyncSMBConnection(
+                    share_config,
+                    max_connections=self.config.max_connections,
+                    keepalive_interval=self.config.keepalive_interval,
+                    operation_timeout=self.config.operation_timeout,
+                    cache=self.metadata_cache,
+                    name=share_name
+                )
+                # Registered before connecting so concurrent calls share the pool
                 self.connections[share_name] = connection
+                try:
+                    await connection.connect()
+                except Exception:
+                    self.connections.pop(share_name, None)
+                    await connection.disconnect()
+                    raise
             else:
                 raise ConfigurationError(f"Unsupported share type for '{share_name}'")
         
@@ -269,17 +431,255 @@ class NetworkMCPServer:
         
         return [types.TextContent(type="text", text="\n".join(result_lines))]
     
-    async def _handle_read_file(self, share_name: str, file_path: str, encoding: str = "utf-8") -> List[types.TextContent]:
+    async def _handle_walk_directory(
+        self,
+        share_name: str,
+        path: str = "",
+        max_depth: int = 3,
+        mode: str = "entries",
+        pattern: Optional[str] = None,
+        regex: Optional[str] = None,
+        entry_type: str = "any",
+        max_results: int = 500,
+        concurrency: int = 4
+    ) -> List[types.TextContent]:
+        """Handle recursive directory listing and tree summaries."""
+        if mode == "summarize_tree":
+            return await self._summarize_tree(share_name, path, max_depth, max_results, concurrency)
+        if mode != "entries":
+            raise ValidationError(f"Unknown mode '{mode}': use 'entries' or 'summarize_tree'")
+        
+        entry_filter = EntryFilter(pattern, regex, entry_type)
+        return await self._walk_matches(
+            share_name, path, max_depth, entry_filter, max_results, concurrency,
+            title=f"Walk of {share_name}:{path or '/'} (max depth {max_depth})"
+        )
+    
+    async def _handle_find_files(
+        self,
+        share_name: str,
+        pattern: Optional[str] = None,
+        regex: Optional[str] = None,
+        path: str = "",
+        max_depth: Optional[int] = None,
+        entry_type: str = "file",
+        max_results: int = 100,
+        concurrency: int = 4
+    ) -> List[types.TextContent]:
+        """Handle recursive file search."""
+        if not pattern and not regex:
+            raise ValidationError("Provide a glob pattern or a regex to search for")
+        
+        entry_filter = EntryFilter(pattern, regex, entry_type)
+        criteria = " and ".join(
+            part for part in (f"pattern '{pattern}'" if pattern else "", f"regex '{regex}'" if regex else "") if part
+        )
+        return await self._walk_matches(
+            share_name, path, max_depth, entry_filter, max_results, concurrency,
+            title=f"Search of {share_name}:{path or '/'} for {criteria}"
+        )
+    
+    def _tree_walker(
+        self,
+        connection: AsyncSMBConnection,
+        path: str,
+        max_depth: Optional[int],
+        concurrency: int
+    ) -> TreeWalker:
+        """Create a walker that stays out of blocked paths."""
+        self.security.validate_file_path(path)
+        
+        def can_descend(directory: str) -> bool:
+            try:
+                self.security.validate_file_path(directory)
+                return True
+            except ValidationError:
+                return False
+        
+        return TreeWalker(
+            connection,
+            root=path,
+            max_depth=max_depth,
+            concurrency=min(concurrency, self.config.max_connections),
+            can_descend=can_descend
+        )
+    
+    async def _walk_matches(
+        self,
+        share_name: str,
+        path: str,
+        max_depth: Optional[int],
+        entry_filter: EntryFilter,
+        max_results: int,
+        concurrency: int,
+        title: str
+    ) -> List[types.TextContent]:
+        """Walk a tree collecting filtered entries, streaming each batch of matches."""
+        if max_results < 1:
+            raise ValidationError("max_results must be at least 1")
+        
+        connection = await self._get_connection(share_name)
+        walker = self._tree_walker(connection, path, max_depth, concurrency)
+        
+        start = time.perf_counter()
+        matches: List[SMBFileInfo] = []
+        capped = False
+        
+        listings = walker.walk()
+        try:
+            async for _, _, entries in listings:
+                batch = [entry for entry in entries if entry_filter.matches(entry)]
+                if not batch:
+                    continue
+                
+                batch = batch[:max_results - len(matches)]
+                matches.extend(batch)
+                await self._report_progress(
+                    len(matches),
+                    "\n".join(self._format_entry(entry) for entry in batch),
+                    total=max_results
+                )
+                
+                if len(matches) >= max_results:
+                    capped = True
+                    break
+        finally:
+            await listings.aclose()
+        
+        elapsed = time.perf_counter() - start
+        result_lines = [title, "-" * 50]
+        result_lines.extend(self._format_entry(entry) for entry in matches)
+        if not matches:
+            result_lines.append("(no matching entries)")
+        
+        result_lines.append("")
+        result_lines.append(
+            f"{len(matches)} match(es) from {walker.entries_seen} entries in "
+            f"{walker.directories_listed} directories ({elapsed:.2f}s)"
+        )
+        result_lines.extend(self._walk_notes(walker, capped, max_results))
+        
+        return [types.TextContent(type="text", text="\n".join(result_lines))]
+    
+    async def _summarize_tree(
+        self,
+        share_name: str,
+        path: str,
+        max_depth: int,
+        max_results: int,
+        concurrency: int
+    ) -> List[types.TextContent]:
+        """Walk a tree and report file counts and byte totals per directory."""
+        if max_results < 1:
+            raise ValidationError("max_results must be at least 1")
+        
+        connection = await self._get_connection(share_name)
+        walker = self._tree_walker(connection, path, max_depth, concurrency)
+        summary = TreeSummary(path)
+        
+        start = time.perf_counter()
+        listings = walker.walk()
+        try:
+            async for directory, _, entries in listings:
+                summary.add_listing(directory, entries)
+                await self._report_progress(walker.directories_listed, f"Listed {directory or '/'}")
+        finally:
+            await listings.aclose()
+        elapsed = time.perf_counter() - start
+        
+        rows = summary.rows()
+        root_depth = len(summary.root.split("/")) if summary.root else 0
+        
+        result_lines = [f"Tree summary of {share_name}:{path or '/'} (max depth {max_depth})", "-" * 50]
+        for directory, stats in rows[:max_results]:
+            depth = (len(directory.split("/")) if directory else 0) - root_depth
+            name = posixpath.basename(directory) if directory != summary.root else (directory or "/")
+            if directory not in summary.listed:
+                result_lines.append(f"{'  ' * depth}📁 {name} (not scanned)")
+                continue
+            result_lines.append(
+                f"{'  ' * depth}📁 {name} - {stats['total_files']} files, "
+                f"{self._format_file_size(stats['total_bytes'])} "
+                f"(direct: {stats['files']} files, {self._format_file_size(stats['bytes'])}, "
+                f"{stats['subdirectories']} subdirectories)"
+            )
+        
+        result_lines.append("")
+        result_lines.append(
+            f"{walker.directories_listed} directories and {walker.entries_seen} entries scanned ({elapsed:.2f}s)"
+        )
+        if len(rows) > max_results:
+            result_lines.append(f"Showing {max_results} of {len(rows)} directories (max_results)")
+        if max_depth:
+            result_lines.append(f"Totals only include entries down to depth {max_depth}")
+        result_lines.extend(self._walk_notes(walker, False, max_results))
+        
+        return [types.TextContent(type="text", text="\n".join(result_lines))]
+    
+    def _walk_notes(self, walker: TreeWalker, capped: bool, max_results: int) -> List[str]:
+        """Lines explaining why a walk result may be incomplete."""
+        notes = []
+        if capped:
+            notes.append(f"Stopped at max_results ({max_results}); narrow the search or raise the limit for more")
+        if walker.truncated:
+            notes.append(f"Stopped after scanning {walker.entries_seen} entries (scan limit)")
+        if walker.skipped:
+            notes.append(f"Skipped blocked directories: {', '.join(walker.skipped[:10])}")
+        for directory, error in list(walker.errors.items())[:10]:
+            notes.append(f"Could not list {directory}: {error}")
+        if len(walker.errors) > 10:
+            notes.append(f"... and {len(walker.errors) - 10} more unreadable directories")
+        return notes
+    
+    def _format_entry(self, entry: SMBFileInfo) -> str:
+        """Format a walked entry as one line with its path relative to the share root."""
+        if entry.is_directory:
+            return f"📁 {entry.path}/"
+        return f"📄 {entry.path} ({self._format_file_size(entry.size)})"
+    
+    async def _report_progress(self, progress: float, message: str, total: Optional[float] = None) -> None:
+        """Send a progress notification if the client asked for them."""
+        try:
+            ctx = self.server.request_context
+        except LookupError:
+            return
+        
+        token = ctx.meta.progressToken if ctx.meta else None
+        if token is None:
+            return
+        
+        await ctx.session.send_progress_notification(
+            token, progress, total=total, message=message, related_request_id=str(ctx.request_id)
+        )
+    
+    async def _handle_read_file(
+        self,
+        share_name: str,
+        file_path: str,
+        encoding: str = "utf-8",
+        offset: Optional[int] = None,
+        length: Optional[int] = None
+    ) -> List[types.TextContent]:
         """Handle file reading."""
         connection = await self._get_connection(share_name)
         
         # Validate operation
         self.security.validate_read_operation(file_path)
         
-        content_bytes = await connection.read_file(file_path)
+        # Check the size before transferring anything
+        file_info = await connection.get_file_info(file_path, cached=False)
+        if file_info.is_directory:
+            raise ValidationError(f"Path is a directory: {file_path}")
         
-        # Validate file size
-        self.security.validate_file_size(len(content_bytes))
+        if offset is not None or length is not None:
+            return await self._read_file_chunk(connection, file_path, file_info.size, encoding, offset or 0, length)
+        
+        try:
+            self.security.validate_file_size(file_info.size)
+        except ValidationError as e:
+            raise ValidationError(f"{e}; read it in chunks with offset and length")
+        
+        content_bytes = await connection.read_file(file_path)
         
         try:
             content_text = content_bytes.decode(encoding)
@@ -287,7 +687,57 @@ class NetworkMCPServer:
         except UnicodeDecodeError as e:
             raise ValidationError(f"Failed to decode file with {encoding} encoding: {e}")
     
-    async def _handle_write_file(self, share_name: str, file_path: str, content: str, encoding: str = "utf-8") -> List[types.TextContent]:
+    async def _read_file_chunk(
+        self,
+        connection: AsyncSMBConnection,
+        file_path: str,
+        file_size: int,
+        encoding: str,
+        offset: int,
+        length: Optional[int]
+    ) -> List[types.TextContent]:
+        """Read one byte range of a file, ending on a character boundary."""
+        if offset < 0:
+            raise ValidationError("offset must not be negative")
+        if length is not None and length < 1:
+            raise ValidationError("length must be at least 1")
+        if offset > file_size:
+            raise ValidationError(f"offset {offset} is beyond the end of the file ({file_size} bytes)")
+        
+        length = min(length or self.security.max_chunk_size_bytes, self.security.max_chunk_size_bytes)
+        chunk = await connection.read_file_range(file_path, offset, length)
+        at_eof = offset + len(chunk) >= file_size
+        
+        # A multi-byte character split by the range end is left for the next chunk
+        try:
+            decoder = codecs.getincrementaldecoder(encoding)()
+            content_text = decoder.decode(chunk, final=at_eof)
+        except LookupError:
+            raise ValidationError(f"Unknown encoding: {encoding}")
+        except UnicodeDecodeError as e:
+            raise ValidationError(f"Failed to decode bytes {offset}-{offset + len(chunk)} with {encoding} encoding: {e}")
+        pending, _ = decoder.getstate()
+        consumed = len(chunk) - len(pending)
+        if chunk and consumed == 0:
+            raise ValidationError(f"length {length} is too small to hold a complete {encoding} character")
+        
+        end = offset + consumed
+        header = f"Bytes {offset}-{end} of {file_size} from {file_path}"
+        header += " (end of file)" if end >= file_size else f"; next_offset: {end}"
+        return [
+            types.TextContent(type="text", text=header),
+            types.TextContent(type="text", text=content_text)
+        ]
+    
+    async def _handle_write_file(
+        self,
+        share_name: str,
+        file_path: str,
+        content: str,
+        encoding: str = "utf-8",
+        offset: Optional[int] = None,
+        truncate: bool = False
+    ) -> List[types.TextContent]:
         """Handle file writing."""
         connection = await self._get_connection(share_name)
         
@@ -300,6 +750,20 @@ class NetworkMCPServer:
         except UnicodeEncodeError as e:
             raise ValidationError(f"Failed to encode content with {encoding} encoding: {e}")
         
+        if offset is not None:
+            if offset < 0:
+                raise ValidationError("offset must not be negative")
+            self.security.validate_chunk_size(len(content_bytes))
+            self.security.validate_file_size(offset + len(content_bytes))
+            
+            await connection.write_file_range(file_path, content_bytes, offset, truncate)
+            
+            end = offset + len(content_bytes)
+            return [types.TextContent(
+                type="text",
+                text=f"Successfully wrote bytes {offset}-{end} to {share_name}:{file_path}; next_offset: {end}"
+            )]
+        
         # Validate file size
         self.security.validate_file_size(len(content_bytes))
         
@@ -380,6 +844,35 @@ class NetworkMCPServer:
                 info_lines.append(f"Domain: {config.domain or '(none)'}")
                 info_lines.append(f"Username: {config.username}")
                 info_lines.append(f"Connected: {'Yes' if name in self.connections else 'No'}")
+                
+                if name in self.connections:
+                    pool = self.connections[name].get_stats()
+                    info_lines.append(
+                        f"Sessions: {pool['open']}/{pool['max_size']} open "
+                        f"({pool['in_use']} in use, {pool['idle']} idle, {pool['waiting']} waiting)"
+                    )
+                    info_lines.append(
+                        f"Checkouts: {pool['checkouts']} (avg wait {pool['avg_wait_ms']} ms, "
+                        f"max {pool['max_wait_ms']} ms)"
+                    )
+                    info_lines.append(
+                        f"Session health: {pool['reconnects']} reconnects, {pool['timeouts']} timeouts, "
+                        f"{pool['keepalive_echoes']} keepalive echoes ({pool['keepalive_failures']} failed)"
+                    )
+                    cache = self.metadata_cache.get_stats(name)
+                    hit_rate = f"{cache['hit_rate']:.0%}" if cache['hit_rate'] is not None else "n/a"
+                    info_lines.append(
+                        f"Metadata cache: {hit_rate} hit rate ({cache['hits']} hits, "
+                        f"{cache['revalidated']} revalidated, {cache['misses']} misses), "
+                        f"{cache['entries']} entries ({cache['total_entries']}/{cache['max_entries']} total, "
+                        f"TTL {cache['ttl']}s)" if self.metadata_cache.enabled else "Metadata cache: disabled"
+                    )
+                    executor = pool['executor']
+                    info_lines.append(
+                        f"Worker threads: {executor['running']}/{executor['workers']} busy, "
+                        f"{executor['queued']} queued (avg queue wait {executor['avg_queue_ms']} ms, "
+                        f"max {executor['max_queue_ms']} ms; avg run {executor['avg_run_ms']} ms)"
+                    )
         
         info_lines.append(f"\nSecurity Settings:")
         info_lines.append(self.security.get_validation_summary())
@@ -1,16 +1,26 @@
 """SMB/CIFS filesystem implementation with async wrapper."""
 
+import asyncio
 import io
 import logging
 import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 # Using pysmb for SMB/CIFS support
 from smb.SMBConnection import SMBConnection as PySMBConnection
+from smb.base import NotConnectedError, SMBTimeout
 
 from .config import SMBShareConfig
-from .exceptions import NetworkFileSystemError, AuthenticationError, FileNotFoundError
+from .exceptions import NetworkFileSystemError, AuthenticationError, FileNotFoundError, OperationTimeoutError
+
+if TYPE_CHECKING:
+    from .cache import MetadataCache
 
 
 logger = logging.getLogger(__name__)
@@ -79,6 +89,19 @@ class SMBConnection:
         except Exception as e:
             logger.warning(f"Error during SMB disconnect: {e}")
     
+    def echo(self) -> bool:
+        """Check the session with an SMB echo; False if it is no longer usable."""
+        if not self._connected or not self.connection:
+            return False
+        
+        try:
+            self.connection.echo(b"network-mcp keepalive", timeout=self.config.timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"SMB echo to {self.config.host} failed: {e}")
+            self._connected = False
+            return False
+    
     def _ensure_connected(self) -> None:
         """Ensure we have an active connection."""
         if not self._connected or not self.connection:
@@ -97,6 +120,10 @@ class SMBConnection:
     
     def list_directory(self, path: str = "") -> List[SMBFileInfo]:
         """List contents of a directory."""
+        return self.list_directory_snapshot(path)[0]
+    
+    def list_directory_snapshot(self, path: str = "") -> Tuple[List[SMBFileInfo], Optional[float]]:
+        """List contents of a directory along with the directory's own last write time."""
         self._ensure_connected()
         
         try:
@@ -106,8 +133,12 @@ class SMBConnection:
             file_list = self.connection.listPath(self.config.share_name, normalized_path or "/")
             
             result = []
+            directory_time = None
             for file_info in file_list:
-                if file_info.filename in ['.', '..']:
+                if file_info.filename == '.':
+                    directory_time = file_info.last_write_time or None
+                    continue
+                if file_info.filename == '..':
                     continue
                 
                 entry_path = os.path.join(path, file_info.filename).replace('\\', '/')
@@ -122,7 +153,7 @@ class SMBConnection:
                 )
                 result.append(smb_file_info)
             
-            return result
+            return result, directory_time
             
         except Exception as e:
             if "not found" in str(e).lower() or "no such file" in str(e).lower():
@@ -152,6 +183,35 @@ class SMBConnection:
             logger.error(f"SMB file read failed for {path}: {e}")
             raise NetworkFileSystemError(f"Failed to read file {path}: {e}")
     
+    def read_file_range(self, path: str, offset: int, length: int) -> bytes:
+        """Read up to ``length`` bytes of a file starting at ``offset``."""
+        self._ensure_connected()
+        
+        try:
+            normalized_path = self._normalize_path(path)
+            
+            # Only the requested range is transferred and buffered
+            file_buffer = io.BytesIO()
+            self.connection.retrieveFileFromOffset(
+                self.config.share_name,
+                normalized_path,
+                file_buffer,
+                offset=offset,
+                max_length=length,
+                timeout=self.config.timeout
+            )
+            
+            content = file_buffer.getvalue()
+            file_buffer.close()
+            
+            return content
+            
+        except Exception as e:
+            if "not found" in str(e).lower() or "no such file" in str(e).lower():
+                raise FileNotFoundError(f"File not found: {path}")
+            logger.error(f"SMB ranged read failed for {path} at offset {offset}: {e}")
+            raise NetworkFileSystemError(f"Failed to read file {path} at offset {offset}: {e}")
+    
     def write_file(self, path: str, content: Union[str, bytes]) -> None:
         """Write contents to a file."""
         self._ensure_connected()
@@ -173,6 +233,30 @@ class SMBConnection:
             logger.error(f"SMB file write failed for {path}: {e}")
             raise NetworkFileSystemError(f"Failed to write file {path}: {e}")
     
+    def write_file_range(self, path: str, content: bytes, offset: int, truncate: bool = False) -> None:
+        """Write ``content`` into a file at ``offset``, creating the file if needed."""
+        self._ensure_connected()
+        
+        try:
+            normalized_path = self._normalize_path(path)
+            
+            file_buffer = io.BytesIO(content)
+            self.connection.storeFileFromOffset(
+                self.config.share_name,
+                normalized_path,
+                file_buffer,
+                offset=offset,
+                truncate=truncate,
+                timeout=self.config.timeout
+            )
+            file_buffer.close()
+            
+            logger.info(f"Successfully wrote {len(content)} bytes to {path} at offset {offset}")
+            
+        except Exception as e:
+            logger.error(f"SMB ranged write failed for {path} at offset {offset}: {e}")
+            raise NetworkFileSystemError(f"Failed to write file {path} at offset {offset}: {e}")
+    
     def delete_file(self, path: str) -> None:
         """Delete a file."""
         self._ensure_connected()
@@ -229,57 +313,462 @@ class SMBConnection:
             raise NetworkFileSystemError(f"Failed to get info for {path}: {e}")
 
 
+# Operations that can safely be repeated on a new session if the first one broke
+IDEMPOTENT_OPERATIONS = frozenset({
+    "list_directory",
+    "list_directory_snapshot",
+    "read_file",
+    "read_file_range",
+    "write_file",
+    "write_file_range",
+    "create_directory",
+    "get_file_info",
+})
+
+
+def is_connection_error(error: Optional[BaseException]) -> bool:
+    """Check whether an error, or the error it was raised from, means the SMB session is broken."""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        if isinstance(error, (NotConnectedError, SMBTimeout, OSError)):
+            return True
+        seen.add(id(error))
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class SMBExecutor:
+    """Dedicated worker threads for one share's blocking SMB calls.
+    
+    Keeps slow SMB I/O off the event loop's default executor, so one slow share
+    cannot starve other shares or the MCP transport, and tracks how long calls
+    queue for a thread.
+    """
+    
+    def __init__(self, name: str, max_workers: int):
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"smb-{name}")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "abandoned": 0,
+            "total_queue_ms": 0.0,
+            "max_queue_ms": 0.0,
+            "total_run_ms": 0.0,
+        }
+    
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call on a worker thread.
+        
+        If the awaiting task is cancelled, a call still queued for a thread is
+        dropped; a call already running cannot be interrupted, so it finishes
+        in the background and its result is discarded.
+        """
+        submitted = time.perf_counter()
+        
+        def call() -> Any:
+            started = time.perf_counter()
+            queue_ms = (started - submitted) * 1000
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self.stats["total_queue_ms"] += queue_ms
+                self.stats["max_queue_ms"] = max(self.stats["max_queue_ms"], queue_ms)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self.stats["total_run_ms"] += (time.perf_counter() - started) * 1000
+        
+        with self._lock:
+            self._queued += 1
+            self.stats["submitted"] += 1
+        future = self._executor.submit(call)
+        
+        try:
+            result = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            if future.cancel():
+                with self._lock:
+                    self._queued -= 1
+                    self.stats["cancelled"] += 1
+            elif not future.done():
+                self.stats["abandoned"] += 1
+            raise
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        
+        self.stats["completed"] += 1
+        return result
+    
+    def run_detached(self, func: Callable[..., Any], *args: Any) -> Optional[Future]:
+        """Start a blocking call on a worker thread without waiting for it.
+        
+        After shutdown the call gets a short-lived thread of its own instead,
+        and no future is returned.
+        """
+        try:
+            return self._executor.submit(func, *args)
+        except RuntimeError:
+            threading.Thread(target=func, args=args, daemon=True).start()
+            return None
+    
+    def shutdown(self) -> None:
+        """Stop the worker threads once running calls finish; queued calls are dropped."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker, queue-depth and wait-time metrics."""
+        with self._lock:
+            started = self.stats["submitted"] - self.stats["cancelled"] - self._queued
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queued": self._queued,
+                "submitted": self.stats["submitted"],
+                "completed": self.stats["completed"],
+                "failed": self.stats["failed"],
+                "cancelled": self.stats["cancelled"],
+                "abandoned": self.stats["abandoned"],
+                "avg_queue_ms": round(self.stats["total_queue_ms"] / started, 2) if started else 0.0,
+                "max_queue_ms": round(self.stats["max_queue_ms"], 2),
+                "avg_run_ms": round(self.stats["total_run_ms"] / started, 2) if started else 0.0,
+            }
+
+
+class SMBConnectionPool:
+    """Pool of SMB sessions to one share.
+    
+    Up to ``max_size`` sessions are open at once and each is checked out by one
+    operation at a time, so operations on the same share run concurrently.
+    Idle sessions are echoed every ``keepalive_interval`` seconds so the server
+    does not drop them; sessions that fail an echo or break during an operation
+    are discarded and replaced on demand. Blocking calls run on the pool's own
+    executor, one worker per session.
+    """
+    
+    def __init__(
+        self,
+        config: SMBShareConfig,
+        max_size: int = 10,
+        keepalive_interval: float = 60.0,
+        operation_timeout: Optional[float] = None
+    ):
+        self.config = config
+        self.max_size = max(1, max_size)
+        self.keepalive_interval = keepalive_interval
+        self.operation_timeout = operation_timeout
+        self.executor = SMBExecutor(config.share_name, self.max_size)
+        
+        self._idle: Deque[Tuple[SMBConnection, float]] = deque()
+        self._semaphore = asyncio.Semaphore(self.max_size)
+        self._open = 0
+        self._waiting = 0
+        self._closed = False
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._disconnects: List[Future] = []
+        self.stats = {
+            "checkouts": 0,
+            "total_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+            "sessions_created": 0,
+            "sessions_discarded": 0,
+            "reconnects": 0,
+            "timeouts": 0,
+            "keepalive_echoes": 0,
+            "keepalive_failures": 0,
+        }
+    
+    async def _run_sync(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await self.executor.run(func, *args)
+    
+    async def _new_session(self) -> SMBConnection:
+        session = SMBConnection(self.config)
+        await self._run_sync(session.connect)
+        self._open += 1
+        self.stats["sessions_created"] += 1
+        return session
+    
+    def _forget(self, session: SMBConnection) -> None:
+        self._open -= 1
+        self.stats["sessions_discarded"] += 1
+    
+    def _discard(self, session: SMBConnection) -> None:
+        self._forget(session)
+        # disconnect() blocks on the socket, and a cancelled call may still be using the session
+        future = self.executor.run_detached(session.disconnect)
+        if future is not None:
+            self._disconnects = [pending for pending in self._disconnects if not pending.done()]
+            self._disconnects.append(future)
+    
+    def _discard_idle(self) -> None:
+        while self._idle:
+            self._discard(self._idle.pop()[0])
+    
+    def _ensure_keepalive(self) -> None:
+        if self.keepalive_interval <= 0 or self._closed:
+            return
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.get_running_loop().create_task(self._keepalive_loop())
+    
+    async def start(self) -> None:
+        """Open the first session, verifying the share is reachable."""
+        if self._closed:
+            raise NetworkFileSystemError(f"Connection pool for {self.config.share_name} is closed")
+        async with self.checkout():
+            pass
+    
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[SMBConnection]:
+        """Check out a session for one operation, waiting while all sessions are in use."""
+        start = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        
+        try:
+            wait_ms = (time.perf_counter() - start) * 1000
+            self.stats["checkouts"] += 1
+            self.stats["total_wait_ms"] += wait_ms
+            self.stats["max_wait_ms"] = max(self.stats["max_wait_ms"], wait_ms)
+            self._ensure_keepalive()
+            
+            # Most recently returned first: the likeliest to still be alive
+            session = self._idle.pop()[0] if self._idle else await self._new_session()
+            
+            broken = False
+            try:
+                yield session
+            except BaseException as e:
+                # A cancelled operation may still be running in its worker thread
+                broken = isinstance(e, asyncio.CancelledError) or is_connection_error(e)
+                raise
+            finally:
+                if broken or self._closed:
+                    self._discard(session)
+                else:
+                    self._idle.append((session, time.monotonic()))
+        finally:
+            self._semaphore.release()
+    
+    async def run(self, operation: str, *args: Any) -> Any:
+        """Run an SMBConnection method on a pooled session.
+        
+        If the session turns out to be broken, idle sessions (likely dropped
+        along with it) are discarded and idempotent operations are retried
+        once on a new session.
+        """
+        attempts = 2 if operation in IDEMPOTENT_OPERATIONS else 1
+        for attempt in range(attempts):
+            try:
+                return await self._run_with_timeout(operation, args)
+            except OperationTimeoutError:
+                raise
+            except NetworkFileSystemError as e:
+                if not is_connection_error(e):
+                    raise
+                self._discard_idle()
+                if attempt + 1 >= attempts:
+                    raise
+                self.stats["reconnects"] += 1
+                logger.warning(
+                    f"SMB session to {self.config.host}\\{self.config.share_name} broke during "
+                    f"{operation}, retrying on a new session: {e}"
+                )
+    
+    async def _run_once(self, operation: str, args: Tuple[Any, ...]) -> Any:
+        async with self.checkout() as session:
+            return await self._run_sync(getattr(session, operation), *args)
+    
+    async def _run_with_timeout(self, operation: str, args: Tuple[Any, ...]) -> Any:
+        if not self.operation_timeout:
+            return await self._run_once(operation, args)
+        
+        # On timeout the operation is cancelled: it leaves the session queue or the
+        # executor queue, or if already running its session is discarded
+        try:
+            return await asyncio.wait_for(self._run_once(operation, args), self.operation_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise OperationTimeoutError(
+                f"SMB {operation} on {self.config.share_name} timed out after {self.operation_timeout}s"
+            )
+    
+    async def _keepalive_loop(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self.keepalive_interval)
+            await self.ping_idle()
+    
+    async def ping_idle(self) -> None:
+        """Echo sessions idle for a keepalive interval and discard the ones that fail."""
+        now = time.monotonic()
+        due = [entry for entry in self._idle if now - entry[1] >= self.keepalive_interval]
+        for entry in due:
+            # Sessions in use need no keepalive; skip while the pool is busy
+            if entry not in self._idle or self._semaphore.locked():
+                continue
+            async with self._semaphore:
+                self._idle.remove(entry)
+                session = entry[0]
+                self.stats["keepalive_echoes"] += 1
+                try:
+                    alive = await self._run_sync(session.echo)
+                except BaseException:
+                    # Cancelled by close(): the session is neither idle nor in use any more
+                    self._discard(session)
+                    raise
+                if not alive:
+                    self.stats["keepalive_failures"] += 1
+                    self._discard(session)
+                elif self._closed:
+                    self._discard(session)
+                else:
+                    self._idle.appendleft((session, time.monotonic()))
+    
+    async def close(self) -> None:
+        """Close idle sessions; sessions in use are closed when returned."""
+        self._closed = True
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            await asyncio.gather(self._keepalive_task, return_exceptions=True)
+            self._keepalive_task = None
+        # Disconnect idle sessions before shutdown drops queued calls
+        idle = [entry[0] for entry in self._idle]
+        self._idle.clear()
+        for session in idle:
+            self._forget(session)
+        await asyncio.gather(
+            *(self._run_sync(session.disconnect) for session in idle),
+            *(asyncio.wrap_future(future) for future in self._disconnects),
+            return_exceptions=True
+        )
+        self._disconnects = []
+        self.executor.shutdown()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size, usage and health-check metrics."""
+        checkouts = self.stats["checkouts"]
+        return {
+            "max_size": self.max_size,
+            "open": self._open,
+            "idle": len(self._idle),
+            "in_use": self._open - len(self._idle),
+            "waiting": self._waiting,
+            "checkouts": checkouts,
+            "avg_wait_ms": round(self.stats["total_wait_ms"] / checkouts, 2) if checkouts else 0.0,
+            "max_wait_ms": round(self.stats["max_wait_ms"], 2),
+            "sessions_created": self.stats["sessions_created"],
+            "sessions_discarded": self.stats["sessions_discarded"],
+            "reconnects": self.stats["reconnects"],
+            "timeouts": self.stats["timeouts"],
+            "keepalive_echoes": self.stats["keepalive_echoes"],
+            "keepalive_failures": self.stats["keepalive_failures"],
+            "executor": self.executor.get_stats(),
+        }
+
+
 # Async wrapper for SMB operations
 class AsyncSMBConnection:
-    """Async wrapper for SMB connection operations."""
+    """Async interface to an SMB share, backed by a pool of sessions.
     
-    def __init__(self, config: SMBShareConfig):
-        self.smb_connection = SMBConnection(config)
+    With a ``cache``, listings and attributes are cached under ``name`` and
+    invalidated by writes, deletes and directory creation.
+    """
+    
+    def __init__(
+        self,
+        config: SMBShareConfig,
+        max_connections: int = 10,
+        keepalive_interval: float = 60.0,
+        operation_timeout: Optional[float] = None,
+        cache: Optional["MetadataCache"] = None,
+        name: Optional[str] = None
+    ):
+        self.config = config
+        self.name = name or config.share_name
+        self.cache = cache
+        self.pool = SMBConnectionPool(config, max_connections, keepalive_interval, operation_timeout)
+    
+    def _invalidate(self, path: str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate(self.name, path)
+    
+    async def _directory_version(self, path: str) -> Optional[float]:
+        info = await self.pool.run("get_file_info", path)
+        return info.modified_time
     
     async def connect(self) -> None:
         """Connect to SMB share asynchronously."""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self.smb_connection.connect)
+        await self.pool.start()
     
     async def disconnect(self) -> None:
         """Disconnect from SMB share asynchronously."""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self.smb_connection.disconnect)
+        await self.pool.close()
+        if self.cache is not None:
+            self.cache.clear(self.name)
     
     async def list_directory(self, path: str = "") -> List[SMBFileInfo]:
         """List directory contents asynchronously."""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.smb_connection.list_directory, path)
+        if self.cache is None:
+            return await self.pool.run("list_directory", path)
+        return await self.cache.get_listing(
+            self.name,
+            path,
+            load=lambda: self.pool.run("list_directory_snapshot", path),
+            current_version=lambda: self._directory_version(path)
+        )
     
     async def read_file(self, path: str) -> bytes:
         """Read file contents asynchronously."""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.smb_connection.read_file, path)
+        return await self.pool.run("read_file", path)
+    
+    async def read_file_range(self, path: str, offset: int, length: int) -> bytes:
+        """Read a byte range of a file asynchronously."""
+        return await self.pool.run("read_file_range", path, offset, length)
+    
+    async def write_file_range(self, path: str, content: bytes, offset: int, truncate: bool = False) -> None:
+        """Write a byte range of a file asynchronously."""
+        try:
+            await self.pool.run("write_file_range", path, content, offset, truncate)
+        finally:
+            self._invalidate(path)
     
     async def write_file(self, path: str, content: Union[str, bytes]) -> None:
         """Write file contents asynchronously."""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self.smb_connection.write_file, path, content)
+        try:
+            await self.pool.run("write_file", path, content)
+        finally:
+            self._invalidate(path)
     
     async def delete_file(self, path: str) -> None:
         """Delete file asynchronously."""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self.smb_connection.delete_file, path)
+        try:
+            await self.pool.run("delete_file", path)
+        finally:
+            self._invalidate(path)
     
     async def create_directory(self, path: str) -> None:
         """Create directory asynchronously."""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        await loop.run_in_executor(None, self.smb_connection.create_directory, path)
-    
-    async def get_file_info(self, path: str) -> SMBFileInfo:
-        """Get file info asynchronously."""
-        import asyncio
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.smb_connection.get_file_info, path)
\ No newline at end of file
+        try:
+            await self.pool.run("create_directory", path)
+        finally:
+            self._invalidate(path)
+    
+    async def get_file_info(self, path: str, cached: bool = True) -> SMBFileInfo:
+        """Get file info asynchronously; ``cached=False`` always asks the server."""
+        if self.cache is None or not cached:
+            return await self.pool.run("get_file_info", path)
+        return await self.cache.get_info(self.name, path, load=lambda: self.pool.run("get_file_info", path))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection pool metrics."""
+        return self.pool.get_stats()
@@ -0,0 +1,210 @@
+"""Concurrent recursive traversal of network shares."""
+
+import asyncio
+import fnmatch
+import logging
+import posixpath
+import re
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from .exceptions import ValidationError
+from .smb_fs import AsyncSMBConnection, SMBFileInfo
+
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on entries examined by one walk, whatever the result cap
+DEFAULT_SCAN_LIMIT = 100000
+
+ENTRY_TYPES = ("any", "file", "directory")
+
+
+class EntryFilter:
+    """Matches walked entries by glob pattern, regular expression and type.
+    
+    Globs are matched case-insensitively, as SMB paths are; a glob containing
+    "/" is matched against the path relative to the share root, otherwise
+    against the entry name. Regular expressions are searched in the path.
+    """
+    
+    def __init__(self, pattern: Optional[str] = None, regex: Optional[str] = None, entry_type: str = "any"):
+        if entry_type not in ENTRY_TYPES:
+            raise ValidationError(f"entry_type must be one of {', '.join(ENTRY_TYPES)}")
+        
+        self.pattern = pattern
+        self.regex = regex
+        self.entry_type = entry_type
+        self._glob = re.compile(fnmatch.translate(pattern), re.IGNORECASE) if pattern else None
+        self._glob_on_path = bool(pattern and "/" in pattern)
+        
+        try:
+            self._regex = re.compile(regex) if regex else None
+        except re.error as e:
+            raise ValidationError(f"Invalid regular expression '{regex}': {e}")
+    
+    def matches(self, entry: SMBFileInfo) -> bool:
+        """Check whether an entry passes every configured filter."""
+        if self.entry_type == "file" and entry.is_directory:
+            return False
+        if self.entry_type == "directory" and not entry.is_directory:
+            return False
+        
+        path = entry.path.lstrip("/")
+        if self._glob and not self._glob.match(path if self._glob_on_path else entry.name):
+            return False
+        if self._regex and not self._regex.search(path):
+            return False
+        
+        return True
+
+
+class TreeWalker:
+    """Walks a directory tree with concurrent listings.
+    
+    Directories are listed breadth-first by up to ``concurrency`` workers, each
+    call checking out its own pooled session, and every listing is yielded as
+    soon as it arrives. Entries directly under ``root`` have depth 1 and
+    directories at ``max_depth`` are not entered. The walk stops once
+    ``scan_limit`` entries have been seen. Listing errors below the root are
+    recorded in ``errors`` and the walk continues.
+    """
+    
+    def __init__(
+        self,
+        connection: AsyncSMBConnection,
+        root: str = "",
+        max_depth: Optional[int] = None,
+        concurrency: int = 4,
+        can_descend: Optional[Callable[[str], bool]] = None,
+        scan_limit: Optional[int] = DEFAULT_SCAN_LIMIT
+    ):
+        if max_depth is not None and max_depth < 1:
+            raise ValidationError("max_depth must be at least 1")
+        
+        self.connection = connection
+        self.root = root.strip("/")
+        self.max_depth = max_depth
+        self.concurrency = max(1, concurrency)
+        self.can_descend = can_descend or (lambda path: True)
+        self.scan_limit = scan_limit
+        
+        self.errors: Dict[str, str] = {}
+        self.skipped: List[str] = []
+        self.directories_listed = 0
+        self.entries_seen = 0
+        self.truncated = False
+    
+    async def walk(self) -> AsyncIterator[Tuple[str, int, List[SMBFileInfo]]]:
+        """Yield (directory path, depth of its entries, entries) for each listed directory.
+        
+        Closing the iterator early stops the walk and cancels outstanding listings.
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        listings: asyncio.Queue = asyncio.Queue()
+        
+        async def worker() -> None:
+            while True:
+                path, depth = await pending.get()
+                try:
+                    entries = await self.connection.list_directory(path)
+                    await listings.put((path, depth, entries, None))
+                except Exception as e:
+                    await listings.put((path, depth, None, e))
+        
+        pending.put_nowait((self.root, 1))
+        outstanding = 1
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        
+        try:
+            while outstanding:
+                path, depth, entries, error = await listings.get()
+                outstanding -= 1
+                
+                if error is not None:
+                    if path == self.root:
+                        raise error
+                    logger.warning(f"Skipping {path} during walk: {error}")
+                    self.errors[path] = str(error)
+                    continue
+                
+                self.directories_listed += 1
+                self.entries_seen += len(entries)
+                entries = sorted(entries, key=lambda entry: (not entry.is_directory, entry.name.lower()))
+                
+                # Queue subdirectories before handing the listing out, so workers keep going
+                if self.max_depth is None or depth < self.max_depth:
+                    for entry in entries:
+                        if not entry.is_directory:
+                            continue
+                        if not self.can_descend(entry.path):
+                            self.skipped.append(entry.path)
+                            continue
+                        pending.put_nowait((entry.path, depth + 1))
+                        outstanding += 1
+                
+                yield path, depth, entries
+                
+                if self.scan_limit is not None and self.entries_seen >= self.scan_limit and outstanding:
+                    logger.warning(f"Walk of {self.root or '/'} stopped after {self.entries_seen} entries")
+                    self.truncated = True
+                    return
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+class TreeSummary:
+    """Per-directory file counts and byte totals of a walked tree.
+    
+    Subdirectories that were seen but not listed (below the depth limit or
+    unreadable) are kept with zero counts and left out of ``listed``.
+    """
+    
+    def __init__(self, root: str = ""):
+        self.root = root.strip("/")
+        self.directories: Dict[str, Dict[str, int]] = {}
+        self.listed: Set[str] = set()
+        self._add_directory(self.root)
+    
+    def _add_directory(self, path: str) -> Dict[str, int]:
+        return self.directories.setdefault(path, {
+            "files": 0,
+            "bytes": 0,
+            "subdirectories": 0,
+            "total_files": 0,
+            "total_bytes": 0,
+        })
+    
+    def _ancestors(self, path: str) -> List[str]:
+        """The directory itself and its parents up to the walk root."""
+        chain = [path]
+        while path != self.root and path:
+            path = posixpath.dirname(path)
+            chain.append(path)
+        return chain
+    
+    def add_listing(self, path: str, entries: List[SMBFileInfo]) -> None:
+        """Account for one directory listing."""
+        path = path.strip("/")
+        stats = self._add_directory(path)
+        self.listed.add(path)
+        
+        files = [entry for entry in entries if not entry.is_directory]
+        file_bytes = sum(entry.size for entry in files)
+        stats["files"] += len(files)
+        stats["bytes"] += file_bytes
+        stats["subdirectories"] += len(entries) - len(files)
+        
+        for entry in entries:
+            if entry.is_directory:
+                self._add_directory(entry.path.strip("/"))
+        
+        for ancestor in self._ancestors(path):
+            totals = self._add_directory(ancestor)
+            totals["total_files"] += len(files)
+            totals["total_bytes"] += file_bytes
+    
+    def rows(self) -> List[Tuple[str, Dict[str, int]]]:
+        """Directories in tree order, the root first."""
+        return sorted(self.directories.items(), key=lambda item: item[0].lower().split("/") if item[0] else [])
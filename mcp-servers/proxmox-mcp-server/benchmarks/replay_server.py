@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Proxmox API replay stand-in for offline load testing.
+
+Serves ``/api2/json`` from a synthetic cluster of N nodes and M guests,
+optionally overlaid with captured fixture responses, with configurable latency
+and jitter per endpoint. Every request is counted so benchmarks can assert on
+request counts and peak concurrency.
+
+Usage:
+    python benchmarks/replay_server.py serve --nodes 5 --guests 200 --latency 20 --jitter 5
+    python benchmarks/replay_server.py serve --fixtures fixtures.json --endpoint-latency 'rrddata=80'
+    python benchmarks/replay_server.py record proxmox_mcp_config.json fixtures.json
+
+Point a server config at it with ``"host": "127.0.0.1"``, ``"port": 8006`` and
+``"use_ssl": false``.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+# Add the source directory to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+API_PREFIX = "/api2/json/"
+
+
+@dataclass
+class LatencyProfile:
+    """Base latency plus per-endpoint overrides, all in milliseconds."""
+
+    default_ms: float = 0.0
+    jitter_ms: float = 0.0
+    overrides: List[Tuple[re.Pattern, float, float]] = field(default_factory=list)
+
+    def add_override(self, spec: str) -> None:
+        """Parse ``pattern=ms`` or ``pattern=ms:jitter``."""
+        pattern, _, timing = spec.partition('=')
+        latency, _, jitter = timing.partition(':')
+        self.overrides.append((re.compile(pattern), float(latency), float(jitter or self.jitter_ms)))
+
+    def delay_for(self, path: str) -> float:
+        latency, jitter = self.default_ms, self.jitter_ms
+        for pattern, override_latency, override_jitter in self.overrides:
+            if pattern.search(path):
+                latency, jitter = override_latency, override_jitter
+                break
+        return max(0.0, latency + random.uniform(-jitter, jitter)) / 1000
+
+
+class SyntheticCluster:
+    """Deterministic Proxmox-shaped data for N nodes and M guests."""
+
+    def __init__(self, nodes: int = 3, guests: int = 30, snapshots_per_guest: int = 2,
+                 backups_per_guest: int = 2, task_seconds: float = 0.5, seed: int = 42):
+        rng = random.Random(seed)
+        self.now = int(time.time())
+        self.task_seconds = task_seconds
+        self.node_names = [f"pve{i + 1}" for i in range(nodes)]
+        self.guests: Dict[int, Dict[str, Any]] = {}
+        for index in range(guests):
+            vmid = 100 + index
+            guest_type = 'qemu' if index % 2 == 0 else 'lxc'
+            maxmem = rng.choice([2, 4, 8, 16]) * 1024 ** 3
+            maxdisk = rng.choice([16, 32, 64, 128]) * 1024 ** 3
+            self.guests[vmid] = {
+                'vmid': vmid,
+                'name': f"{'vm' if guest_type == 'qemu' else 'ct'}-{vmid}",
+                'type': guest_type,
+                'node': self.node_names[index % nodes],
+                'status': 'running' if rng.random() < 0.8 else 'stopped',
+                'cpu': round(rng.random() * 0.6, 4),
+                'maxcpu': rng.choice([1, 2, 4]),
+                'mem': int(maxmem * rng.uniform(0.2, 0.9)),
+                'maxmem': maxmem,
+                'disk': int(maxdisk * rng.uniform(0.1, 0.8)),
+                'maxdisk': maxdisk,
+                'uptime': rng.randint(0, 10 ** 6),
+                'template': 0
+            }
+        self.snapshots = {
+            vmid: [
+                {'name': f"snap{i}", 'snaptime': self.now - rng.randint(1, 200) * 86400, 'description': ''}
+                for i in range(snapshots_per_guest)
+            ]
+            for vmid in self.guests
+        }
+        self.backups = {
+            node: [
+                {
+                    'volid': f"backup:backup/vzdump-{guest['type']}-{vmid}-{i}.vma.zst",
+                    'content': 'backup',
+                    'format': 'vma.zst',
+                    'size': rng.randint(1, 50) * 1024 ** 3,
+                    'ctime': self.now - rng.randint(1, 90) * 86400,
+                    'vmid': vmid
+                }
+                for vmid, guest in self.guests.items() if guest['node'] == node
+                for i in range(backups_per_guest)
+            ]
+            for node in self.node_names
+        }
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self._task_counter = 0
+
+    # Cluster-wide views
+
+    def node_list(self) -> List[Dict[str, Any]]:
+        return [
+            {'node': node, 'status': 'online', 'type': 'node', 'cpu': 0.2, 'maxcpu': 16,
+             'mem': 24 * 1024 ** 3, 'maxmem': 64 * 1024 ** 3, 'uptime': 86400}
+            for node in self.node_names
+        ]
+
+    def resources(self) -> List[Dict[str, Any]]:
+        nodes = [{'id': f"node/{n['node']}", **n} for n in self.node_list()]
+        guests = [{'id': f"{g['type']}/{g['vmid']}", **g} for g in self.guests.values()]
+        storages = [
+            {'id': f"storage/{node}/{name}", 'type': 'storage', 'node': node, 'storage': name,
+             'disk': 400 * 1024 ** 3, 'maxdisk': 1024 ** 4, 'status': 'available'}
+            for node in self.node_names for name in ('local', 'backup')
+        ]
+        return nodes + guests + storages
+
+    def storage_list(self, node: Optional[str] = None) -> List[Dict[str, Any]]:
+        items = [
+            {'storage': 'local', 'type': 'dir', 'content': 'iso,vztmpl,rootdir,images', 'active': 1,
+             'used': 400 * 1024 ** 3, 'total': 1024 ** 4, 'avail': 624 * 1024 ** 3},
+            {'storage': 'backup', 'type': 'dir', 'content': 'backup', 'active': 1,
+             'used': 900 * 1024 ** 3, 'total': 1024 ** 4, 'avail': 124 * 1024 ** 3}
+        ]
+        return items if node else [{k: v for k, v in item.items() if k in ('storage', 'type', 'content')} for item in items]
+
+    # Per-node views
+
+    def node_status(self, node: str) -> Dict[str, Any]:
+        return {
+            'cpu': 0.25, 'loadavg': ['0.50', '0.40', '0.30'], 'uptime': 86400,
+            'memory': {'used': 24 * 1024 ** 3, 'total': 64 * 1024 ** 3, 'free': 40 * 1024 ** 3},
+            'rootfs': {'used': 20 * 1024 ** 3, 'total': 100 * 1024 ** 3},
+            'pveversion': 'pve-manager/8.1.4', 'kversion': 'Linux 6.5.13'
+        }
+
+    def node_guests(self, node: str, guest_type: str) -> List[Dict[str, Any]]:
+        return [g for g in self.guests.values() if g['node'] == node and g['type'] == guest_type]
+
+    def rrddata(self, timeframe: str, base: Dict[str, Any]) -> List[Dict[str, Any]]:
+        step = {'hour': 60, 'day': 1800, 'week': 10800, 'month': 43200, 'year': 604800}.get(timeframe, 1800)
+        rng = random.Random(f"{base.get('vmid')}:{base.get('node')}:{timeframe}")
+        points = []
+        for i in range(70):
+            growth = 1 + i * 0.002
+            points.append({
+                'time': self.now - (70 - i) * step,
+                'cpu': rng.random() * 0.5,
+                'mem': base.get('mem', 8 * 1024 ** 3) * rng.uniform(0.9, 1.1),
+                'maxmem': base.get('maxmem', 16 * 1024 ** 3),
+                'disk': base.get('disk', 0) * growth,
+                'maxdisk': base.get('maxdisk', 0),
+                'netin': rng.random() * 1e6,
+                'netout': rng.random() * 1e6
+            })
+        return points
+
+    # Tasks
+
+    def start_task(self, node: str, task_type: str, guest_id: Any) -> str:
+        self._task_counter += 1
+        start = int(time.time())
+        upid = f"UPID:{node}:{self._task_counter:08X}:00000000:{start:08X}:{task_type}:{guest_id}:root@pam:"
+        self.tasks[upid] = {'upid': upid, 'node': node, 'type': task_type, 'id': str(guest_id),
+                            'starttime': start, 'started': time.monotonic()}
+        return upid
+
+    def task_entry(self, upid: str) -> Dict[str, Any]:
+        task = self.tasks[upid]
+        entry = {k: v for k, v in task.items() if k != 'started'}
+        if time.monotonic() - task['started'] >= self.task_seconds:
+            entry.update({'status': 'OK', 'endtime': task['starttime'] + max(1, int(self.task_seconds))})
+        else:
+            entry['status'] = 'running'
+        return entry
+
+
+class ReplayServer:
+    """aiohttp application answering Proxmox API paths from fixtures or a synthetic cluster."""
+
+    def __init__(self, cluster: SyntheticCluster, latency: Optional[LatencyProfile] = None,
+                 fixtures: Optional[Dict[str, Any]] = None):
+        self.cluster = cluster
+        self.latency = latency or LatencyProfile()
+        self.fixtures = fixtures or {}
+        self.requests: Dict[str, int] = {}
+        self.total_requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.app = web.Application()
+        self.app.router.add_get('/_replay/stats', self.handle_stats)
+        self.app.router.add_post('/_replay/reset', self.handle_reset)
+        self.app.router.add_route('*', API_PREFIX + '{path:.*}', self.handle_api)
+
+    def reset_stats(self) -> None:
+        self.requests.clear()
+        self.total_requests = 0
+        self.peak_in_flight = self.in_flight
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'total_requests': self.total_requests,
+            'peak_in_flight': self.peak_in_flight,
+            'by_route': dict(sorted(self.requests.items(), key=lambda item: item[1], reverse=True))
+        }
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.get_stats())
+
+    async def handle_reset(self, request: web.Request) -> web.Response:
+        self.reset_stats()
+        return web.json_response({'reset': True})
+
+    @staticmethod
+    def route_key(method: str, path: str) -> str:
+        """Collapse node names and IDs so counts group by endpoint shape."""
+        path = re.sub(r'^nodes/[^/]+', 'nodes/{node}', path)
+        path = re.sub(r'/(qemu|lxc)/\d+', r'/\1/{vmid}', path)
+        path = re.sub(r'/storage/[^/]+', '/storage/{storage}', path)
+        path = re.sub(r'/tasks/[^/]+', '/tasks/{upid}', path)
+        path = re.sub(r'/snapshot/[^/]+', '/snapshot/{name}', path)
+        return f"{method} {path}"
+
+    async def handle_api(self, request: web.Request) -> web.Response:
+        path = request.match_info['path'].strip('/')
+        key = self.route_key(request.method, path)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self.total_requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency.delay_for(path))
+            if request.method == 'GET' and path in self.fixtures:
+                return web.json_response(self.fixtures[path])
+            data = self.dispatch(request.method, path, request.query)
+            if data is None:
+                return web.json_response({'data': None, 'errors': {'path': 'not found'}}, status=404)
+            return web.json_response({'data': data})
+        finally:
+            self.in_flight -= 1
+
+    def dispatch(self, method: str, path: str, query) -> Any:
+        cluster = self.cluster
+        parts = path.split('/')
+
+        if method == 'POST' and path == 'access/ticket':
+            return {'ticket': 'PVE:replay:ticket', 'CSRFPreventionToken': 'replay-csrf', 'username': 'root@pam'}
+        if path == 'version':
+            return {'version': '8.1.4', 'release': '8.1', 'repoid': 'replay'}
+        if path == 'nodes':
+            return cluster.node_list()
+        if path == 'cluster/status':
+            return [{'type': 'cluster', 'name': 'replay', 'quorate': 1, 'nodes': len(cluster.node_names)}] + [
+                {'type': 'node', 'name': node, 'online': 1} for node in cluster.node_names
+            ]
+        if path == 'cluster/resources':
+            return cluster.resources()
+        if path == 'storage':
+            return cluster.storage_list()
+        if parts[0] != 'nodes' or len(parts) < 3 or parts[1] not in cluster.node_names:
+            return None
+
+        node, rest = parts[1], parts[2:]
+        if rest == ['status']:
+            return cluster.node_status(node)
+        if rest == ['storage']:
+            return cluster.storage_list(node)
+        if rest[0] == 'storage' and len(rest) == 3 and rest[2] == 'content':
+            return cluster.backups[node] if rest[1] == 'backup' else []
+        if rest[0] == 'storage' and len(rest) == 4 and method == 'DELETE':
+            return cluster.start_task(node, 'imgdel', rest[3])
+        if rest in (['qemu'], ['lxc']):
+            return cluster.node_guests(node, rest[0])
+        if rest == ['services']:
+            return [{'service': name, 'state': 'running'} for name in ('pveproxy', 'pvedaemon', 'pvestatd')]
+        if rest == ['disks']:
+            return {'list': [{'devpath': '/dev/sda', 'size': 1024 ** 4, 'health': 'PASSED'}]}
+        if rest == ['network']:
+            return [{'iface': 'vmbr0', 'type': 'bridge', 'active': 1}]
+        if rest == ['rrddata']:
+            return cluster.rrddata(query.get('timeframe', 'day'), {'node': node})
+        if rest == ['tasks']:
+            since = int(query.get('since', 0))
+            entries = [cluster.task_entry(upid) for upid, task in cluster.tasks.items()
+                       if task['node'] == node and task['starttime'] >= since]
+            return entries[:int(query.get('limit', 500))]
+        if rest[0] == 'tasks' and len(rest) == 3 and rest[2] == 'status':
+            return cluster.task_entry(rest[1]) if rest[1] in cluster.tasks else None
+
+        if rest[0] in ('qemu', 'lxc') and len(rest) >= 2 and rest[1].isdigit():
+            guest = cluster.guests.get(int(rest[1]))
+            if guest is None or guest['node'] != node or guest['type'] != rest[0]:
+                return None
+            sub = rest[2:]
+            if sub == ['status', 'current']:
+                return guest
+            if sub == ['config']:
+                return {'name': guest['name'], 'memory': guest['maxmem'] // 1024 ** 2, 'cores': guest['maxcpu']}
+            if sub == ['snapshot']:
+                return cluster.snapshots[guest['vmid']] + [{'name': 'current', 'description': 'You are here!'}]
+            if sub == ['rrddata']:
+                return cluster.rrddata(query.get('timeframe', 'day'), guest)
+            if len(sub) == 2 and sub[0] == 'status' and method == 'POST':
+                guest['status'] = 'running' if sub[1] in ('start', 'reboot') else 'stopped'
+                return cluster.start_task(node, f"vz{sub[1]}" if rest[0] == 'lxc' else f"qm{sub[1]}", guest['vmid'])
+            if len(sub) == 2 and sub[0] == 'snapshot' and method == 'DELETE':
+                cluster.snapshots[guest['vmid']] = [s for s in cluster.snapshots[guest['vmid']] if s['name'] != sub[1]]
+                return cluster.start_task(node, 'qmdelsnapshot', guest['vmid'])
+        return None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> Tuple[web.AppRunner, int]:
+        """Start serving in the current event loop; returns the runner and bound port."""
+        runner = web.AppRunner(self.app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        return runner, bound_port
+
+
+# Fixture recording
+
+RECORD_ENDPOINTS = ('version', 'nodes', 'cluster/status', 'cluster/resources', 'storage')
+RECORD_NODE_ENDPOINTS = ('status', 'storage', 'qemu', 'lxc', 'services', 'disks', 'network')
+
+
+async def record_fixtures(config_path: str, output_path: str, server_name: Optional[str] = None) -> int:
+    """Capture GET responses from a real cluster into a fixture file."""
+    from proxmox_mcp.config import ProxmoxMCPConfig
+    from proxmox_mcp.proxmox_client import ProxmoxClient
+
+    config = ProxmoxMCPConfig.from_file(config_path)
+    server_config = config.get_server_config(server_name or config.default_server)
+    fixtures: Dict[str, Any] = {}
+    async with ProxmoxClient(server_config) as client:
+        for endpoint in RECORD_ENDPOINTS:
+            fixtures[endpoint] = await client.get_api_data(endpoint)
+        for node in fixtures['nodes'].get('data', []):
+            for endpoint in RECORD_NODE_ENDPOINTS:
+                path = f"nodes/{node['node']}/{endpoint}"
+                try:
+                    fixtures[path] = await client.get_api_data(path)
+                except Exception as e:
+                    print(f"Skipping {path}: {e}", file=sys.stderr)
+    Path(output_path).write_text(json.dumps(fixtures, indent=2))
+    return len(fixtures)
+
+
+def build_server(args: argparse.Namespace) -> ReplayServer:
+    latency = LatencyProfile(default_ms=args.latency, jitter_ms=args.jitter)
+    for spec in args.endpoint_latency or []:
+        latency.add_override(spec)
+    fixtures = json.loads(Path(args.fixtures).read_text()) if args.fixtures else None
+    cluster = SyntheticCluster(nodes=args.nodes, guests=args.guests, task_seconds=args.task_seconds)
+    return ReplayServer(cluster, latency, fixtures)
+
+
+def add_cluster_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--nodes', type=int, default=3, help='Synthetic cluster node count')
+    parser.add_argument('--guests', type=int, default=30, help='Synthetic guest count (VMs and containers alternate)')
+    parser.add_argument('--latency', type=float, default=10.0, help='Base response latency in ms')
+    parser.add_argument('--jitter', type=float, default=2.0, help='Latency jitter in ms (+/-)')
+    parser.add_argument('--endpoint-latency', action='append', metavar='REGEX=MS[:JITTER]',
+                        help='Per-endpoint latency override (repeatable, first match wins)')
+    parser.add_argument('--task-seconds', type=float, default=0.5, help='Seconds until synthetic tasks finish')
+    parser.add_argument('--fixtures', help='JSON file of captured responses keyed by API path')
+
+
+async def serve(args: argparse.Namespace) -> None:
+    server = build_server(args)
+    runner, port = await server.start(args.host, args.port)
+    print(f"Replay server on http://{args.host}:{port}{API_PREFIX} "
+          f"({args.nodes} nodes, {args.guests} guests); stats at /_replay/stats")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Proxmox API replay stand-in')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Serve synthetic/fixture API responses')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8006)
+    add_cluster_arguments(serve_parser)
+
+    record_parser = subparsers.add_parser('record', help='Capture fixtures from a real cluster')
+    record_parser.add_argument('config', help='Proxmox MCP configuration file')
+    record_parser.add_argument('output', help='Fixture file to write')
+    record_parser.add_argument('--server', help='Server name (defaults to default_server)')
+
+    args = parser.parse_args()
+    if args.command == 'serve':
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+    else:
+        count = asyncio.run(record_fixtures(args.config, args.output, args.server))
+        print(f"Recorded {count} responses to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
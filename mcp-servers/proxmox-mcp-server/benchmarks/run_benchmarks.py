@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark suite for Proxmox MCP tools.
+
+Starts the replay stand-in in-process, points a ProxmoxMCPServer at it and
+calls each tool through the tool registry, recording wall-clock latency, API
+request counts and peak request concurrency per tool. Results can be saved and
+compared against a baseline; a tool whose latency or request count regresses
+beyond the thresholds fails the run (exit code 1), which catches regressions
+such as serial per-guest fan-out.
+
+Usage:
+    python benchmarks/run_benchmarks.py --nodes 5 --guests 200 --latency 20
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --baseline results.json --max-latency-regression 25
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from replay_server import LatencyProfile, ReplayServer, SyntheticCluster, add_cluster_arguments  # noqa: E402
+
+from proxmox_mcp.config import ProxmoxMCPConfig  # noqa: E402
+from proxmox_mcp.server import ProxmoxMCPServer  # noqa: E402
+
+
+def first_container(cluster: SyntheticCluster) -> Dict[str, Any]:
+    guest = next(g for g in cluster.guests.values() if g['type'] == 'lxc')
+    return {"node": guest['node'], "vmid": guest['vmid'], "timeout": 30}
+
+
+# (label, tool name, arguments or a function of the cluster); read-only tools plus one task-producing call
+SCENARIOS: List[Tuple[str, str, Union[Dict[str, Any], Callable[[SyntheticCluster], Dict[str, Any]]]]] = [
+    ("get_system_info", "get_system_info", {}),
+    ("get_node_status", "get_node_status", {"node": "pve1"}),
+    ("list_virtual_machines", "list_virtual_machines", {}),
+    ("list_containers", "list_containers", {}),
+    ("get_storage_status", "get_storage_status", {}),
+    ("monitor_resource_usage", "monitor_resource_usage", {}),
+    ("run_health_assessment", "run_health_assessment", {}),
+    ("snapshots_list", "manage_snapshots", {"operation": "list"}),
+    ("snapshots_analyze", "manage_snapshots", {"operation": "analyze"}),
+    ("backups_list", "manage_backups", {"operation": "list"}),
+    ("backups_analyze", "manage_backups", {"operation": "analyze"}),
+    ("analyze_resource_trends", "analyze_resource_trends", {"metric": "disk_used", "rank_by": "growth_per_day"}),
+    ("get_audit_report", "get_audit_report", {"format": "jsonl"}),
+    ("start_container", "start_container", first_container),
+]
+
+
+def build_config(port: int) -> ProxmoxMCPConfig:
+    return ProxmoxMCPConfig(
+        servers={
+            "replay": {
+                "host": "127.0.0.1",
+                "port": port,
+                "use_ssl": False,
+                "username": "root",
+                "password": "replay",
+                "task_poll_interval": 0.2
+            }
+        },
+        default_server="replay",
+        log_level="WARNING"
+    )
+
+
+async def run_scenario(server: ProxmoxMCPServer, replay: ReplayServer, tool: str, arguments: Dict[str, Any],
+                       repeat: int, cold: bool) -> Dict[str, Any]:
+    client = await server._get_client()
+    latencies = []
+    requests = []
+    peaks = []
+    errors = 0
+    for _ in range(repeat):
+        if cold and client.cache:
+            client.cache.clear()
+        replay.reset_stats()
+        start = time.perf_counter()
+        try:
+            await server.tools.call(tool, dict(arguments))
+        except Exception as e:
+            errors += 1
+            logging.warning(f"{tool} failed: {e}")
+        latencies.append((time.perf_counter() - start) * 1000)
+        stats = replay.get_stats()
+        requests.append(stats['total_requests'])
+        peaks.append(stats['peak_in_flight'])
+    return {
+        'tool': tool,
+        'runs': repeat,
+        'errors': errors,
+        'latency_ms': {
+            'median': round(statistics.median(latencies), 1),
+            'min': round(min(latencies), 1),
+            'max': round(max(latencies), 1)
+        },
+        'requests': max(requests),
+        'peak_concurrency': max(peaks)
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_latency_pct: float,
+            max_request_pct: float) -> List[str]:
+    """Return regression messages for scenarios worse than the baseline."""
+    regressions = []
+    for label, result in results['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(label)
+        if not before:
+            continue
+        latency_before = before['latency_ms']['median']
+        latency_now = result['latency_ms']['median']
+        if latency_before and (latency_now - latency_before) / latency_before * 100 > max_latency_pct:
+            regressions.append(f"{label}: median latency {latency_before} -> {latency_now} ms")
+        if before['requests'] and (result['requests'] - before['requests']) / before['requests'] * 100 > max_request_pct:
+            regressions.append(f"{label}: requests {before['requests']} -> {result['requests']}")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    latency = LatencyProfile(default_ms=args.latency, jitter_ms=args.jitter)
+    for spec in args.endpoint_latency or []:
+        latency.add_override(spec)
+    fixtures = json.loads(Path(args.fixtures).read_text()) if args.fixtures else None
+    cluster = SyntheticCluster(nodes=args.nodes, guests=args.guests, task_seconds=args.task_seconds)
+    replay = ReplayServer(cluster, latency, fixtures)
+    runner, port = await replay.start()
+
+    server = ProxmoxMCPServer(build_config(port))
+    selected = set(args.only or [])
+    results: Dict[str, Any] = {
+        'parameters': {
+            'nodes': args.nodes, 'guests': args.guests, 'latency_ms': args.latency,
+            'jitter_ms': args.jitter, 'repeat': args.repeat, 'cold_cache': not args.warm
+        },
+        'scenarios': {}
+    }
+    try:
+        for label, tool, arguments in SCENARIOS:
+            if selected and label not in selected:
+                continue
+            if callable(arguments):
+                arguments = arguments(cluster)
+            results['scenarios'][label] = await run_scenario(server, replay, tool, arguments,
+                                                             args.repeat, cold=not args.warm)
+    finally:
+        for client in server._clients.values():
+            await client.disconnect()
+        await runner.cleanup()
+    return results
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"{'scenario':<26}{'median ms':>11}{'max ms':>10}{'requests':>10}{'peak conc':>11}{'errors':>8}")
+    for label, result in results['scenarios'].items():
+        print(f"{label:<26}{result['latency_ms']['median']:>11}{result['latency_ms']['max']:>10}"
+              f"{result['requests']:>10}{result['peak_concurrency']:>11}{result['errors']:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark Proxmox MCP tools against the replay stand-in')
+    add_cluster_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per scenario')
+    parser.add_argument('--warm', action='store_true', help='Keep the response cache between runs')
+    parser.add_argument('--only', action='append', metavar='SCENARIO', help='Run only these scenarios (repeatable)')
+    parser.add_argument('--output', help='Write results as JSON')
+    parser.add_argument('--baseline', help='Compare against a previous results file')
+    parser.add_argument('--max-latency-regression', type=float, default=25.0, help='Allowed median latency increase in %%')
+    parser.add_argument('--max-request-regression', type=float, default=0.0, help='Allowed request count increase in %%')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run(args))
+    print_table(results)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.max_latency_regression, args.max_request_regression)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == '__main__':
+    main()
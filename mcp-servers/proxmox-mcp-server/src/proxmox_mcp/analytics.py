@@ -0,0 +1,234 @@
+"""
+Historical resource analytics over Proxmox RRD data.
+
+Proxmox keeps pre-aggregated ``rrddata`` series for every node and guest
+(hour/day/week/month/year). Series for many guests are fetched concurrently,
+aligned into a single NumPy matrix (one row per guest, NaN for gaps) and
+reduced in one vectorized pass to averages, percentiles, maxima and growth
+rates for top-N ranking.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is only needed for the analytics tool
+    np = None
+
+from .exceptions import ProxmoxOperationError, ProxmoxValidationError
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAMES = ('hour', 'day', 'week', 'month', 'year')
+RANK_FIELDS = ('avg', 'p95', 'max', 'last', 'growth', 'growth_per_day')
+
+
+def _ratio(used: str, total: str) -> Callable[[Dict[str, Any]], Optional[float]]:
+    def extract(point: Dict[str, Any]) -> Optional[float]:
+        if point.get(used) is None or not point.get(total):
+            return None
+        return point[used] / point[total] * 100
+    return extract
+
+
+def _field(name: str, scale: float = 1.0) -> Callable[[Dict[str, Any]], Optional[float]]:
+    def extract(point: Dict[str, Any]) -> Optional[float]:
+        value = point.get(name)
+        return None if value is None else value * scale
+    return extract
+
+
+@dataclass(frozen=True)
+class RRDMetric:
+    """How to derive one metric from an RRD data point."""
+
+    unit: str
+    guest: Callable[[Dict[str, Any]], Optional[float]]
+    node: Callable[[Dict[str, Any]], Optional[float]]
+
+
+# Guest points carry cpu/mem/maxmem/disk/maxdisk/netin/netout/diskread/diskwrite;
+# node points carry cpu/memused/memtotal/rootused/roottotal/netin/netout/loadavg.
+RRD_METRICS: Dict[str, RRDMetric] = {
+    'cpu': RRDMetric('percent', _field('cpu', 100), _field('cpu', 100)),
+    'memory': RRDMetric('percent', _ratio('mem', 'maxmem'), _ratio('memused', 'memtotal')),
+    'memory_used': RRDMetric('bytes', _field('mem'), _field('memused')),
+    'disk': RRDMetric('percent', _ratio('disk', 'maxdisk'), _ratio('rootused', 'roottotal')),
+    'disk_used': RRDMetric('bytes', _field('disk'), _field('rootused')),
+    'netin': RRDMetric('bytes_per_second', _field('netin'), _field('netin')),
+    'netout': RRDMetric('bytes_per_second', _field('netout'), _field('netout')),
+    'diskread': RRDMetric('bytes_per_second', _field('diskread'), _field('diskread')),
+    'diskwrite': RRDMetric('bytes_per_second', _field('diskwrite'), _field('diskwrite')),
+}
+
+
+def require_numpy() -> None:
+    if np is None:
+        raise ProxmoxOperationError(
+            "Resource trend analytics require NumPy; install it with 'pip install numpy'"
+        )
+
+
+def build_matrix(series: Sequence[List[Dict[str, Any]]], extract: Callable[[Dict[str, Any]], Optional[float]]):
+    """Align RRD series on a common time axis.
+
+    Returns ``(times, values)`` where ``times`` is the sorted union of sample
+    timestamps and ``values`` has one row per series with NaN where a series
+    has no (or an empty) sample.
+    """
+    times = np.array(sorted({point['time'] for points in series for point in points if 'time' in point}),
+                     dtype=float)
+    values = np.full((len(series), len(times)), np.nan)
+    if not len(times):
+        return times, values
+    for row, points in enumerate(series):
+        samples = [(point['time'], extract(point)) for point in points if 'time' in point]
+        samples = [(t, v) for t, v in samples if v is not None]
+        if samples:
+            stamps, data = zip(*samples)
+            values[row, np.searchsorted(times, stamps)] = data
+    return times, values
+
+
+def summarize_matrix(times, values, percentiles: Sequence[float]) -> Dict[str, Any]:
+    """Vectorized per-row statistics for an aligned series matrix.
+
+    Growth is last minus first valid sample; ``growth_per_day`` is the
+    least-squares slope, which is robust to a single noisy endpoint.
+    """
+    if values.shape[0] == 0 or values.shape[1] == 0:
+        # No series or no samples: reductions over an empty axis would raise
+        empty = np.full(values.shape[0], np.nan)
+        return {
+            'samples': np.zeros(values.shape[0], dtype=int),
+            'avg': empty,
+            'max': empty.copy(),
+            'first': empty.copy(),
+            'last': empty.copy(),
+            'growth': empty.copy(),
+            'growth_per_day': empty.copy(),
+            'percentiles': {p: empty.copy() for p in percentiles}
+        }
+
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=1)
+    has_data = counts > 0
+    safe = np.where(valid, values, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg = np.where(has_data, safe.sum(axis=1) / counts, np.nan)
+        maxima = np.where(has_data, np.max(np.where(valid, values, -np.inf), axis=1), np.nan)
+        # Rows without data are zero-filled here and masked back to NaN below
+        quantiles = {
+            p: np.nanpercentile(np.where(has_data[:, None], values, 0.0), p, axis=1)
+            for p in percentiles
+        }
+
+        first_index = np.argmax(valid, axis=1)
+        last_index = values.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+        rows = np.arange(values.shape[0])
+        first = np.where(has_data, safe[rows, first_index], np.nan)
+        last = np.where(has_data, safe[rows, last_index], np.nan)
+
+        # Least-squares slope per row over valid samples only
+        t = np.where(valid, times[None, :], 0.0)
+        t_mean = t.sum(axis=1) / counts
+        y_mean = safe.sum(axis=1) / counts
+        dt = np.where(valid, times[None, :] - t_mean[:, None], 0.0)
+        dy = np.where(valid, safe - y_mean[:, None], 0.0)
+        slope = (dt * dy).sum(axis=1) / (dt * dt).sum(axis=1)
+
+    for p in percentiles:
+        quantiles[p] = np.where(has_data, quantiles[p], np.nan)
+
+    return {
+        'samples': counts,
+        'avg': avg,
+        'max': maxima,
+        'first': first,
+        'last': last,
+        'growth': last - first,
+        'growth_per_day': np.where(counts > 1, slope * 86400, np.nan),
+        'percentiles': quantiles
+    }
+
+
+def _clean(value) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) or np.isinf(value) else round(value, 4)
+
+
+def rank_series(labels: List[Dict[str, Any]], stats: Dict[str, Any], rank_by: str, top_n: int,
+                ascending: bool = False) -> List[Dict[str, Any]]:
+    """Build top-N result rows from ``summarize_matrix`` output."""
+    if rank_by not in RANK_FIELDS:
+        raise ProxmoxValidationError(f"Unknown rank field: {rank_by}")
+    key = stats[rank_by]
+    order_key = np.where(np.isnan(key), np.inf if ascending else -np.inf, key)
+    order = np.argsort(order_key, kind='stable')
+    if not ascending:
+        order = order[::-1]
+
+    rows = []
+    for index in order[:top_n]:
+        if np.isnan(key[index]):
+            continue
+        row = dict(labels[index])
+        row.update({
+            'samples': int(stats['samples'][index]),
+            'avg': _clean(stats['avg'][index]),
+            'max': _clean(stats['max'][index]),
+            'last': _clean(stats['last'][index]),
+            'growth': _clean(stats['growth'][index]),
+            'growth_per_day': _clean(stats['growth_per_day'][index]),
+            'percentiles': {f"p{p:g}": _clean(values[index]) for p, values in stats['percentiles'].items()}
+        })
+        rows.append(row)
+    return rows
+
+
+def fleet_summary(stats: Dict[str, Any], percentiles: Sequence[float]) -> Dict[str, Any]:
+    """Distribution of per-series averages across all analyzed series."""
+    averages = stats['avg'][~np.isnan(stats['avg'])]
+    if not len(averages):
+        return {'series_with_data': 0}
+    return {
+        'series_with_data': int(len(averages)),
+        'mean_of_averages': _clean(averages.mean()),
+        'percentiles_of_averages': {f"p{p:g}": _clean(np.percentile(averages, p)) for p in percentiles},
+        'total_growth': _clean(np.nansum(stats['growth']))
+    }
+
+
+def analyze_series(labels: List[Dict[str, Any]], series: List[List[Dict[str, Any]]], metric: str,
+                   target: str, rank_by: str = 'avg', top_n: int = 10,
+                   percentiles: Sequence[float] = (50, 95, 99), ascending: bool = False) -> Dict[str, Any]:
+    """Analyze fetched RRD series; ``labels[i]`` describes ``series[i]``."""
+    require_numpy()
+    if metric not in RRD_METRICS:
+        raise ProxmoxValidationError(f"Unknown RRD metric: {metric}")
+    definition = RRD_METRICS[metric]
+    percentiles = sorted({float(p) for p in list(percentiles) + [95]})
+    if any(p < 0 or p > 100 for p in percentiles):
+        raise ProxmoxValidationError("Percentiles must be between 0 and 100")
+
+    times, values = build_matrix(series, definition.node if target == 'nodes' else definition.guest)
+    stats = summarize_matrix(times, values, percentiles)
+    stats['p95'] = stats['percentiles'][95.0]
+
+    return {
+        'metric': metric,
+        'unit': definition.unit,
+        'rank_by': rank_by,
+        'series_analyzed': len(series),
+        'points': int(len(times)),
+        'period': {
+            'start': int(times[0]) if len(times) else None,
+            'end': int(times[-1]) if len(times) else None
+        },
+        'top': rank_series(labels, stats, rank_by, top_n, ascending),
+        'fleet': fleet_summary(stats, percentiles)
+    }
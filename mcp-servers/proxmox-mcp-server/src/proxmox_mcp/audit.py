@@ -0,0 +1,285 @@
+"""
+Bounded audit trail for Proxmox MCP Server.
+
+Recent operations are kept in an in-memory ring buffer. When the buffer fills,
+the oldest entries spill in batches to an append-only SQLite log indexed on
+timestamp, operation and category, so audit queries and reports read from the
+store instead of holding the full history in RAM. All SQLite work (spilled
+batches and queries alike) runs on one dedicated thread, so neither commits
+nor reads block the event loop.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    operation TEXT NOT NULL,
+    category TEXT,
+    status TEXT NOT NULL,
+    params TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_operations_timestamp ON operations (timestamp);
+CREATE INDEX IF NOT EXISTS idx_operations_operation ON operations (operation, timestamp);
+CREATE INDEX IF NOT EXISTS idx_operations_category ON operations (category, timestamp);
+"""
+
+GROUP_BY = ('operation', 'category', 'status')
+
+
+def _entry_row(entry: Dict[str, Any]) -> tuple:
+    return (
+        entry['ts'],
+        entry['operation'],
+        entry.get('category'),
+        entry['status'],
+        json.dumps(entry.get('params') or {}, default=str)
+    )
+
+
+def _public(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Audit entry as returned to callers (without the internal epoch field)."""
+    return {key: value for key, value in entry.items() if key != 'ts'}
+
+
+class AuditStore:
+    """Append-only SQLite audit log.
+
+    The connection lives on a single worker thread and every statement runs
+    there, in submission order: a query submitted after a batch of inserts
+    sees those inserts. Use ``append_later`` and ``run`` from the event loop.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='audit-store')
+        self._executor.submit(self._open).result()
+
+    def _open(self) -> None:
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def append_later(self, entries: List[Dict[str, Any]]) -> Future:
+        """Queue entries for insertion in one transaction."""
+        return self._executor.submit(self._append_many, entries)
+
+    async def run(self, method: Callable[..., Any], *args: Any) -> Any:
+        """Run a read method of this store on the store thread, after queued inserts."""
+        return await asyncio.wrap_future(self._executor.submit(method, *args))
+
+    def _append_many(self, entries: List[Dict[str, Any]]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO operations (timestamp, operation, category, status, params) VALUES (?, ?, ?, ?, ?)",
+                [_entry_row(entry) for entry in entries]
+            )
+
+    def query(self, operation: Optional[str] = None, category: Optional[str] = None, status: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Entries matching the filters, newest first."""
+        where, args = self._where(operation, category, status, since, until)
+        rows = self._conn.execute(
+            f"SELECT timestamp, operation, category, status, params FROM operations{where} "
+            f"ORDER BY timestamp DESC, id DESC LIMIT ?",
+            args + [limit]
+        ).fetchall()
+        return [
+            {
+                'ts': ts,
+                'timestamp': datetime.fromtimestamp(ts).isoformat(),
+                'operation': operation_name,
+                'category': category_name,
+                'status': status_name,
+                'params': json.loads(params) if params else {}
+            }
+            for ts, operation_name, category_name, status_name, params in rows
+        ]
+
+    def counts(self, group_by: str, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, int]:
+        """Entry counts grouped by ``operation``, ``category`` or ``status``."""
+        if group_by not in GROUP_BY:
+            raise ValueError(f"Cannot group audit entries by {group_by}")
+        where, args = self._where(since=since, until=until)
+        rows = self._conn.execute(
+            f"SELECT {group_by}, COUNT(*) FROM operations{where} GROUP BY {group_by}", args
+        ).fetchall()
+        return {key or 'uncategorized': count for key, count in rows}
+
+    def all_counts(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, Dict[str, int]]:
+        """``counts`` for every grouping, keyed by group name."""
+        return {group_by: self.counts(group_by, since, until) for group_by in GROUP_BY}
+
+    def total(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM operations").fetchone()[0]
+
+    @staticmethod
+    def _where(operation: Optional[str] = None, category: Optional[str] = None, status: Optional[str] = None,
+               since: Optional[float] = None, until: Optional[float] = None):
+        clauses, args = [], []
+        for column, value in (('operation', operation), ('category', category), ('status', status)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            args.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            args.append(until)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), args
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def close(self) -> None:
+        """Finish queued work, then close the connection."""
+        self._executor.submit(self._close_connection)
+        self._executor.shutdown(wait=True)
+
+
+class AuditLog:
+    """Ring buffer of recent audit entries that spills to an ``AuditStore``.
+
+    Without a store, entries beyond ``buffer_size`` are discarded. Store reads
+    are queued behind pending spills, so every entry is seen exactly once.
+    """
+
+    def __init__(self, buffer_size: int = 1000, store: Optional[AuditStore] = None, spill_batch: int = 100):
+        self.buffer_size = buffer_size
+        self.store = store
+        self.spill_batch = max(1, min(spill_batch, buffer_size // 10))
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        # Spill outcomes are counted on the store thread
+        self._stats_lock = threading.Lock()
+        self.stats = {'recorded': 0, 'spilled': 0, 'dropped': 0}
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def append(self, operation: str, category: Optional[str], params: Dict[str, Any], status: str) -> Dict[str, Any]:
+        now = time.time()
+        entry = {
+            'ts': now,
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
+            'operation': operation,
+            'category': category,
+            'params': params,
+            'status': status
+        }
+        self._buffer.append(entry)
+        self._count('recorded')
+        if len(self._buffer) > self.buffer_size:
+            # Spill in batches so the store sees one transaction per batch, not per call
+            self._spill(self.spill_batch)
+        return entry
+
+    def _spill(self, count: int) -> None:
+        batch = [self._buffer.popleft() for _ in range(min(count, len(self._buffer)))]
+        if not batch:
+            return
+        if self.store is None:
+            self._count('dropped', len(batch))
+            return
+        future = self.store.append_later(batch)
+        future.add_done_callback(lambda done, batch=batch, path=self.store.path: self._spilled(batch, path, done))
+
+    def _spilled(self, batch: List[Dict[str, Any]], path: str, future: Future) -> None:
+        error = future.exception()
+        if error is None:
+            self._count('spilled', len(batch))
+            return
+        self._count('dropped', len(batch))
+        logger.error(f"Failed to spill {len(batch)} audit entries to {path}: {error}")
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Buffered entries, oldest first."""
+        entries = list(self._buffer)
+        if limit:
+            entries = entries[-limit:]
+        return [_public(entry) for entry in entries]
+
+    async def query(self, operation: Optional[str] = None, category: Optional[str] = None,
+                    status: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+                    limit: int = 100) -> List[Dict[str, Any]]:
+        """Entries matching the filters from the buffer and the store, newest first."""
+        matches = []
+        for entry in reversed(self._buffer):
+            if len(matches) >= limit:
+                break
+            if operation is not None and entry['operation'] != operation:
+                continue
+            if category is not None and entry['category'] != category:
+                continue
+            if status is not None and entry['status'] != status:
+                continue
+            if (since is not None and entry['ts'] < since) or (until is not None and entry['ts'] >= until):
+                continue
+            matches.append(entry)
+        if self.store is not None and len(matches) < limit:
+            # Submitted before any await: ordered after every spill of entries no longer in the buffer
+            matches.extend(await self.store.run(
+                self.store.query, operation, category, status, since, until, limit - len(matches)
+            ))
+        return [_public(entry) for entry in matches]
+
+    async def summary(self, since: Optional[float] = None, until: Optional[float] = None) -> Dict[str, Any]:
+        """Counts by operation, category and status over a time range."""
+        stored = self.store.run(self.store.all_counts, since, until) if self.store is not None else None
+        buffered = [
+            entry for entry in self._buffer
+            if not ((since is not None and entry['ts'] < since) or (until is not None and entry['ts'] >= until))
+        ]
+        all_counts = await stored if stored is not None else {}
+        result: Dict[str, Any] = {}
+        for group_by in GROUP_BY:
+            counts = all_counts.get(group_by, {})
+            for entry in buffered:
+                key = entry[group_by] or 'uncategorized'
+                counts[key] = counts.get(key, 0) + 1
+            result[f"by_{group_by}"] = dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+        result['total'] = sum(result['by_status'].values())
+        return result
+
+    def clear(self) -> None:
+        """Drop buffered entries; the on-disk log is append-only and kept."""
+        self._buffer.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {
+            **stats,
+            'buffered': len(self._buffer),
+            'buffer_size': self.buffer_size,
+            'store_path': self.store.path if self.store is not None else None
+        }
+
+    def close(self) -> None:
+        """Flush buffered entries to the store and close it."""
+        if self.store is None:
+            return
+        self._spill(len(self._buffer))
+        self.store.close()
+        self.store = None
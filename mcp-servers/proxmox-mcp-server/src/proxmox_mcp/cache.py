@@ -0,0 +1,159 @@
+"""
+TTL response cache with request coalescing for Proxmox API GET requests.
+
+Endpoints are grouped into classes with their own TTL (version and
+configuration change rarely, status changes constantly). Concurrent identical
+GETs share one in-flight request, and mutating calls invalidate cached entries
+for the node/guest/storage they touch.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from .config import CacheConfig
+
+logger = logging.getLogger(__name__)
+
+# Ordered (class, pattern) pairs; the first match wins.
+ENDPOINT_CLASSES = [
+    ('uncached', re.compile(r'(^|/)tasks(/|$|\?)')),
+    ('version', re.compile(r'^version$')),
+    ('config', re.compile(r'^storage$|/config$|/network$')),
+    ('status', re.compile(r'^cluster/(resources|status)$|/status(/current)?$')),
+]
+
+# Cluster-wide views that reflect any guest or storage change.
+CLUSTER_VIEWS = ('cluster/resources', 'cluster/status')
+
+
+class ResponseCache:
+    """Per-client cache of GET responses keyed by endpoint."""
+
+    def __init__(self, config: CacheConfig):
+        self.config = config
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._generation = 0
+        self.stats: Dict[str, int] = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'bypassed': 0,
+            'invalidations': 0,
+            'evictions': 0
+        }
+        self._class_stats: Dict[str, Dict[str, int]] = {}
+
+    def classify(self, endpoint: str) -> str:
+        """Return the endpoint class used to select a TTL."""
+        for name, pattern in ENDPOINT_CLASSES:
+            if pattern.search(endpoint):
+                return name
+        return 'default'
+
+    def ttl_for(self, endpoint_class: str) -> float:
+        """TTL in seconds for an endpoint class (0 disables caching)."""
+        return {
+            'uncached': 0.0,
+            'version': self.config.version_ttl_seconds,
+            'config': self.config.config_ttl_seconds,
+            'status': self.config.status_ttl_seconds,
+        }.get(endpoint_class, self.config.default_ttl_seconds)
+
+    async def get_or_fetch(self, endpoint: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Return a cached response, join an identical in-flight request, or fetch.
+
+        Cached payloads are shared between callers and must be treated as read-only.
+        """
+        endpoint_class = self.classify(endpoint)
+        ttl = self.ttl_for(endpoint_class)
+        class_stats = self._class_stats.setdefault(endpoint_class, {'hits': 0, 'misses': 0})
+
+        if ttl <= 0:
+            self.stats['bypassed'] += 1
+            return await fetch()
+
+        entry = self._entries.get(endpoint)
+        if entry and entry[0] > time.monotonic():
+            self._entries.move_to_end(endpoint)
+            self.stats['hits'] += 1
+            class_stats['hits'] += 1
+            return entry[1]
+
+        inflight = self._inflight.get(endpoint)
+        if inflight is not None:
+            self.stats['coalesced'] += 1
+            class_stats['hits'] += 1
+            return await asyncio.shield(inflight)
+
+        self.stats['misses'] += 1
+        class_stats['misses'] += 1
+        task = asyncio.ensure_future(fetch())
+        self._inflight[endpoint] = task
+        generation = self._generation
+        task.add_done_callback(lambda done: self._store(endpoint, done, ttl, generation))
+        return await asyncio.shield(task)
+
+    def _store(self, endpoint: str, task: asyncio.Future, ttl: float, generation: int) -> None:
+        """Record a completed fetch unless it was invalidated while in flight."""
+        if self._inflight.get(endpoint) is task:
+            del self._inflight[endpoint]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if generation != self._generation:
+            return
+
+        self._entries[endpoint] = (time.monotonic() + ttl, task.result())
+        self._entries.move_to_end(endpoint)
+        while len(self._entries) > self.config.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def invalidate_for(self, endpoint: str) -> int:
+        """Drop entries related to a mutated endpoint and return how many were removed.
+
+        A call on ``nodes/{node}/qemu/{vmid}/...`` invalidates everything under that
+        guest, its per-node ancestors (``nodes/{node}/qemu``, ``nodes/{node}``) and
+        the cluster-wide views. Storage paths are scoped the same way.
+        """
+        segments = endpoint.split('?', 1)[0].strip('/').split('/')
+        scope = '/'.join(segments[:4] if segments[0] == 'nodes' else segments[:1])
+
+        def related(key: str) -> bool:
+            path = key.split('?', 1)[0]
+            if path == scope or path.startswith(scope + '/') or path in CLUSTER_VIEWS:
+                return True
+            return '/' in path and scope.startswith(path + '/')
+
+        stale = [key for key in self._entries if related(key)]
+        for key in stale:
+            del self._entries[key]
+        for key in [key for key in self._inflight if related(key)]:
+            del self._inflight[key]
+
+        self._generation += 1
+        self.stats['invalidations'] += len(stale)
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached responses after mutation of {endpoint}")
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        self._entries.clear()
+        self._inflight.clear()
+        self._generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit/miss counters and current size."""
+        lookups = self.stats['hits'] + self.stats['coalesced'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'inflight': len(self._inflight),
+            'hit_rate': (self.stats['hits'] + self.stats['coalesced']) / lookups if lookups else 0.0,
+            'by_endpoint_class': {name: dict(counts) for name, counts in self._class_stats.items()}
+        }
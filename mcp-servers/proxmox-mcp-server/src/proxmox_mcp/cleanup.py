@@ -0,0 +1,119 @@
+"""
+Parallel, rate-limited cleanup executor for Proxmox snapshot and backup deletion.
+
+Deletions run concurrently with bounded per-node and per-scope (guest or
+storage) concurrency. Every returned UPID is awaited through the client's task
+tracker so results reflect the final task status, and storage/guest lock
+contention is retried with exponential backoff.
+"""
+
+import asyncio
+import logging
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .config import AutomationConfig
+from .tasks import extract_upid
+
+logger = logging.getLogger(__name__)
+
+LOCK_ERROR_PATTERN = re.compile(r"can't lock|is locked|unable to acquire lock|got timeout", re.IGNORECASE)
+
+
+def is_lock_error(message: Optional[str]) -> bool:
+    """Whether an error message indicates storage or guest lock contention."""
+    return bool(message and LOCK_ERROR_PATTERN.search(message))
+
+
+@dataclass
+class CleanupItem:
+    """A single deletion to perform."""
+
+    node: str
+    scope: str
+    delete: Callable[[], Awaitable[Dict[str, Any]]]
+    info: Dict[str, Any] = field(default_factory=dict)
+
+
+class CleanupExecutor:
+    """Run deletions concurrently under per-node and per-scope limits.
+
+    ``scope`` serializes work that contends on the same lock: snapshot deletes
+    on one guest lock its config, and backup deletes contend on the storage.
+    """
+
+    def __init__(self, client, config: AutomationConfig, scope_concurrency: int = 1):
+        self.client = client
+        self.config = config
+        self.scope_concurrency = scope_concurrency
+        self._node_limits: Dict[str, asyncio.Semaphore] = {}
+        self._scope_limits: Dict[str, asyncio.Semaphore] = {}
+
+    async def run(self, items: List[CleanupItem], info_key: str) -> List[Dict[str, Any]]:
+        """Execute all items and return per-item results in input order."""
+        return list(await asyncio.gather(*(self._execute(item, info_key) for item in items)))
+
+    async def _execute(self, item: CleanupItem, info_key: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        node_limit = self._node_limits.setdefault(item.node, asyncio.Semaphore(self.config.cleanup_node_concurrency))
+        scope_limit = self._scope_limits.setdefault(item.scope, asyncio.Semaphore(self.scope_concurrency))
+
+        result: Dict[str, Any] = {info_key: item.info}
+        attempt = 0
+        while True:
+            attempt += 1
+            error = None
+            # Scope before node, in the same order for every item, so limits cannot deadlock
+            async with scope_limit, node_limit:
+                try:
+                    response = await item.delete()
+                    upid = extract_upid(response)
+                    result['task_id'] = upid
+                    if upid:
+                        tasks = await self.client.tasks.wait([upid], timeout=self.config.cleanup_task_timeout_seconds)
+                        task = tasks[upid]
+                        result['task_status'] = task['exitstatus'] or task['status']
+                        if task['status'] == 'unknown':
+                            error = task['exitstatus']
+                        elif task['status'] != 'stopped':
+                            result['status'] = 'timeout'
+                        elif task['success']:
+                            result['status'] = 'success'
+                        else:
+                            error = task['exitstatus'] or 'task failed'
+                    else:
+                        result['status'] = 'success'
+                except Exception as e:
+                    error = str(e)
+
+            if error is None:
+                break
+            if is_lock_error(error) and attempt <= self.config.cleanup_max_retries:
+                delay = self.config.cleanup_backoff_seconds * (2 ** (attempt - 1))
+                delay += random.uniform(0, delay / 2)
+                logger.info(f"Lock contention on {item.scope}, retrying in {delay:.1f}s: {error}")
+                await asyncio.sleep(delay)
+                continue
+            result['status'] = 'failed'
+            result['error'] = error
+            break
+
+        result['attempts'] = attempt
+        result['latency_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
+
+def summarize_cleanup(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-item cleanup results."""
+    latencies = [r['latency_ms'] for r in results if 'latency_ms' in r]
+    return {
+        'succeeded': sum(1 for r in results if r.get('status') == 'success'),
+        'failed': sum(1 for r in results if r.get('status') == 'failed'),
+        'timed_out': sum(1 for r in results if r.get('status') == 'timeout'),
+        'retried': sum(1 for r in results if r.get('attempts', 1) > 1),
+        'avg_latency_ms': round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+        'max_latency_ms': max(latencies) if latencies else 0.0
+    }
@@ -30,6 +30,10 @@ class SecurityConfig(BaseModel):
     # Validation settings
     require_confirmation_for_destructive_ops: bool = True
     enable_dry_run_mode: bool = False
+    
+    # Audit trail
+    audit_buffer_size: int = Field(default=1000, ge=10, le=100000, description="Audit entries kept in memory")
+    audit_log_path: Optional[str] = Field(default=None, description="SQLite file receiving audit entries evicted from memory")
 
 
 class MonitoringConfig(BaseModel):
@@ -38,6 +42,10 @@ class MonitoringConfig(BaseModel):
     enable_monitoring: bool = True
     check_interval_seconds: int = Field(default=300, ge=60, le=3600)
     
+    # Metrics history (background collector)
+    metrics_history_size: int = Field(default=288, ge=10, le=100000, description="Samples kept per metric series")
+    metrics_persist_path: Optional[str] = Field(default=None, description="File to persist metrics history across restarts")
+    
     # Thresholds
     cpu_threshold: float = Field(default=80.0, ge=0.0, le=100.0)
     memory_threshold: float = Field(default=85.0, ge=0.0, le=100.0)
@@ -48,6 +56,19 @@ class MonitoringConfig(BaseModel):
     notification_endpoints: List[str] = Field(default_factory=list)
 
 
+class CacheConfig(BaseModel):
+    """Response cache configuration for Proxmox API GET requests."""
+    
+    enable_cache: bool = True
+    max_entries: int = Field(default=2048, ge=16, le=100000)
+    
+    # TTLs per endpoint class
+    version_ttl_seconds: float = Field(default=3600.0, ge=0.0, le=86400.0)
+    config_ttl_seconds: float = Field(default=300.0, ge=0.0, le=86400.0)
+    status_ttl_seconds: float = Field(default=5.0, ge=0.0, le=3600.0)
+    default_ttl_seconds: float = Field(default=30.0, ge=0.0, le=3600.0)
+
+
 class ProxmoxServerConfig(BaseModel):
     """Configuration for a single Proxmox server."""
     
@@ -65,8 +86,26 @@ class ProxmoxServerConfig(BaseModel):
     
     # Connection options
     verify_ssl: bool = Field(default=False, description="Verify SSL certificates")
+    use_ssl: bool = Field(default=True, description="Connect over HTTPS (disable only for local replay/benchmark servers)")
     timeout: int = Field(default=30, ge=5, le=300, description="Request timeout in seconds")
+
+    # Multi-node fan-out
+    max_concurrent_requests: int = Field(default=8, ge=1, le=64, description="Maximum concurrent per-node requests")
+    node_timeout: int = Field(default=15, ge=1, le=300, description="Timeout in seconds for each per-node request")
+    task_poll_interval: float = Field(default=1.0, ge=0.2, le=30.0, description="Seconds between task status polls")
+    task_max_poll_failures: int = Field(
+        default=30, ge=1, le=10000,
+        description="Consecutive failed status polls before a task is reported with status 'unknown'"
+    )
+    
+    # Connection pool
+    connection_limit_per_host: int = Field(default=16, ge=1, le=256, description="Maximum pooled connections to the host")
+    keepalive_timeout: float = Field(default=60.0, ge=1.0, le=3600.0, description="Seconds to keep idle connections open")
+    dns_cache_ttl: int = Field(default=300, ge=0, le=86400, description="DNS cache TTL in seconds (0 disables caching)")
     
+    # Password tickets expire after 2 hours; refresh well before that
+    ticket_refresh_interval: int = Field(default=5400, ge=300, le=7000, description="Seconds between ticket refreshes")
+
     # Environment variable overrides
     host_env_var: Optional[str] = Field(default=None, description="Environment variable for host")
     username_env_var: Optional[str] = Field(default=None, description="Environment variable for username")
@@ -96,7 +135,16 @@ class ProxmoxServerConfig(BaseModel):
             'username': os.getenv(self.username_env_var, self.username) if self.username_env_var else self.username,
             'realm': self.realm,
             'verify_ssl': self.verify_ssl,
+            'use_ssl': self.use_ssl,
             'timeout': self.timeout,
+            'max_concurrent_requests': self.max_concurrent_requests,
+            'node_timeout': self.node_timeout,
+            'task_poll_interval': self.task_poll_interval,
+            'task_max_poll_failures': self.task_max_poll_failures,
+            'connection_limit_per_host': self.connection_limit_per_host,
+            'keepalive_timeout': self.keepalive_timeout,
+            'dns_cache_ttl': self.dns_cache_ttl,
+            'ticket_refresh_interval': self.ticket_refresh_interval,
         }
         
         # Handle API token first (preferred method)
@@ -146,6 +194,13 @@ class AutomationConfig(BaseModel):
     # Safety settings
     max_operations_per_run: int = Field(default=25, ge=1, le=100)
     require_manual_confirmation: bool = Field(default=True, description="Require manual confirmation for operations")
+    
+    # Cleanup execution
+    cleanup_node_concurrency: int = Field(default=4, ge=1, le=32, description="Concurrent deletions per node")
+    cleanup_storage_concurrency: int = Field(default=2, ge=1, le=16, description="Concurrent backup deletions per storage")
+    cleanup_task_timeout_seconds: int = Field(default=300, ge=10, le=3600, description="Time to wait for a deletion task to finish")
+    cleanup_max_retries: int = Field(default=3, ge=0, le=10, description="Retries on storage or guest lock errors")
+    cleanup_backoff_seconds: float = Field(default=2.0, ge=0.1, le=60.0, description="Initial backoff after a lock error")
 
 
 class ProxmoxMCPConfig(BaseModel):
@@ -168,10 +223,12 @@ class ProxmoxMCPConfig(BaseModel):
     security: SecurityConfig = Field(default_factory=SecurityConfig)
     monitoring: MonitoringConfig = Field(default_factory=MonitoringConfig) 
     automation: AutomationConfig = Field(default_factory=AutomationConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
     
     # Global settings
     log_level: str = Field(default="INFO", pattern="^(DEBUG|INFO|WARNING|ERROR|CRITICAL)$")
     enable_metrics: bool = Field(default=True, description="Enable performance metrics collection")
+    report_output_dir: Optional[str] = Field(default=None, description="Directory audit reports may be written to")
     
     @validator('default_server')
     def validate_default_server(cls, v, values):
@@ -217,7 +274,15 @@ def create_sample_config() -> Dict:
                 "password_env_var": "PROXMOX_PASSWORD",
                 "realm": "pam",
                 "verify_ssl": False,
-                "timeout": 30
+                "timeout": 30,
+                "max_concurrent_requests": 8,
+                "node_timeout": 15,
+                "task_poll_interval": 1.0,
+                "task_max_poll_failures": 30,
+                "connection_limit_per_host": 16,
+                "keepalive_timeout": 60.0,
+                "dns_cache_ttl": 300,
+                "ticket_refresh_interval": 5400
             }
         },
         "default_server": "main",
@@ -233,11 +298,15 @@ def create_sample_config() -> Dict:
             "memory_usage_threshold": 90.0,
             "storage_usage_threshold": 85.0,
             "require_confirmation_for_destructive_ops": True,
-            "enable_dry_run_mode": False
+            "enable_dry_run_mode": False,
+            "audit_buffer_size": 1000,
+            "audit_log_path": None
         },
         "monitoring": {
             "enable_monitoring": True,
             "check_interval_seconds": 300,
+            "metrics_history_size": 288,
+            "metrics_persist_path": None,
             "cpu_threshold": 80.0,
             "memory_threshold": 85.0,
             "storage_threshold": 90.0,
@@ -253,8 +322,22 @@ def create_sample_config() -> Dict:
             "enable_storage_optimization": False,
             "storage_cleanup_threshold": 85.0,
             "max_operations_per_run": 25,
-            "require_manual_confirmation": True
+            "require_manual_confirmation": True,
+            "cleanup_node_concurrency": 4,
+            "cleanup_storage_concurrency": 2,
+            "cleanup_task_timeout_seconds": 300,
+            "cleanup_max_retries": 3,
+            "cleanup_backoff_seconds": 2.0
+        },
+        "cache": {
+            "enable_cache": True,
+            "max_entries": 2048,
+            "version_ttl_seconds": 3600.0,
+            "config_ttl_seconds": 300.0,
+            "status_ttl_seconds": 5.0,
+            "default_ttl_seconds": 30.0
         },
         "log_level": "INFO",
-        "enable_metrics": True
+        "enable_metrics": True,
+        "report_output_dir": None
     }
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Bounded-concurrency fan-out for multi-node Proxmox queries.
+
+Tools that walk every node of a cluster use this layer instead of awaiting
+each node in turn, so total latency tracks the slowest node rather than the
+sum of all nodes. A slow or unreachable node only degrades its own entry.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FanOutResult:
+    """Outcome of a single fan-out call."""
+
+    key: Hashable
+    data: Any = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the call completed without error or timeout."""
+        return self.error is None
+
+
+class FanOut:
+    """Run per-key coroutines concurrently under a shared limit and per-call timeout.
+
+    One instance is owned by each ``ProxmoxClient``, so the concurrency limit
+    applies to the whole server connection, including concurrent tool calls.
+    """
+
+    def __init__(self, max_concurrency: int = 8, timeout: Optional[float] = 15.0):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(self, key: Hashable, func: Callable[[Any], Awaitable[Any]]) -> FanOutResult:
+        """Run ``func(key)`` under the concurrency limit, capturing errors and timeouts."""
+        async with self._semaphore:
+            start = time.perf_counter()
+            try:
+                if self.timeout:
+                    data = await asyncio.wait_for(func(key), timeout=self.timeout)
+                else:
+                    data = await func(key)
+                return FanOutResult(key=key, data=data, elapsed_ms=(time.perf_counter() - start) * 1000)
+            except asyncio.TimeoutError:
+                logger.warning(f"Fan-out call for {key} timed out after {self.timeout}s")
+                return FanOutResult(
+                    key=key,
+                    error=f"timed out after {self.timeout}s",
+                    elapsed_ms=(time.perf_counter() - start) * 1000
+                )
+            except Exception as e:
+                logger.warning(f"Fan-out call for {key} failed: {e}")
+                return FanOutResult(key=key, error=str(e), elapsed_ms=(time.perf_counter() - start) * 1000)
+
+    async def map(self, keys: Iterable[Hashable], func: Callable[[Any], Awaitable[Any]]) -> Dict[Hashable, FanOutResult]:
+        """Run ``func`` for every key concurrently and return results keyed in input order."""
+        keys = list(dict.fromkeys(keys))
+        results = await asyncio.gather(*(self.run(key, func) for key in keys))
+        return {result.key: result for result in results}
+
+    @staticmethod
+    def split(results: Dict[Hashable, FanOutResult]) -> Tuple[Dict[Hashable, Any], Dict[Hashable, str]]:
+        """Split fan-out results into successful data and per-key error messages."""
+        data = {key: result.data for key, result in results.items() if result.ok}
+        errors = {key: result.error for key, result in results.items() if not result.ok}
+        return data, errors
@@ -0,0 +1,266 @@
+"""
+In-memory metrics history for Proxmox MCP Server.
+
+A background collector samples node status and ``cluster/resources`` at the
+configured monitoring interval into fixed-size, array-backed ring buffers, one
+per entity/metric pair. Trend queries (avg/p95/max over a window) are answered
+from memory without API calls, and the history can be persisted to a compact
+binary file across restarts. Entities that disappear from the cluster, or stop
+reporting for a full buffer's worth of intervals, are evicted so guest churn
+does not grow the history without bound.
+"""
+
+import json
+import logging
+import os
+import struct
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+FILE_MAGIC = b'PXMETRICS1'
+
+
+class RingBuffer:
+    """Fixed-capacity (timestamp, value) series stored in two ``array('d')`` buffers."""
+
+    __slots__ = ('capacity', '_times', '_values', '_next', '_count')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._times = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, timestamp: float, value: float) -> None:
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _ordered_indexes(self) -> Iterable[int]:
+        start = (self._next - self._count) % self.capacity
+        return ((start + i) % self.capacity for i in range(self._count))
+
+    def since(self, timestamp: float) -> List[float]:
+        """Values recorded at or after ``timestamp``, oldest first."""
+        return [self._values[i] for i in self._ordered_indexes() if self._times[i] >= timestamp]
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self._count:
+            return None
+        index = (self._next - 1) % self.capacity
+        return self._times[index], self._values[index]
+
+    def to_bytes(self) -> bytes:
+        order = list(self._ordered_indexes())
+        return array('d', (self._times[i] for i in order)).tobytes() + array('d', (self._values[i] for i in order)).tobytes()
+
+    @classmethod
+    def from_bytes(cls, capacity: int, count: int, payload: bytes) -> "RingBuffer":
+        buffer = cls(capacity)
+        times, values = array('d'), array('d')
+        times.frombytes(payload[:8 * count])
+        values.frombytes(payload[8 * count:16 * count])
+        # Keep only the newest samples if the configured capacity shrank
+        for timestamp, value in list(zip(times, values))[-capacity:]:
+            buffer.append(timestamp, value)
+        return buffer
+
+
+def summarize_values(values: List[float]) -> Dict[str, Any]:
+    """avg/p95/max/min for a list of samples."""
+    if not values:
+        return {'samples': 0, 'avg': None, 'p95': None, 'max': None, 'min': None}
+    ordered = sorted(values)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        'samples': len(ordered),
+        'avg': round(sum(ordered) / len(ordered), 2),
+        'p95': round(ordered[p95_index], 2),
+        'max': round(ordered[-1], 2),
+        'min': round(ordered[0], 2)
+    }
+
+
+class MetricsStore:
+    """Ring-buffer time series indexed by entity, then metric.
+
+    Entities are strings such as ``main:node/pve1`` or ``main:qemu/100``.
+    """
+
+    def __init__(self, capacity: int = 288):
+        self.capacity = capacity
+        self._series: Dict[str, Dict[str, RingBuffer]] = {}
+        self.evicted = 0
+
+    def record(self, entity: str, metric: str, value: Optional[float], timestamp: Optional[float] = None) -> None:
+        if value is None:
+            return
+        metrics = self._series.setdefault(entity, {})
+        series = metrics.get(metric)
+        if series is None:
+            series = metrics[metric] = RingBuffer(self.capacity)
+        series.append(timestamp or time.time(), float(value))
+
+    def entities(self, prefix: str = '') -> List[str]:
+        return sorted(entity for entity in self._series if entity.startswith(prefix))
+
+    def metrics_for(self, entity: str) -> List[str]:
+        return sorted(self._series.get(entity, ()))
+
+    def evict_missing(self, prefixes: Iterable[str], present: Set[str]) -> int:
+        """Drop entities under any of ``prefixes`` that are not in ``present``."""
+        prefixes = tuple(prefixes)
+        return self._evict([
+            entity for entity in self._series if entity.startswith(prefixes) and entity not in present
+        ])
+
+    def evict_stale(self, max_age: float, now: Optional[float] = None) -> int:
+        """Drop entities whose newest sample is older than ``max_age`` seconds."""
+        cutoff = (now or time.time()) - max_age
+        stale = []
+        for entity, metrics in self._series.items():
+            newest = max((latest[0] for latest in (series.latest() for series in metrics.values()) if latest),
+                         default=None)
+            if newest is None or newest < cutoff:
+                stale.append(entity)
+        return self._evict(stale)
+
+    def _evict(self, entities: List[str]) -> int:
+        for entity in entities:
+            del self._series[entity]
+        self.evicted += len(entities)
+        if entities:
+            logger.debug(f"Evicted metrics history for {len(entities)} entities")
+        return len(entities)
+
+    def summarize(self, entity: str, metric: str, window_seconds: float) -> Dict[str, Any]:
+        """Trend summary for one series over the trailing window."""
+        series = self._series.get(entity, {}).get(metric)
+        if series is None:
+            return summarize_values([])
+        summary = summarize_values(series.since(time.time() - window_seconds))
+        latest = series.latest()
+        summary['latest'] = round(latest[1], 2) if latest else None
+        return summary
+
+    def summarize_entity(self, entity: str, window_seconds: float) -> Dict[str, Dict[str, Any]]:
+        return {metric: self.summarize(entity, metric, window_seconds) for metric in self.metrics_for(entity)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'series': sum(len(metrics) for metrics in self._series.values()),
+            'entities': len(self._series),
+            'capacity_per_series': self.capacity,
+            'samples': sum(len(series) for metrics in self._series.values() for series in metrics.values()),
+            'evicted_entities': self.evicted
+        }
+
+    # Persistence
+
+    def _iter_series(self) -> Iterable[Tuple[str, str, RingBuffer]]:
+        for entity, metrics in self._series.items():
+            for metric, series in metrics.items():
+                yield entity, metric, series
+
+    def serialize(self) -> bytes:
+        """Encode all series as ``magic | index length | JSON index | raw arrays``."""
+        index = []
+        payloads = []
+        for entity, metric, series in self._iter_series():
+            index.append({'entity': entity, 'metric': metric, 'count': len(series)})
+            payloads.append(series.to_bytes())
+        header = json.dumps(index, separators=(',', ':')).encode()
+        return FILE_MAGIC + struct.pack('<I', len(header)) + header + b''.join(payloads)
+
+    def load_bytes(self, data: bytes) -> None:
+        if not data.startswith(FILE_MAGIC):
+            raise ValueError("Not a metrics history file")
+        offset = len(FILE_MAGIC)
+        (header_length,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        index = json.loads(data[offset:offset + header_length])
+        offset += header_length
+        for item in index:
+            size = 16 * item['count']
+            self._series.setdefault(item['entity'], {})[item['metric']] = RingBuffer.from_bytes(
+                self.capacity, item['count'], data[offset:offset + size]
+            )
+            offset += size
+
+    @staticmethod
+    def write_file(path: str, payload: bytes) -> None:
+        """Atomically write a serialized history file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+    def load_file(self, path: str) -> bool:
+        """Load history from disk; returns False if the file is missing or unreadable."""
+        try:
+            with open(path, 'rb') as f:
+                self.load_bytes(f.read())
+            logger.info(f"Loaded metrics history for {len(self._series)} entities from {path}")
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable metrics history {path}: {e}")
+            return False
+
+
+def percent(used: Optional[float], total: Optional[float]) -> Optional[float]:
+    if used is None or not total:
+        return None
+    return used / total * 100
+
+
+def record_node_status(store: MetricsStore, server: str, node: str, status: Dict[str, Any], timestamp: float) -> None:
+    """Record metrics from a ``nodes/{node}/status`` response."""
+    entity = f"{server}:node/{node}"
+    memory = status.get('memory') or {}
+    rootfs = status.get('rootfs') or {}
+    loadavg = status.get('loadavg') or []
+    store.record(entity, 'cpu_percent', status['cpu'] * 100 if 'cpu' in status else None, timestamp)
+    store.record(entity, 'memory_percent', percent(memory.get('used'), memory.get('total')), timestamp)
+    store.record(entity, 'rootfs_percent', percent(rootfs.get('used'), rootfs.get('total')), timestamp)
+    if loadavg:
+        store.record(entity, 'loadavg_1m', float(loadavg[0]), timestamp)
+
+
+# Entity kinds sampled from cluster/resources, and so evicted when missing from it
+CLUSTER_RESOURCE_KINDS = ('qemu/', 'lxc/', 'storage/')
+
+
+def record_cluster_resources(store: MetricsStore, server: str, resources: List[Dict[str, Any]],
+                             timestamp: float) -> Set[str]:
+    """Record guest and storage metrics from a ``cluster/resources`` response.
+
+    Returns the entities present in the response.
+    """
+    present = set()
+    for resource in resources:
+        resource_type = resource.get('type')
+        if resource_type in ('qemu', 'lxc'):
+            if resource.get('template'):
+                continue
+            entity = f"{server}:{resource_type}/{resource.get('vmid')}"
+            present.add(entity)
+            store.record(entity, 'cpu_percent', resource['cpu'] * 100 if 'cpu' in resource else None, timestamp)
+            store.record(entity, 'memory_percent', percent(resource.get('mem'), resource.get('maxmem')), timestamp)
+            store.record(entity, 'disk_percent', percent(resource.get('disk'), resource.get('maxdisk')), timestamp)
+        elif resource_type == 'storage':
+            entity = f"{server}:storage/{resource.get('node')}/{resource.get('storage')}"
+            present.add(entity)
+            store.record(entity, 'disk_percent', percent(resource.get('disk'), resource.get('maxdisk')), timestamp)
+    return present
@@ -9,9 +9,14 @@ import asyncio
 import aiohttp
 import ssl
 import logging
+import time
+from urllib.parse import quote
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
-from .config import ProxmoxServerConfig
+from .cache import ResponseCache
+from .config import CacheConfig, ProxmoxServerConfig
+from .fanout import FanOut, FanOutResult
+from .tasks import TaskTracker, TrackedTask, extract_upid
 from .exceptions import (
     ProxmoxConnectionError, 
     ProxmoxAuthenticationError, 
@@ -25,7 +30,7 @@ logger = logging.getLogger(__name__)
 class ProxmoxClient:
     """Enhanced Proxmox API client with MCP integration."""
     
-    def __init__(self, config: ProxmoxServerConfig):
+    def __init__(self, config: ProxmoxServerConfig, cache_config: Optional[CacheConfig] = None):
         """Initialize Proxmox client with configuration."""
         self.config = config
         self.connection_params = config.get_connection_params()
@@ -39,12 +44,31 @@ class ProxmoxClient:
         self.realm = self.connection_params['realm']
         self.verify_ssl = self.connection_params['verify_ssl']
         self.timeout = self.connection_params['timeout']
+        self.ticket_refresh_interval = self.connection_params['ticket_refresh_interval']
+        self.fanout = FanOut(
+            max_concurrency=self.connection_params['max_concurrent_requests'],
+            timeout=self.connection_params['node_timeout']
+        )
         
-        self.base_url = f"https://{self.host}:{self.port}/api2/json"
+        cache_config = cache_config or CacheConfig()
+        self.cache: Optional[ResponseCache] = ResponseCache(cache_config) if cache_config.enable_cache else None
+        self.tasks = TaskTracker(
+            self,
+            poll_interval=self.connection_params['task_poll_interval'],
+            on_finish=self._on_task_finished,
+            max_poll_failures=self.connection_params['task_max_poll_failures']
+        )
+        
+        scheme = 'https' if self.connection_params['use_ssl'] else 'http'
+        self.base_url = f"{scheme}://{self.host}:{self.port}/api2/json"
         self.session: Optional[aiohttp.ClientSession] = None
         self.ticket: Optional[str] = None
         self.csrf_token: Optional[str] = None
         self._authenticated = False
+        self._auth_lock = asyncio.Lock()
+        self._auth_generation = 0
+        self._authenticated_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
         
     async def __aenter__(self):
         """Async context manager entry."""
@@ -60,13 +84,27 @@ class ProxmoxClient:
         try:
             await self.create_session()
             await self.authenticate()
+            if self.auth_method == 'password' and self.ticket != "diagnostic-test-ticket":
+                self._refresh_task = asyncio.ensure_future(self._ticket_refresh_loop())
             logger.info(f"Successfully connected to Proxmox server {self.host}:{self.port}")
         except Exception as e:
             logger.error(f"Failed to connect to Proxmox server: {e}")
+            if self.session and not self.session.closed:
+                await self.session.close()
             raise ProxmoxConnectionError(f"Connection failed: {e}")
     
     async def disconnect(self) -> None:
         """Close session and cleanup."""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+        self._refresh_task = None
+        await self.tasks.close()
+        if self.cache:
+            self.cache.clear()
         if self.session and not self.session.closed:
             await self.session.close()
             self.session = None
@@ -74,13 +112,20 @@ class ProxmoxClient:
             logger.info(f"Disconnected from Proxmox server {self.host}:{self.port}")
     
     async def create_session(self) -> None:
-        """Create aiohttp session with SSL configuration."""
+        """Create aiohttp session with SSL and connection pool configuration."""
         ssl_context = ssl.create_default_context()
         if not self.verify_ssl:
             ssl_context.check_hostname = False
             ssl_context.verify_mode = ssl.CERT_NONE
-            
-        connector = aiohttp.TCPConnector(ssl=ssl_context)
+        
+        dns_cache_ttl = self.connection_params['dns_cache_ttl']
+        connector = aiohttp.TCPConnector(
+            ssl=ssl_context,
+            limit_per_host=self.connection_params['connection_limit_per_host'],
+            keepalive_timeout=self.connection_params['keepalive_timeout'],
+            use_dns_cache=dns_cache_ttl > 0,
+            ttl_dns_cache=dns_cache_ttl or None
+        )
         timeout = aiohttp.ClientTimeout(total=self.timeout)
         self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
         
@@ -118,7 +163,7 @@ class ProxmoxClient:
             try:
                 async with self.session.get(f"{self.base_url}/version") as response:
                     if response.status == 200:
-                        self._authenticated = True
+                        self._mark_authenticated()
                         logger.info(f"API token authentication successful for user {self.username}")
                         return
                     else:
@@ -148,7 +193,7 @@ class ProxmoxClient:
                         'Cookie': f'PVEAuthCookie={self.ticket}',
                         'CSRFPreventionToken': self.csrf_token
                     })
-                    self._authenticated = True
+                    self._mark_authenticated()
                     logger.info(f"Password authentication successful for user {self.username}")
                 else:
                     error_text = await response.text()
@@ -158,8 +203,40 @@ class ProxmoxClient:
         except Exception as e:
             raise ProxmoxAuthenticationError(f"Authentication error: {e}")
             
+    def _mark_authenticated(self) -> None:
+        self._authenticated = True
+        self._authenticated_at = time.monotonic()
+        self._auth_generation += 1
+    
+    async def _reauthenticate(self, seen_generation: int) -> None:
+        """Re-authenticate once, unless another request already did since ``seen_generation``."""
+        async with self._auth_lock:
+            if self._auth_generation != seen_generation:
+                return
+            logger.info(f"Re-authenticating with Proxmox server {self.host}:{self.port}")
+            await self.authenticate()
+    
+    async def _ticket_refresh_loop(self) -> None:
+        """Renew the password ticket in the background before it expires."""
+        while True:
+            elapsed = time.monotonic() - (self._authenticated_at or time.monotonic())
+            await asyncio.sleep(max(1.0, self.ticket_refresh_interval - elapsed))
+            if time.monotonic() - (self._authenticated_at or 0) < self.ticket_refresh_interval:
+                # A 401-triggered re-authentication already renewed the ticket
+                continue
+            try:
+                await self._reauthenticate(self._auth_generation)
+            except Exception as e:
+                logger.warning(f"Ticket refresh failed for {self.host}, retrying in 60s: {e}")
+                await asyncio.sleep(60)
+    
     async def get_api_data(self, endpoint: str, method: str = 'GET', data: Optional[Dict] = None) -> Dict[str, Any]:
-        """Generic method to interact with Proxmox API."""
+        """Generic method to interact with Proxmox API.
+        
+        GET responses are served through the response cache when enabled; any
+        other method invalidates cached entries for the resource it touches, and
+        a UPID in its response is registered with the task tracker.
+        """
         if not self._authenticated:
             raise ProxmoxAuthenticationError("Not authenticated. Call authenticate() first.")
         
@@ -167,23 +244,57 @@ class ProxmoxClient:
         if self.ticket == "diagnostic-test-ticket":
             logger.info(f"Diagnostic mode: simulating API call to {endpoint}")
             return self._get_diagnostic_response(endpoint)
-            
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        
+        endpoint = endpoint.lstrip('/')
+        if method == 'GET':
+            if self.cache:
+                return await self.cache.get_or_fetch(endpoint, lambda: self._request(endpoint, method, data))
+            return await self._request(endpoint, method, data)
+        
+        try:
+            result = await self._request(endpoint, method, data)
+        finally:
+            if self.cache:
+                self.cache.invalidate_for(endpoint)
+        
+        upid = extract_upid(result)
+        if upid:
+            self.tasks.register(upid, origin=endpoint)
+        return result
+    
+    def _on_task_finished(self, task: TrackedTask) -> None:
+        """Invalidate cached state touched by a task once it has actually finished."""
+        if self.cache and task.origin:
+            self.cache.invalidate_for(task.origin)
+    
+    async def _request(self, endpoint: str, method: str, data: Optional[Dict] = None,
+                       retry_auth: bool = True) -> Dict[str, Any]:
+        """Perform a single uncached API request.
+        
+        A 401 response triggers one transparent re-authentication and retry.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        auth_generation = self._auth_generation
         
         try:
             async with self.session.request(method, url, data=data) as response:
                 if response.status == 200:
                     return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"API call failed for {endpoint}: {response.status} - {error_text}")
-                    raise ProxmoxAPIError(f"API call failed for {endpoint}: {response.status} - {error_text}")
+                status = response.status
+                error_text = await response.text()
         except aiohttp.ClientError as e:
             logger.error(f"Network error for API call {endpoint}: {e}")
             raise ProxmoxConnectionError(f"Network error for {endpoint}: {e}")
         except Exception as e:
             logger.error(f"Unexpected error for API call {endpoint}: {e}")
             raise ProxmoxAPIError(f"API error for {endpoint}: {e}")
+        
+        if status == 401 and retry_auth:
+            await self._reauthenticate(auth_generation)
+            return await self._request(endpoint, method, data, retry_auth=False)
+        
+        logger.error(f"API call failed for {endpoint}: {status} - {error_text}")
+        raise ProxmoxAPIError(f"API call failed for {endpoint}: {status} - {error_text}")
 
     def _get_diagnostic_response(self, endpoint: str) -> Dict[str, Any]:
         """Return mock response for diagnostic mode."""
@@ -342,7 +453,42 @@ class ProxmoxClient:
     
     async def delete_backup(self, node: str, storage: str, volid: str) -> Dict[str, Any]:
         """Delete backup file."""
-        return await self.get_api_data(f'nodes/{node}/storage/{storage}/content/{volid}', method='DELETE')
+        return await self.get_api_data(f'nodes/{node}/storage/{storage}/content/{quote(volid, safe="")}', method='DELETE')
+    
+    # RRD Methods
+    
+    async def get_node_rrddata(self, node: str, timeframe: str = 'day', cf: str = 'AVERAGE') -> List[Dict[str, Any]]:
+        """Get pre-aggregated RRD statistics for a node."""
+        result = await self.get_api_data(f'nodes/{node}/rrddata?timeframe={timeframe}&cf={cf}')
+        return result.get('data', [])
+    
+    async def get_vm_rrddata(self, node: str, vmid: int, timeframe: str = 'day',
+                             cf: str = 'AVERAGE') -> List[Dict[str, Any]]:
+        """Get pre-aggregated RRD statistics for a VM."""
+        result = await self.get_api_data(f'nodes/{node}/qemu/{vmid}/rrddata?timeframe={timeframe}&cf={cf}')
+        return result.get('data', [])
+    
+    async def get_container_rrddata(self, node: str, vmid: int, timeframe: str = 'day',
+                                    cf: str = 'AVERAGE') -> List[Dict[str, Any]]:
+        """Get pre-aggregated RRD statistics for a container."""
+        result = await self.get_api_data(f'nodes/{node}/lxc/{vmid}/rrddata?timeframe={timeframe}&cf={cf}')
+        return result.get('data', [])
+    
+    # Task Methods
+    
+    async def get_task_status(self, node: str, upid: str) -> Dict[str, Any]:
+        """Get status of a task by UPID."""
+        result = await self.get_api_data(f'nodes/{node}/tasks/{quote(upid, safe="")}/status')
+        return result.get('data', {})
+    
+    async def get_node_tasks(self, node: str, source: str = 'all', since: Optional[int] = None,
+                             limit: int = 500) -> List[Dict[str, Any]]:
+        """List recent and running tasks on a node."""
+        endpoint = f'nodes/{node}/tasks?source={source}&limit={limit}'
+        if since is not None:
+            endpoint += f'&since={since}'
+        result = await self.get_api_data(endpoint)
+        return result.get('data', [])
     
     # Comprehensive Data Gathering
     
@@ -403,6 +549,14 @@ class ProxmoxClient:
                 
         return node_details
     
+    async def fan_out_nodes(self, func, node: Optional[str] = None) -> Dict[str, FanOutResult]:
+        """Run ``func(node_name)`` for one node or every cluster node concurrently."""
+        if node:
+            node_names = [node]
+        else:
+            node_names = [item['node'] for item in await self.get_nodes()]
+        return await self.fanout.map(node_names, func)
+    
     # Utility Methods
     
     @staticmethod
@@ -435,4 +589,8 @@ class ProxmoxClient:
             'verify_ssl': self.verify_ssl,
             'authenticated': self._authenticated,
             'base_url': self.base_url
-        }
\ No newline at end of file
+        }
+    
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get response cache counters, or None when caching is disabled."""
+        return self.cache.get_stats() if self.cache else None
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Tool registry for Proxmox MCP Server.
+
+Tools are declared once at startup: their ``Tool`` definitions (and JSON
+schemas) are built a single time and reused for every ``tools/list`` request,
+dispatch is a dictionary lookup, and every call is recorded in per-tool call
+counters and latency histograms.
+"""
+
+import bisect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from mcp.types import TextContent, Tool
+
+logger = logging.getLogger(__name__)
+
+ToolHandler = Callable[[Dict[str, Any]], Awaitable[Sequence[TextContent]]]
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, elapsed_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, elapsed_ms)] += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing the ``q`` quantile, capped at the observed max."""
+        total = self.count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                bound = self.bounds[index] if index < len(self.bounds) else self.max_ms
+                return round(min(bound, self.max_ms), 1)
+        return round(self.max_ms, 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"le_{bound}ms" for bound in self.bounds] + [f"gt_{self.bounds[-1]}ms"]
+        return {
+            'avg_ms': round(self.total_ms / self.count, 1) if self.count else None,
+            'max_ms': round(self.max_ms, 1),
+            'p50_ms': self.quantile(0.5),
+            'p95_ms': self.quantile(0.95),
+            'p99_ms': self.quantile(0.99),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count}
+        }
+
+
+@dataclass
+class RegisteredTool:
+    """A tool definition with its handler and call statistics."""
+
+    tool: Tool
+    handler: ToolHandler
+    calls: int = 0
+    errors: int = 0
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class ToolRegistry:
+    """Name-indexed tool definitions and handlers."""
+
+    def __init__(self):
+        self._tools: Dict[str, RegisteredTool] = {}
+        self._definitions: List[Tool] = []
+
+    def register(self, tool: Tool, handler: ToolHandler) -> None:
+        if tool.name in self._tools:
+            raise ValueError(f"Tool '{tool.name}' is already registered")
+        self._tools[tool.name] = RegisteredTool(tool=tool, handler=handler)
+        self._definitions.append(tool)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tools
+
+    def list_tools(self) -> List[Tool]:
+        """Prebuilt tool definitions (a fresh list; the ``Tool`` objects are shared)."""
+        return list(self._definitions)
+
+    async def call(self, name: str, arguments: Dict[str, Any],
+                   handler: Optional[ToolHandler] = None) -> Sequence[TextContent]:
+        """Dispatch a call to the tool's handler (or ``handler``) and record its latency."""
+        entry = self._tools[name]
+        start = time.perf_counter()
+        try:
+            return await (handler or entry.handler)(arguments)
+        except Exception:
+            entry.errors += 1
+            raise
+        finally:
+            entry.calls += 1
+            entry.latency.observe((time.perf_counter() - start) * 1000)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-tool call counts and latency histograms for tools that have been called."""
+        return {
+            name: {'calls': entry.calls, 'errors': entry.errors, **entry.latency.to_dict()}
+            for name, entry in self._tools.items()
+            if entry.calls
+        }
@@ -0,0 +1,158 @@
+"""
+Section-incremental audit report generation for Proxmox MCP Server.
+
+A report is a set of independent sections (cluster overview, one per node,
+analyses) whose producers run concurrently. Sections are yielded and rendered
+as they complete, so output can be streamed (JSON Lines or markdown chunks) or
+appended to a file incrementally, and a report deadline yields partial results
+with the unfinished sections marked as timed out.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TextIO
+
+from .exceptions import ProxmoxSecurityError, ProxmoxValidationError
+
+logger = logging.getLogger(__name__)
+
+REPORT_FORMATS = ('json', 'text', 'jsonl', 'markdown')
+
+
+@dataclass
+class ReportSection:
+    """Outcome of one report section."""
+
+    name: str
+    status: str
+    data: Any = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {'section': self.name, 'status': self.status, 'elapsed_ms': self.elapsed_ms}
+        if self.error:
+            result['error'] = self.error
+        result['data'] = self.data
+        return result
+
+
+async def stream_sections(producers: Dict[str, Callable[[], Awaitable[Any]]],
+                          timeout: Optional[float] = None) -> AsyncIterator[ReportSection]:
+    """Run section producers concurrently and yield sections in completion order.
+
+    Producers still running at ``timeout`` are cancelled and yielded as
+    ``timeout`` sections, so callers always receive one section per producer.
+    """
+    start = time.perf_counter()
+    pending: Dict[asyncio.Future, str] = {
+        asyncio.ensure_future(producer()): name for name, producer in producers.items()
+    }
+    deadline = time.monotonic() + timeout if timeout else None
+    try:
+        while pending:
+            remaining = deadline - time.monotonic() if deadline else None
+            if remaining is not None and remaining <= 0:
+                break
+            done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                name = pending.pop(future)
+                elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+                if future.exception() is not None:
+                    yield ReportSection(name, 'failed', error=str(future.exception()), elapsed_ms=elapsed_ms)
+                else:
+                    yield ReportSection(name, 'complete', data=future.result(), elapsed_ms=elapsed_ms)
+    finally:
+        for future in pending:
+            future.cancel()
+    elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+    for name in pending.values():
+        yield ReportSection(name, 'timeout', error=f"Section did not finish within {timeout}s", elapsed_ms=elapsed_ms)
+
+
+class ReportRenderer:
+    """Render report chunks in JSON Lines or markdown."""
+
+    def __init__(self, format_type: str):
+        if format_type not in ('jsonl', 'markdown'):
+            raise ProxmoxValidationError(f"Streaming report format must be jsonl or markdown, got {format_type}")
+        self.format_type = format_type
+
+    def header(self, meta: Dict[str, Any]) -> str:
+        if self.format_type == 'jsonl':
+            return json.dumps({'section': 'header', **meta}, default=str) + "\n"
+        lines = ["# Proxmox Environment Audit Report", ""]
+        lines += [f"- **{key.replace('_', ' ').title()}**: {value}" for key, value in meta.items()]
+        return "\n".join(lines) + "\n\n"
+
+    def section(self, section: ReportSection) -> str:
+        if self.format_type == 'jsonl':
+            return json.dumps(section.to_dict(), default=str) + "\n"
+        title = f"## {section.name} ({section.status}, {section.elapsed_ms} ms)"
+        if section.status != 'complete':
+            return f"{title}\n\n> {section.error}\n\n"
+        body = json.dumps(section.data, indent=2, default=str)
+        return f"{title}\n\n```json\n{body}\n```\n\n"
+
+    def footer(self, summary: Dict[str, Any]) -> str:
+        if self.format_type == 'jsonl':
+            return json.dumps({'section': 'summary', **summary}, default=str) + "\n"
+        lines = ["## Summary", ""]
+        lines += [f"- **{key.replace('_', ' ').title()}**: {value}" for key, value in summary.items()]
+        return "\n".join(lines) + "\n"
+
+
+def resolve_report_path(output_dir: Optional[str], file_name: str) -> str:
+    """Resolve a report file name inside the configured report directory."""
+    if not output_dir:
+        raise ProxmoxSecurityError("Writing reports to disk requires 'report_output_dir' in the configuration")
+    base = os.path.realpath(output_dir)
+    path = os.path.realpath(os.path.join(base, file_name))
+    if os.path.dirname(path) != base:
+        raise ProxmoxSecurityError(f"Report path '{file_name}' must be a file name inside the report directory")
+    return path
+
+
+class IncrementalReportFile:
+    """Append rendered chunks to a report file without blocking the event loop."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.bytes_written = 0
+        self._file: Optional[TextIO] = None
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def open(self) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = await self._run(open, self.path, 'w', 1, 'utf-8')
+
+    def _write_flush(self, chunk: str) -> None:
+        self._file.write(chunk)
+        self._file.flush()
+
+    async def write(self, chunk: str) -> None:
+        await self._run(self._write_flush, chunk)
+        self.bytes_written += len(chunk.encode('utf-8'))
+
+    async def close(self) -> None:
+        if self._file is not None:
+            await self._run(self._file.close)
+            self._file = None
+
+
+def summarize_sections(sections: List[ReportSection], started: datetime) -> Dict[str, Any]:
+    return {
+        'sections_total': len(sections),
+        'sections_complete': sum(1 for section in sections if section.status == 'complete'),
+        'sections_failed': [section.name for section in sections if section.status == 'failed'],
+        'sections_timed_out': [section.name for section in sections if section.status == 'timeout'],
+        'partial': any(section.status != 'complete' for section in sections),
+        'duration_seconds': round((datetime.now() - started).total_seconds(), 2)
+    }
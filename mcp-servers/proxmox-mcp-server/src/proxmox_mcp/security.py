@@ -5,6 +5,7 @@ Security validation and access control for Proxmox MCP Server.
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
+from .audit import AuditLog, AuditStore
 from .config import SecurityConfig
 from .exceptions import ProxmoxSecurityError, ProxmoxValidationError
 
@@ -16,7 +17,8 @@ class SecurityValidator:
     
     def __init__(self, security_config: SecurityConfig):
         self.config = security_config
-        self.operation_log: List[Dict[str, Any]] = []
+        store = AuditStore(security_config.audit_log_path) if security_config.audit_log_path else None
+        self.audit = AuditLog(security_config.audit_buffer_size, store)
     
     def validate_operation(self, operation: str, params: Optional[Dict[str, Any]] = None) -> bool:
         """Validate if an operation is allowed based on security configuration."""
@@ -172,27 +174,28 @@ class SecurityValidator:
     def _log_operation(self, operation: str, params: Dict[str, Any], status: str) -> None:
         """Log operation for audit trail."""
         
-        log_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'operation': operation,
-            'params': params,
-            'status': status
-        }
-        
-        self.operation_log.append(log_entry)
+        log_entry = self.audit.append(operation, self._get_operation_category(operation), params, status)
         logger.info(f"Operation {operation} {status}", extra={'operation_log': log_entry})
-        
-        # Keep only last 1000 log entries in memory
-        if len(self.operation_log) > 1000:
-            self.operation_log = self.operation_log[-1000:]
     
     def get_operation_log(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get operation log for audit purposes."""
-        if limit:
-            return self.operation_log[-limit:]
-        return self.operation_log.copy()
+        """Get buffered (most recent) operation log entries for audit purposes."""
+        return self.audit.recent(limit)
+    
+    async def query_operation_log(self, operation: Optional[str] = None, category: Optional[str] = None,
+                                  status: Optional[str] = None, since: Optional[datetime] = None,
+                                  limit: int = 100) -> List[Dict[str, Any]]:
+        """Query the full audit trail (memory and on-disk log), newest first."""
+        return await self.audit.query(operation, category, status, since.timestamp() if since else None, limit=limit)
+    
+    async def get_operation_summary(self, since: Optional[datetime] = None) -> Dict[str, Any]:
+        """Operation counts by name, category and status since a point in time."""
+        return await self.audit.summary(since.timestamp() if since else None)
     
     def clear_operation_log(self) -> None:
-        """Clear the operation log."""
-        self.operation_log.clear()
-        logger.info("Operation log cleared")
\ No newline at end of file
+        """Clear the in-memory operation log; the on-disk audit log is append-only."""
+        self.audit.clear()
+        logger.info("Operation log cleared")
+    
+    def close(self) -> None:
+        """Flush buffered audit entries to the on-disk log."""
+        self.audit.close()
\ No newline at end of file
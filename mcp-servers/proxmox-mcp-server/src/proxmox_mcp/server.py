@@ -8,6 +8,7 @@ import asyncio
 import json
 import logging
 import sys
+import time
 from typing import Any, Dict, List, Optional, Sequence
 from datetime import datetime, timedelta
 
@@ -20,6 +21,16 @@ from mcp.types import (
 from .config import ProxmoxMCPConfig
 from .proxmox_client import ProxmoxClient
 from .security import SecurityValidator
+from .snapshots import collect_snapshot_inventory
+from .cleanup import CleanupExecutor, CleanupItem, summarize_cleanup
+from .metrics import CLUSTER_RESOURCE_KINDS, MetricsStore, record_cluster_resources, record_node_status
+from .analytics import RANK_FIELDS, RRD_METRICS, TIMEFRAMES, analyze_series, require_numpy
+from .tasks import extract_upid
+from .registry import ToolRegistry
+from .reports import (
+    REPORT_FORMATS, IncrementalReportFile, ReportRenderer, ReportSection,
+    resolve_report_path, stream_sections, summarize_sections
+)
 from .exceptions import (
     ProxmoxMCPError, ProxmoxConnectionError, ProxmoxAuthenticationError,
     ProxmoxAPIError, ProxmoxOperationError, ProxmoxValidationError,
@@ -28,6 +39,13 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Server name that fans a read-only tool out to every configured server
+AGGREGATE_SERVER = "*"
+AGGREGATE_TOOLS = (
+    "get_system_info", "list_virtual_machines", "list_containers",
+    "get_storage_status", "monitor_resource_usage", "run_health_assessment"
+)
+
 
 class ProxmoxMCPServer:
     """Proxmox MCP Server providing comprehensive Proxmox VE management capabilities."""
@@ -37,6 +55,9 @@ class ProxmoxMCPServer:
         self.security = SecurityValidator(config.security)
         self.app = Server("proxmox-mcp-server")
         self._clients: Dict[str, ProxmoxClient] = {}
+        self._client_locks: Dict[str, asyncio.Lock] = {}
+        self.metrics = MetricsStore(config.monitoring.metrics_history_size)
+        self._metrics_task: Optional[asyncio.Task] = None
         
         # Setup logging to stderr to avoid interference with MCP protocol on stdout
         logging.basicConfig(
@@ -52,412 +73,614 @@ class ProxmoxMCPServer:
     
     def _setup_tools(self):
         """Register all MCP tools."""
+        self.tools = ToolRegistry()
+        # Handlers follow the ``_<tool name>`` naming convention
+        for tool in self._tool_definitions():
+            self.tools.register(tool, getattr(self, f"_{tool.name}"))
         
-        # System Information Tools
         @self.app.list_tools()
         async def handle_list_tools() -> List[Tool]:
             """List available tools."""
-            return [
-                Tool(
-                    name="get_system_info",
-                    description="Get basic Proxmox system information including version, nodes, and cluster status",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional, uses default if not specified)"
-                            }
+            return self.tools.list_tools()
+        
+        @self.app.call_tool()
+        async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[TextContent]:
+            """Handle tool calls."""
+            try:
+                if name not in self.tools:
+                    return [TextContent(type="text", text=f"Unknown tool: {name}")]
+                
+                # Validate operation with security validator
+                self.security.validate_operation(name, arguments)
+                
+                if arguments.get('server') == AGGREGATE_SERVER:
+                    return await self.tools.call(name, arguments, lambda args: self._run_aggregate(name, args))
+                
+                return await self.tools.call(name, arguments)
+                    
+            except ProxmoxSecurityError as e:
+                return [TextContent(type="text", text=f"Security validation failed: {e}")]
+            except ProxmoxMCPError as e:
+                return [TextContent(type="text", text=f"Proxmox operation failed: {e}")]
+            except Exception as e:
+                logger.error(f"Unexpected error in tool {name}: {e}")
+                return [TextContent(type="text", text=f"Unexpected error: {e}")]
+    
+    def _tool_definitions(self) -> List[Tool]:
+        """Build the MCP tool definitions (called once at startup)."""
+        return [
+            Tool(
+                name="get_system_info",
+                description="Get basic Proxmox system information including version, nodes, and cluster status",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional, uses default if not specified, '*' queries all configured servers)"
                         }
                     }
-                ),
-                Tool(
-                    name="get_node_status",
-                    description="Get detailed status information for a specific node",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "node": {
-                                "type": "string",
-                                "description": "Node name"
-                            },
-                            "server": {
-                                "type": "string", 
-                                "description": "Proxmox server name (optional)"
-                            }
+                }
+            ),
+            Tool(
+                name="get_node_status",
+                description="Get detailed status information for a specific node",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "node": {
+                            "type": "string",
+                            "description": "Node name"
                         },
-                        "required": ["node"]
-                    }
-                ),
-                Tool(
-                    name="list_virtual_machines",
-                    description="List all virtual machines with their status and basic information",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "node": {
-                                "type": "string",
-                                "description": "Node name (optional, lists VMs from all nodes if not specified)"
-                            },
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            },
-                            "status_filter": {
-                                "type": "string",
-                                "enum": ["running", "stopped", "paused"],
-                                "description": "Filter VMs by status (optional)"
-                            }
+                        "server": {
+                            "type": "string", 
+                            "description": "Proxmox server name (optional)"
                         }
-                    }
-                ),
-                Tool(
-                    name="list_containers",
-                    description="List all LXC containers with their status and basic information",
-                    inputSchema={
-                        "type": "object", 
-                        "properties": {
-                            "node": {
-                                "type": "string",
-                                "description": "Node name (optional, lists containers from all nodes if not specified)"
-                            },
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            },
-                            "status_filter": {
-                                "type": "string",
-                                "enum": ["running", "stopped", "paused"],
-                                "description": "Filter containers by status (optional)"
-                            }
+                    },
+                    "required": ["node"]
+                }
+            ),
+            Tool(
+                name="list_virtual_machines",
+                description="List all virtual machines with their status and basic information",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "node": {
+                            "type": "string",
+                            "description": "Node name (optional, lists VMs from all nodes if not specified)"
+                        },
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional, uses default if not specified, '*' queries all configured servers)"
+                        },
+                        "status_filter": {
+                            "type": "string",
+                            "enum": ["running", "stopped", "paused"],
+                            "description": "Filter VMs by status (optional)"
                         }
                     }
-                ),
-                Tool(
-                    name="start_container",
-                    description="Start an LXC container",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "node": {
-                                "type": "string",
-                                "description": "Node name where the container is located"
-                            },
-                            "vmid": {
-                                "type": "integer",
-                                "description": "Container ID (VMID)"
-                            },
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            }
+                }
+            ),
+            Tool(
+                name="list_containers",
+                description="List all LXC containers with their status and basic information",
+                inputSchema={
+                    "type": "object", 
+                    "properties": {
+                        "node": {
+                            "type": "string",
+                            "description": "Node name (optional, lists containers from all nodes if not specified)"
                         },
-                        "required": ["node", "vmid"]
-                    }
-                ),
-                Tool(
-                    name="stop_container",
-                    description="Stop an LXC container",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "node": {
-                                "type": "string",
-                                "description": "Node name where the container is located"
-                            },
-                            "vmid": {
-                                "type": "integer",
-                                "description": "Container ID (VMID)"
-                            },
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            }
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional, uses default if not specified, '*' queries all configured servers)"
                         },
-                        "required": ["node", "vmid"]
-                    }
-                ),
-                Tool(
-                    name="run_health_assessment",
-                    description="Perform comprehensive health assessment of the Proxmox environment",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            },
-                            "include_recommendations": {
-                                "type": "boolean",
-                                "default": True,
-                                "description": "Include optimization recommendations in the report"
-                            }
+                        "status_filter": {
+                            "type": "string",
+                            "enum": ["running", "stopped", "paused"],
+                            "description": "Filter containers by status (optional)"
                         }
                     }
-                ),
-                Tool(
-                    name="get_storage_status",
-                    description="Get comprehensive storage utilization and health analysis",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "node": {
-                                "type": "string",
-                                "description": "Node name (optional, gets storage for all nodes if not specified)"
-                            },
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            },
-                            "storage_name": {
-                                "type": "string",
-                                "description": "Specific storage name to analyze (optional)"
-                            }
+                }
+            ),
+            Tool(
+                name="start_container",
+                description="Start an LXC container",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "node": {
+                            "type": "string",
+                            "description": "Node name where the container is located"
+                        },
+                        "vmid": {
+                            "type": "integer",
+                            "description": "Container ID (VMID)"
+                        },
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional)"
+                        },
+                        "wait": {
+                            "type": "boolean",
+                            "default": True,
+                            "description": "Wait for the Proxmox task to finish before returning"
+                        },
+                        "timeout": {
+                            "type": "integer",
+                            "default": 60,
+                            "description": "Maximum seconds to wait for the task"
+                        }
+                    },
+                    "required": ["node", "vmid"]
+                }
+            ),
+            Tool(
+                name="stop_container",
+                description="Stop an LXC container",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "node": {
+                            "type": "string",
+                            "description": "Node name where the container is located"
+                        },
+                        "vmid": {
+                            "type": "integer",
+                            "description": "Container ID (VMID)"
+                        },
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional)"
+                        },
+                        "wait": {
+                            "type": "boolean",
+                            "default": True,
+                            "description": "Wait for the Proxmox task to finish before returning"
+                        },
+                        "timeout": {
+                            "type": "integer",
+                            "default": 60,
+                            "description": "Maximum seconds to wait for the task"
+                        }
+                    },
+                    "required": ["node", "vmid"]
+                }
+            ),
+            Tool(
+                name="wait_for_tasks",
+                description="Wait for Proxmox tasks (UPIDs) to finish and report their final status",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "upids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Task UPIDs returned by previous operations"
+                        },
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional)"
+                        },
+                        "timeout": {
+                            "type": "integer",
+                            "default": 120,
+                            "description": "Maximum seconds to wait; unfinished tasks are reported as running"
+                        }
+                    },
+                    "required": ["upids"]
+                }
+            ),
+            Tool(
+                name="run_health_assessment",
+                description="Perform comprehensive health assessment of the Proxmox environment",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional, uses default if not specified, '*' queries all configured servers)"
+                        },
+                        "include_recommendations": {
+                            "type": "boolean",
+                            "default": True,
+                            "description": "Include optimization recommendations in the report"
                         }
                     }
-                ),
-                Tool(
-                    name="monitor_resource_usage",
-                    description="Get real-time resource monitoring data (CPU, memory, storage)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "node": {
-                                "type": "string",
-                                "description": "Node name (optional, monitors all nodes if not specified)"
-                            },
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            },
-                            "include_thresholds": {
-                                "type": "boolean",
-                                "default": True,
-                                "description": "Include threshold warnings in the response"
-                            }
+                }
+            ),
+            Tool(
+                name="get_storage_status",
+                description="Get comprehensive storage utilization and health analysis",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "node": {
+                            "type": "string",
+                            "description": "Node name (optional, gets storage for all nodes if not specified)"
+                        },
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional, uses default if not specified, '*' queries all configured servers)"
+                        },
+                        "storage_name": {
+                            "type": "string",
+                            "description": "Specific storage name to analyze (optional)"
                         }
                     }
-                ),
-                Tool(
-                    name="manage_snapshots",
-                    description="Manage VM and container snapshots (list, analyze, cleanup)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "operation": {
-                                "type": "string",
-                                "enum": ["list", "analyze", "cleanup"],
-                                "description": "Operation to perform"
-                            },
-                            "node": {
-                                "type": "string",
-                                "description": "Node name (optional)"
-                            },
-                            "vmid": {
-                                "type": "integer",
-                                "description": "VM/Container ID (optional, processes all if not specified)"
-                            },
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            },
-                            "max_age_days": {
-                                "type": "integer",
-                                "default": 90,
-                                "description": "Maximum age in days for cleanup operation"
-                            },
-                            "confirm": {
-                                "type": "boolean",
-                                "default": False,
-                                "description": "Confirm destructive operations"
-                            }
+                }
+            ),
+            Tool(
+                name="monitor_resource_usage",
+                description="Get real-time resource monitoring data (CPU, memory, storage)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "node": {
+                            "type": "string",
+                            "description": "Node name (optional, monitors all nodes if not specified)"
                         },
-                        "required": ["operation"]
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional, uses default if not specified, '*' queries all configured servers)"
+                        },
+                        "include_thresholds": {
+                            "type": "boolean",
+                            "default": True,
+                            "description": "Include threshold warnings in the response"
+                        },
+                        "source": {
+                            "type": "string",
+                            "enum": ["live", "history"],
+                            "default": "live",
+                            "description": "'history' answers from collected metrics only, without querying the API"
+                        },
+                        "window_minutes": {
+                            "type": "integer",
+                            "default": 60,
+                            "minimum": 1,
+                            "description": "Trend window over the collected metrics history (avg/p95/max)"
+                        },
+                        "include_guest_trends": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "Include per-VM/container trends"
+                        }
                     }
-                ),
-                Tool(
-                    name="manage_backups",
-                    description="Manage backup files (list, analyze, cleanup)",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "operation": {
-                                "type": "string",
-                                "enum": ["list", "analyze", "cleanup"],
-                                "description": "Operation to perform"
-                            },
-                            "node": {
-                                "type": "string",
-                                "description": "Node name (optional)"
-                            },
-                            "storage": {
-                                "type": "string",
-                                "description": "Storage name (optional)"
-                            },
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            },
-                            "max_age_days": {
-                                "type": "integer",
-                                "default": 30,
-                                "description": "Maximum age in days for cleanup operation"
-                            },
-                            "confirm": {
-                                "type": "boolean",
-                                "default": False,
-                                "description": "Confirm destructive operations"
-                            }
+                }
+            ),
+            Tool(
+                name="analyze_resource_trends",
+                description="Analyze historical RRD data for nodes or guests: top-N consumers, percentiles and growth rates",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "target": {
+                            "type": "string",
+                            "enum": ["guests", "vms", "containers", "nodes"],
+                            "default": "guests",
+                            "description": "Which series to analyze"
+                        },
+                        "metric": {
+                            "type": "string",
+                            "enum": list(RRD_METRICS),
+                            "default": "cpu",
+                            "description": "Metric to analyze (disk/disk_used for VMs require the guest agent)"
+                        },
+                        "timeframe": {
+                            "type": "string",
+                            "enum": list(TIMEFRAMES),
+                            "default": "day",
+                            "description": "RRD timeframe"
+                        },
+                        "cf": {
+                            "type": "string",
+                            "enum": ["AVERAGE", "MAX"],
+                            "default": "AVERAGE",
+                            "description": "RRD consolidation function"
                         },
-                        "required": ["operation"]
+                        "rank_by": {
+                            "type": "string",
+                            "enum": list(RANK_FIELDS),
+                            "default": "avg",
+                            "description": "Statistic used to rank the top-N list"
+                        },
+                        "ascending": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "Rank lowest first instead of highest first"
+                        },
+                        "top_n": {
+                            "type": "integer",
+                            "default": 10,
+                            "minimum": 1,
+                            "description": "Number of entries to return"
+                        },
+                        "percentiles": {
+                            "type": "array",
+                            "items": {"type": "number"},
+                            "default": [50, 95, 99],
+                            "description": "Percentiles to compute per series"
+                        },
+                        "node": {
+                            "type": "string",
+                            "description": "Limit to a single node (optional)"
+                        },
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional, uses default if not specified)"
+                        }
                     }
-                ),
-                Tool(
-                    name="optimize_storage",
-                    description="Analyze and optimize storage usage across the Proxmox environment",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "node": {
-                                "type": "string",
-                                "description": "Node name (optional)"
-                            },
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            },
-                            "operation": {
-                                "type": "string",
-                                "enum": ["analyze", "optimize"],
-                                "default": "analyze",
-                                "description": "Operation mode"
-                            },
-                            "confirm": {
-                                "type": "boolean",
-                                "default": False,
-                                "description": "Confirm optimization actions"
-                            }
+                }
+            ),
+            Tool(
+                name="manage_snapshots",
+                description="Manage VM and container snapshots (list, analyze, cleanup)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "operation": {
+                            "type": "string",
+                            "enum": ["list", "analyze", "cleanup"],
+                            "description": "Operation to perform"
+                        },
+                        "node": {
+                            "type": "string",
+                            "description": "Node name (optional)"
+                        },
+                        "vmid": {
+                            "type": "integer",
+                            "description": "VM/Container ID (optional, processes all if not specified)"
+                        },
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional)"
+                        },
+                        "max_age_days": {
+                            "type": "integer",
+                            "default": 90,
+                            "description": "Maximum age in days for cleanup operation"
+                        },
+                        "confirm": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "Confirm destructive operations"
+                        }
+                    },
+                    "required": ["operation"]
+                }
+            ),
+            Tool(
+                name="manage_backups",
+                description="Manage backup files (list, analyze, cleanup)",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "operation": {
+                            "type": "string",
+                            "enum": ["list", "analyze", "cleanup"],
+                            "description": "Operation to perform"
+                        },
+                        "node": {
+                            "type": "string",
+                            "description": "Node name (optional)"
+                        },
+                        "storage": {
+                            "type": "string",
+                            "description": "Storage name (optional)"
+                        },
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional)"
+                        },
+                        "max_age_days": {
+                            "type": "integer",
+                            "default": 30,
+                            "description": "Maximum age in days for cleanup operation"
+                        },
+                        "confirm": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "Confirm destructive operations"
+                        }
+                    },
+                    "required": ["operation"]
+                }
+            ),
+            Tool(
+                name="optimize_storage",
+                description="Analyze and optimize storage usage across the Proxmox environment",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "node": {
+                            "type": "string",
+                            "description": "Node name (optional)"
+                        },
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional)"
+                        },
+                        "operation": {
+                            "type": "string",
+                            "enum": ["analyze", "optimize"],
+                            "default": "analyze",
+                            "description": "Operation mode"
+                        },
+                        "confirm": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "Confirm optimization actions"
                         }
                     }
-                ),
-                Tool(
-                    name="execute_maintenance",
-                    description="Execute automated maintenance tasks",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "tasks": {
-                                "type": "array",
-                                "items": {
-                                    "type": "string",
-                                    "enum": ["snapshot_cleanup", "backup_cleanup", "storage_optimization", "health_check"]
-                                },
-                                "description": "List of maintenance tasks to execute"
-                            },
-                            "server": {
+                }
+            ),
+            Tool(
+                name="execute_maintenance",
+                description="Execute automated maintenance tasks",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "tasks": {
+                            "type": "array",
+                            "items": {
                                 "type": "string",
-                                "description": "Proxmox server name (optional)"
+                                "enum": ["snapshot_cleanup", "backup_cleanup", "storage_optimization", "health_check"]
                             },
-                            "dry_run": {
-                                "type": "boolean",
-                                "default": True,
-                                "description": "Perform dry run without making changes"
-                            },
-                            "confirm": {
-                                "type": "boolean",
-                                "default": False,
-                                "description": "Confirm execution of maintenance tasks"
-                            }
+                            "description": "List of maintenance tasks to execute"
+                        },
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional)"
+                        },
+                        "dry_run": {
+                            "type": "boolean",
+                            "default": True,
+                            "description": "Perform dry run without making changes"
+                        },
+                        "confirm": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "Confirm execution of maintenance tasks"
+                        }
+                    },
+                    "required": ["tasks"]
+                }
+            ),
+            Tool(
+                name="get_audit_report",
+                description="Generate comprehensive environment audit report",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional)"
+                        },
+                        "include_detailed_analysis": {
+                            "type": "boolean",
+                            "default": True,
+                            "description": "Include detailed analysis and recommendations"
+                        },
+                        "audit_window_hours": {
+                            "type": "integer",
+                            "default": 24,
+                            "minimum": 1,
+                            "description": "Time window for the operation audit trail summary"
+                        },
+                        "audit_entries_limit": {
+                            "type": "integer",
+                            "default": 50,
+                            "minimum": 0,
+                            "description": "Number of most recent audit trail entries to include"
                         },
-                        "required": ["tasks"]
+                        "format": {
+                            "type": "string",
+                            "enum": list(REPORT_FORMATS),
+                            "default": "json",
+                            "description": "Report format; jsonl and markdown are returned as one chunk per section, in completion order"
+                        },
+                        "timeout_seconds": {
+                            "type": "number",
+                            "default": 120,
+                            "minimum": 1,
+                            "description": "Report deadline; unfinished sections are reported as timed out"
+                        },
+                        "output_file": {
+                            "type": "string",
+                            "description": "Write the report to this file name inside the configured report_output_dir (written incrementally for jsonl/markdown)"
+                        }
                     }
-                ),
-                Tool(
-                    name="get_audit_report",
-                    description="Generate comprehensive environment audit report",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "server": {
-                                "type": "string",
-                                "description": "Proxmox server name (optional)"
-                            },
-                            "include_detailed_analysis": {
-                                "type": "boolean",
-                                "default": True,
-                                "description": "Include detailed analysis and recommendations"
-                            },
-                            "format": {
-                                "type": "string",
-                                "enum": ["json", "text"],
-                                "default": "json",
-                                "description": "Report format"
-                            }
+                }
+            ),
+            Tool(
+                name="get_performance_stats",
+                description="Get API response cache hit/miss statistics, per-tool call latency and metrics history statistics",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "server": {
+                            "type": "string",
+                            "description": "Proxmox server name (optional, reports all connected servers if not specified)"
+                        },
+                        "clear_cache": {
+                            "type": "boolean",
+                            "default": False,
+                            "description": "Drop cached responses after reporting"
                         }
                     }
-                )
-            ]
-        
-        # Tool Implementations
-        
-        @self.app.call_tool()
-        async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[TextContent]:
-            """Handle tool calls."""
-            try:
-                # Validate operation with security validator
-                self.security.validate_operation(name, arguments)
-                
-                if name == "get_system_info":
-                    return await self._get_system_info(arguments)
-                elif name == "get_node_status":
-                    return await self._get_node_status(arguments)
-                elif name == "list_virtual_machines":
-                    return await self._list_virtual_machines(arguments)
-                elif name == "list_containers":
-                    return await self._list_containers(arguments)
-                elif name == "start_container":
-                    return await self._start_container(arguments)
-                elif name == "stop_container":
-                    return await self._stop_container(arguments)
-                elif name == "run_health_assessment":
-                    return await self._run_health_assessment(arguments)
-                elif name == "get_storage_status":
-                    return await self._get_storage_status(arguments)
-                elif name == "monitor_resource_usage":
-                    return await self._monitor_resource_usage(arguments)
-                elif name == "manage_snapshots":
-                    return await self._manage_snapshots(arguments)
-                elif name == "manage_backups":
-                    return await self._manage_backups(arguments)
-                elif name == "optimize_storage":
-                    return await self._optimize_storage(arguments)
-                elif name == "execute_maintenance":
-                    return await self._execute_maintenance(arguments)
-                elif name == "get_audit_report":
-                    return await self._get_audit_report(arguments)
-                else:
-                    return [TextContent(type="text", text=f"Unknown tool: {name}")]
-                    
-            except ProxmoxSecurityError as e:
-                return [TextContent(type="text", text=f"Security validation failed: {e}")]
-            except ProxmoxMCPError as e:
-                return [TextContent(type="text", text=f"Proxmox operation failed: {e}")]
-            except Exception as e:
-                logger.error(f"Unexpected error in tool {name}: {e}")
-                return [TextContent(type="text", text=f"Unexpected error: {e}")]
+                }
+            )
+        ]
     
     async def _get_client(self, server_name: Optional[str] = None) -> ProxmoxClient:
         """Get or create Proxmox client for specified server."""
         target_server = server_name or self.config.default_server
         
         if target_server not in self._clients:
-            server_config = self.config.get_server_config(target_server)
-            client = ProxmoxClient(server_config)
-            await client.connect()
-            self._clients[target_server] = client
+            # Concurrent callers for the same server share a single connection attempt
+            async with self._client_locks.setdefault(target_server, asyncio.Lock()):
+                if target_server not in self._clients:
+                    server_config = self.config.get_server_config(target_server)
+                    client = ProxmoxClient(server_config, cache_config=self.config.cache)
+                    await client.connect()
+                    self._clients[target_server] = client
             
         return self._clients[target_server]
     
+    async def _run_aggregate(self, name: str, args: Dict[str, Any]) -> Sequence[TextContent]:
+        """Run a read-only tool against every configured server concurrently."""
+        if name not in AGGREGATE_TOOLS:
+            raise ProxmoxValidationError(
+                f"Tool '{name}' does not support server '{AGGREGATE_SERVER}'. Supported: {', '.join(AGGREGATE_TOOLS)}"
+            )
+        handler = getattr(self, f"_{name}")
+        
+        async def run_on(server_name: str) -> Dict[str, Any]:
+            start = time.perf_counter()
+            try:
+                content = await handler({**args, 'server': server_name})
+                return {
+                    "status": "success",
+                    "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+                    "result": json.loads(content[0].text)
+                }
+            except Exception as e:
+                logger.warning(f"Aggregate {name} failed on server {server_name}: {e}")
+                return {
+                    "status": "failed",
+                    "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+                    "error": str(e)
+                }
+        
+        start = time.perf_counter()
+        server_names = list(self.config.servers)
+        outcomes = await asyncio.gather(*(run_on(server_name) for server_name in server_names))
+        servers = dict(zip(server_names, outcomes))
+        
+        summary = {
+            "servers_queried": len(servers),
+            "servers_succeeded": sum(1 for outcome in servers.values() if outcome['status'] == 'success'),
+            "servers_failed": sum(1 for outcome in servers.values() if outcome['status'] == 'failed'),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+        # Sum per-server totals reported by the tool (e.g. total_vms, issues_found)
+        for outcome in servers.values():
+            for key, value in (outcome.get('result') or {}).items():
+                if (key.startswith('total_') or key == 'issues_found') and isinstance(value, (int, float)):
+                    summary[key] = summary.get(key, 0) + value
+        
+        result = {
+            "timestamp": datetime.now().isoformat(),
+            "aggregate": True,
+            "tool": name,
+            "summary": summary,
+            "servers": servers
+        }
+        
+        return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+    
     # Tool Implementation Methods
     
     async def _get_system_info(self, args: Dict[str, Any]) -> Sequence[TextContent]:
@@ -502,18 +725,9 @@ class ProxmoxMCPServer:
         client = await self._get_client(args.get('server'))
         
         try:
-            if args.get('node'):
-                # Get VMs for specific node
-                vms = await client.get_node_vms(args['node'])
-                nodes_data = {args['node']: vms}
-            else:
-                # Get VMs for all nodes
-                nodes = await client.get_nodes()
-                nodes_data = {}
-                for node in nodes:
-                    node_name = node['node']
-                    vms = await client.get_node_vms(node_name)
-                    nodes_data[node_name] = vms
+            # Get VMs for the requested node or all nodes concurrently
+            results = await client.fan_out_nodes(client.get_node_vms, args.get('node'))
+            nodes_data, node_errors = client.fanout.split(results)
             
             # Apply status filter if specified
             status_filter = args.get('status_filter')
@@ -527,7 +741,8 @@ class ProxmoxMCPServer:
             result = {
                 "timestamp": datetime.now().isoformat(),
                 "virtual_machines": nodes_data,
-                "total_vms": sum(len(vms) for vms in nodes_data.values())
+                "total_vms": sum(len(vms) for vms in nodes_data.values()),
+                "node_errors": node_errors
             }
             
             return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
@@ -540,18 +755,9 @@ class ProxmoxMCPServer:
         client = await self._get_client(args.get('server'))
         
         try:
-            if args.get('node'):
-                # Get containers for specific node
-                containers = await client.get_node_containers(args['node'])
-                nodes_data = {args['node']: containers}
-            else:
-                # Get containers for all nodes
-                nodes = await client.get_nodes()
-                nodes_data = {}
-                for node in nodes:
-                    node_name = node['node']
-                    containers = await client.get_node_containers(node_name)
-                    nodes_data[node_name] = containers
+            # Get containers for the requested node or all nodes concurrently
+            results = await client.fan_out_nodes(client.get_node_containers, args.get('node'))
+            nodes_data, node_errors = client.fanout.split(results)
             
             # Apply status filter if specified
             status_filter = args.get('status_filter')
@@ -565,7 +771,8 @@ class ProxmoxMCPServer:
             result = {
                 "timestamp": datetime.now().isoformat(),
                 "containers": nodes_data,
-                "total_containers": sum(len(containers) for containers in nodes_data.values())
+                "total_containers": sum(len(containers) for containers in nodes_data.values()),
+                "node_errors": node_errors
             }
             
             return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
@@ -583,15 +790,16 @@ class ProxmoxMCPServer:
             
             # Start the container
             result = await client.start_container(node, vmid)
+            task = await self._await_task(client, result, args)
             
             response = {
                 "timestamp": datetime.now().isoformat(),
                 "action": "start_container",
                 "node": node,
                 "vmid": vmid,
-                "status": "success",
-                "message": f"Container {vmid} on node {node} has been started",
-                "task_id": result.get('data') if result else None
+                **self._task_outcome(task, f"Container {vmid} on node {node} has been started"),
+                "task_id": result.get('data') if result else None,
+                "task": task
             }
             
             return [TextContent(type="text", text=json.dumps(response, indent=2))]
@@ -609,15 +817,16 @@ class ProxmoxMCPServer:
             
             # Stop the container
             result = await client.stop_container(node, vmid)
+            task = await self._await_task(client, result, args)
             
             response = {
                 "timestamp": datetime.now().isoformat(),
                 "action": "stop_container",
                 "node": node,
                 "vmid": vmid,
-                "status": "success",
-                "message": f"Container {vmid} on node {node} has been stopped",
-                "task_id": result.get('data') if result else None
+                **self._task_outcome(task, f"Container {vmid} on node {node} has been stopped"),
+                "task_id": result.get('data') if result else None,
+                "task": task
             }
             
             return [TextContent(type="text", text=json.dumps(response, indent=2))]
@@ -625,6 +834,68 @@ class ProxmoxMCPServer:
         except Exception as e:
             raise ProxmoxOperationError(f"Failed to stop container {args.get('vmid')}: {e}")
     
+    async def _await_task(self, client: ProxmoxClient, result: Dict[str, Any], args: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Wait for the task spawned by a mutating call, if requested."""
+        upid = extract_upid(result)
+        if not upid or not args.get('wait', True):
+            return None
+        tasks = await client.tasks.wait([upid], timeout=args.get('timeout', 60))
+        return tasks[upid]
+    
+    @staticmethod
+    def _task_outcome(task: Optional[Dict[str, Any]], success_message: str) -> Dict[str, str]:
+        """Map a tracked task state to the status/message fields of a tool response."""
+        if task is None:
+            return {"status": "submitted", "message": "Task submitted; use wait_for_tasks to confirm completion"}
+        if task['status'] == 'unknown':
+            return {"status": "unknown", "message": f"Task state could not be determined: {task['exitstatus']}"}
+        if task['status'] != 'stopped':
+            return {"status": "running", "message": "Task still running after timeout; use wait_for_tasks to follow it"}
+        if task['success']:
+            return {"status": "success", "message": success_message}
+        return {"status": "failed", "message": f"Task failed: {task['exitstatus']}"}
+    
+    async def _wait_for_tasks(self, args: Dict[str, Any]) -> Sequence[TextContent]:
+        """Wait for tasks to finish, reporting MCP progress as each one completes."""
+        client = await self._get_client(args.get('server'))
+        upids = list(dict.fromkeys(args['upids']))
+        
+        try:
+            finished = 0
+            async for task in client.tasks.as_completed(upids, timeout=args.get('timeout', 120)):
+                finished += 1
+                await self._report_progress(finished, len(upids), f"{task.upid}: {task.exitstatus}")
+            
+            tasks = {upid: client.tasks.get(upid).to_dict() for upid in upids}
+            result = {
+                "timestamp": datetime.now().isoformat(),
+                "tasks": tasks,
+                "summary": {
+                    "total": len(tasks),
+                    "succeeded": sum(1 for task in tasks.values() if task['success']),
+                    "failed": sum(1 for task in tasks.values() if task['success'] is False),
+                    "running": sum(1 for task in tasks.values() if task['status'] == 'running'),
+                    "unknown": sum(1 for task in tasks.values() if task['status'] == 'unknown')
+                }
+            }
+            
+            return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+            
+        except ProxmoxValidationError:
+            raise
+        except Exception as e:
+            raise ProxmoxOperationError(f"Failed to wait for tasks: {e}")
+    
+    async def _report_progress(self, progress: float, total: float, message: str) -> None:
+        """Send an MCP progress notification if the caller supplied a progress token."""
+        try:
+            context = self.app.request_context
+        except LookupError:
+            return
+        token = getattr(context.meta, 'progressToken', None) if context.meta else None
+        if token is not None:
+            await context.session.send_progress_notification(token, progress, total=total, message=message)
+    
     async def _run_health_assessment(self, args: Dict[str, Any]) -> Sequence[TextContent]:
         """Run comprehensive health assessment."""
         client = await self._get_client(args.get('server'))
@@ -634,15 +905,13 @@ class ProxmoxMCPServer:
             # Gather all system information
             system_info = await client.gather_system_info()
             
-            # Get details for all nodes
-            nodes_details = {}
-            if system_info.get('nodes'):
-                for node in system_info['nodes']:
-                    node_name = node['node']
-                    nodes_details[node_name] = await client.get_node_details(node_name)
+            # Get details for all nodes concurrently
+            node_names = [node['node'] for node in system_info.get('nodes') or []]
+            results = await client.fanout.map(node_names, client.get_node_details)
+            nodes_details, node_errors = client.fanout.split(results)
             
             # Analyze health issues
-            health_issues = []
+            health_issues = [f"Node {node_name}: unreachable ({error})" for node_name, error in node_errors.items()]
             recommendations = []
             
             # Check node status
@@ -683,7 +952,8 @@ class ProxmoxMCPServer:
                 "issues_found": len(health_issues),
                 "health_issues": health_issues,
                 "system_info": system_info,
-                "nodes_details": nodes_details
+                "nodes_details": nodes_details,
+                "node_errors": node_errors
             }
             
             if include_recommendations:
@@ -699,19 +969,9 @@ class ProxmoxMCPServer:
         client = await self._get_client(args.get('server'))
         
         try:
-            storage_data = {}
-            
-            if args.get('node'):
-                # Get storage for specific node
-                node_storage = await client.get_node_storage(args['node'])
-                storage_data[args['node']] = node_storage
-            else:
-                # Get storage for all nodes
-                nodes = await client.get_nodes()
-                for node in nodes:
-                    node_name = node['node']
-                    node_storage = await client.get_node_storage(node_name)
-                    storage_data[node_name] = node_storage
+            # Get storage for the requested node or all nodes concurrently
+            results = await client.fan_out_nodes(client.get_node_storage, args.get('node'))
+            storage_data, node_errors = client.fanout.split(results)
             
             # Filter by specific storage if requested
             storage_name = args.get('storage_name')
@@ -752,7 +1012,8 @@ class ProxmoxMCPServer:
                     "total_used_formatted": client.format_bytes(total_used),
                     "overall_usage_percent": (total_used / total_storage * 100) if total_storage > 0 else 0,
                     "critical_storages": critical_storages
-                }
+                },
+                "node_errors": node_errors
             }
             
             return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
@@ -762,24 +1023,26 @@ class ProxmoxMCPServer:
     
     async def _monitor_resource_usage(self, args: Dict[str, Any]) -> Sequence[TextContent]:
         """Monitor real-time resource usage."""
-        client = await self._get_client(args.get('server'))
+        server_name = args.get('server') or self.config.default_server
         include_thresholds = args.get('include_thresholds', True)
+        trends = self._metric_trends(server_name, args)
+        
+        if args.get('source') == 'history':
+            result = {
+                "timestamp": datetime.now().isoformat(),
+                "source": "history",
+                "trends": trends
+            }
+            return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+        
+        client = await self._get_client(server_name)
         
         try:
-            monitoring_data = {}
             threshold_violations = []
             
-            if args.get('node'):
-                # Monitor specific node
-                node_status = await client.get_node_status(args['node'])
-                monitoring_data[args['node']] = node_status
-            else:
-                # Monitor all nodes
-                nodes = await client.get_nodes()
-                for node in nodes:
-                    node_name = node['node']
-                    node_status = await client.get_node_status(node_name)
-                    monitoring_data[node_name] = node_status
+            # Monitor the requested node or all nodes concurrently
+            results = await client.fan_out_nodes(client.get_node_status, args.get('node'))
+            monitoring_data, node_errors = client.fanout.split(results)
             
             # Check thresholds if requested
             if include_thresholds:
@@ -811,6 +1074,8 @@ class ProxmoxMCPServer:
             result = {
                 "timestamp": datetime.now().isoformat(),
                 "monitoring_data": monitoring_data,
+                "node_errors": node_errors,
+                "trends": trends,
                 "threshold_violations": threshold_violations if include_thresholds else None,
                 "thresholds": {
                     "cpu_threshold": self.config.monitoring.cpu_threshold,
@@ -824,6 +1089,182 @@ class ProxmoxMCPServer:
         except Exception as e:
             raise ProxmoxOperationError(f"Failed to monitor resource usage: {e}")
     
+    async def _analyze_resource_trends(self, args: Dict[str, Any]) -> Sequence[TextContent]:
+        """Analyze RRD history for many nodes or guests in one pass."""
+        require_numpy()
+        target = args.get('target', 'guests')
+        metric = args.get('metric', 'cpu')
+        timeframe = args.get('timeframe', 'day')
+        cf = args.get('cf', 'AVERAGE')
+        if timeframe not in TIMEFRAMES:
+            raise ProxmoxValidationError(f"Unknown timeframe: {timeframe}")
+        if cf not in ('AVERAGE', 'MAX'):
+            raise ProxmoxValidationError(f"Unknown consolidation function: {cf}")
+        
+        client = await self._get_client(args.get('server'))
+        node = args.get('node')
+        
+        try:
+            start = time.perf_counter()
+            if target == 'nodes':
+                nodes = [node] if node else [item['node'] for item in await client.get_nodes()]
+                labels = {name: {'node': name} for name in nodes}
+                fetchers = {name: (lambda n=name: client.get_node_rrddata(n, timeframe, cf)) for name in nodes}
+            else:
+                types = {'guests': ('qemu', 'lxc'), 'vms': ('qemu',), 'containers': ('lxc',)}.get(target)
+                if types is None:
+                    raise ProxmoxValidationError(f"Unknown analytics target: {target}")
+                labels, fetchers = {}, {}
+                for resource in await client.get_cluster_resources():
+                    if resource.get('type') not in types or resource.get('template'):
+                        continue
+                    if node and resource.get('node') != node:
+                        continue
+                    key = f"{resource['node']}:{resource['type']}:{resource['vmid']}"
+                    labels[key] = {
+                        'vmid': resource['vmid'],
+                        'name': resource.get('name'),
+                        'type': resource['type'],
+                        'node': resource['node']
+                    }
+                    fetch = client.get_vm_rrddata if resource['type'] == 'qemu' else client.get_container_rrddata
+                    fetchers[key] = (lambda f=fetch, r=resource: f(r['node'], r['vmid'], timeframe, cf))
+            
+            results = await client.fanout.map(list(fetchers), lambda key: fetchers[key]())
+            series, fetch_errors = client.fanout.split(results)
+            fetch_ms = round((time.perf_counter() - start) * 1000, 1)
+            
+            keys = list(series)
+            analysis = analyze_series(
+                [labels[key] for key in keys],
+                [series[key] for key in keys],
+                metric,
+                target,
+                rank_by=args.get('rank_by', 'avg'),
+                top_n=args.get('top_n', 10),
+                percentiles=args.get('percentiles', [50, 95, 99]),
+                ascending=args.get('ascending', False)
+            )
+            
+            result = {
+                "timestamp": datetime.now().isoformat(),
+                "target": target,
+                "timeframe": timeframe,
+                "cf": cf,
+                **analysis,
+                "fetch_errors": fetch_errors,
+                "fetch_ms": fetch_ms,
+                "analysis_ms": round((time.perf_counter() - start) * 1000 - fetch_ms, 1)
+            }
+            
+            return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+            
+        except ProxmoxValidationError:
+            raise
+        except Exception as e:
+            raise ProxmoxOperationError(f"Failed to analyze resource trends: {e}")
+    
+    def _metric_trends(self, server_name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize collected metrics history for a server over the requested window."""
+        window_minutes = args.get('window_minutes', 60)
+        window_seconds = window_minutes * 60
+        node = args.get('node')
+        
+        nodes = {}
+        for entity in self.metrics.entities(f"{server_name}:node/"):
+            node_name = entity.split('/', 1)[1]
+            if node is None or node_name == node:
+                nodes[node_name] = self.metrics.summarize_entity(entity, window_seconds)
+        
+        trends = {
+            "window_minutes": window_minutes,
+            "collector_running": self._metrics_task is not None and not self._metrics_task.done(),
+            "nodes": nodes
+        }
+        if args.get('include_guest_trends'):
+            trends["guests"] = {
+                entity.split(':', 1)[1]: self.metrics.summarize_entity(entity, window_seconds)
+                for prefix in ('qemu/', 'lxc/')
+                for entity in self.metrics.entities(f"{server_name}:{prefix}")
+            }
+        return trends
+    
+    async def _collect_metrics_once(self) -> None:
+        """Sample node status and cluster resources from every connected server."""
+        for server_name, client in list(self._clients.items()):
+            timestamp = time.time()
+            node_results, resources = await asyncio.gather(
+                client.fan_out_nodes(client.get_node_status),
+                client.get_cluster_resources(),
+                return_exceptions=True
+            )
+            if isinstance(node_results, Exception):
+                logger.warning(f"Metrics collection failed for {server_name} nodes: {node_results}")
+            else:
+                statuses, node_errors = client.fanout.split(node_results)
+                for node_name, status in statuses.items():
+                    record_node_status(self.metrics, server_name, node_name, status, timestamp)
+                if node_errors:
+                    logger.debug(f"Metrics collection skipped unreachable nodes on {server_name}: {list(node_errors)}")
+            if isinstance(resources, Exception):
+                logger.warning(f"Metrics collection failed for {server_name} resources: {resources}")
+            else:
+                present = record_cluster_resources(self.metrics, server_name, resources, timestamp)
+                # Deleted or migrated-away guests and removed storages
+                self.metrics.evict_missing((f"{server_name}:{kind}" for kind in CLUSTER_RESOURCE_KINDS), present)
+        self._evict_stale_metrics()
+    
+    def _evict_stale_metrics(self) -> None:
+        """Drop entities (e.g. removed nodes or servers) that stopped reporting a full buffer ago."""
+        max_age = self.metrics.capacity * self.config.monitoring.check_interval_seconds
+        self.metrics.evict_stale(max_age)
+    
+    async def _metrics_collector_loop(self) -> None:
+        """Collect metrics every monitoring interval and persist them if configured."""
+        interval = self.config.monitoring.check_interval_seconds
+        while True:
+            try:
+                await self._collect_metrics_once()
+                await self._persist_metrics()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Metrics collection cycle failed: {e}")
+            await asyncio.sleep(interval)
+    
+    async def _persist_metrics(self) -> None:
+        """Write the metrics history to disk without blocking the event loop."""
+        path = self.config.monitoring.metrics_persist_path
+        if not path:
+            return
+        self._evict_stale_metrics()
+        # Serialize on the loop so the collector cannot mutate buffers mid-write
+        payload = self.metrics.serialize()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, MetricsStore.write_file, path, payload)
+        except OSError as e:
+            logger.warning(f"Failed to persist metrics history to {path}: {e}")
+    
+    def _start_metrics_collector(self) -> None:
+        if not (self.config.enable_metrics and self.config.monitoring.enable_monitoring):
+            return
+        if self.config.monitoring.metrics_persist_path:
+            self.metrics.load_file(self.config.monitoring.metrics_persist_path)
+            self._evict_stale_metrics()
+        self._metrics_task = asyncio.ensure_future(self._metrics_collector_loop())
+        logger.info(f"Metrics collector started (interval {self.config.monitoring.check_interval_seconds}s)")
+    
+    async def _stop_metrics_collector(self) -> None:
+        if self._metrics_task is None:
+            return
+        self._metrics_task.cancel()
+        try:
+            await self._metrics_task
+        except asyncio.CancelledError:
+            pass
+        self._metrics_task = None
+        await self._persist_metrics()
+    
     async def _manage_snapshots(self, args: Dict[str, Any]) -> Sequence[TextContent]:
         """Manage snapshots (list, analyze, cleanup)."""
         client = await self._get_client(args.get('server'))
@@ -844,50 +1285,20 @@ class ProxmoxMCPServer:
     
     async def _list_snapshots(self, client: ProxmoxClient, args: Dict[str, Any]) -> Sequence[TextContent]:
         """List all snapshots."""
-        snapshots_data = {}
+        inventory = await collect_snapshot_inventory(client, node=args.get('node'), vmid=args.get('vmid'))
         
-        if args.get('node') and args.get('vmid'):
-            # List snapshots for specific VM/container
-            node = args['node']
-            vmid = args['vmid']
-            
-            vm_snapshots = await client.get_vm_snapshots(node, vmid)
-            container_snapshots = await client.get_container_snapshots(node, vmid)
-            
-            snapshots_data[f"{node}:{vmid}"] = {
-                'vm_snapshots': vm_snapshots,
-                'container_snapshots': container_snapshots
-            }
-        else:
-            # List snapshots for all VMs/containers
-            nodes = await client.get_nodes()
-            
-            for node in nodes:
-                node_name = node['node']
-                
-                # Get VMs and their snapshots
-                vms = await client.get_node_vms(node_name)
-                for vm in vms:
-                    vmid = vm['vmid']
-                    snapshots = await client.get_vm_snapshots(node_name, vmid)
-                    if snapshots:
-                        snapshots_data[f"{node_name}:vm:{vmid}"] = snapshots
-                
-                # Get containers and their snapshots
-                containers = await client.get_node_containers(node_name)
-                for container in containers:
-                    vmid = container['vmid']
-                    snapshots = await client.get_container_snapshots(node_name, vmid)
-                    if snapshots:
-                        snapshots_data[f"{node_name}:ct:{vmid}"] = snapshots
+        snapshots_data = {
+            guest_key: [record.raw for record in records]
+            for guest_key, records in inventory.by_guest().items()
+        }
         
         result = {
             "timestamp": datetime.now().isoformat(),
             "operation": "list",
             "snapshots": snapshots_data,
-            "total_snapshots": sum(len(snaps) if isinstance(snaps, list) else 
-                                 len(snaps.get('vm_snapshots', [])) + len(snaps.get('container_snapshots', []))
-                                 for snaps in snapshots_data.values())
+            "total_snapshots": len(inventory),
+            "guests_scanned": inventory.guests_scanned,
+            "guest_errors": inventory.guest_errors
         }
         
         return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
@@ -897,73 +1308,26 @@ class ProxmoxMCPServer:
         max_age_days = args.get('max_age_days', 90)
         cutoff_date = datetime.now() - timedelta(days=max_age_days)
         
-        old_snapshots = []
-        analysis_data = {}
-        
-        nodes = await client.get_nodes()
+        inventory = await collect_snapshot_inventory(client, node=args.get('node'), vmid=args.get('vmid'))
+        old_records = inventory.older_than(cutoff_date)
         
-        for node in nodes:
-            node_name = node['node']
-            node_snapshots = {'vms': {}, 'containers': {}}
-            
-            # Analyze VM snapshots
-            vms = await client.get_node_vms(node_name)
-            for vm in vms:
-                vmid = vm['vmid']
-                snapshots = await client.get_vm_snapshots(node_name, vmid)
-                
-                vm_old_snapshots = []
-                for snapshot in snapshots:
-                    # Parse snapshot creation time (this would need to be adapted based on Proxmox API response format)
-                    if 'snaptime' in snapshot:
-                        snap_time = datetime.fromtimestamp(snapshot['snaptime'])
-                        if snap_time < cutoff_date:
-                            vm_old_snapshots.append({
-                                'node': node_name,
-                                'type': 'vm',
-                                'vmid': vmid,
-                                'snapshot': snapshot,
-                                'age_days': (datetime.now() - snap_time).days
-                            })
-                
-                if vm_old_snapshots:
-                    node_snapshots['vms'][vmid] = vm_old_snapshots
-                    old_snapshots.extend(vm_old_snapshots)
-            
-            # Analyze container snapshots
-            containers = await client.get_node_containers(node_name)
-            for container in containers:
-                vmid = container['vmid']
-                snapshots = await client.get_container_snapshots(node_name, vmid)
-                
-                ct_old_snapshots = []
-                for snapshot in snapshots:
-                    if 'snaptime' in snapshot:
-                        snap_time = datetime.fromtimestamp(snapshot['snaptime'])
-                        if snap_time < cutoff_date:
-                            ct_old_snapshots.append({
-                                'node': node_name,
-                                'type': 'container',
-                                'vmid': vmid,
-                                'snapshot': snapshot,
-                                'age_days': (datetime.now() - snap_time).days
-                            })
-                
-                if ct_old_snapshots:
-                    node_snapshots['containers'][vmid] = ct_old_snapshots
-                    old_snapshots.extend(ct_old_snapshots)
-            
-            if node_snapshots['vms'] or node_snapshots['containers']:
-                analysis_data[node_name] = node_snapshots
+        now = datetime.now()
+        analysis_data = {}
+        for record in old_records:
+            node_snapshots = analysis_data.setdefault(record.node, {'vms': {}, 'containers': {}})
+            group = node_snapshots['vms' if record.guest_type == 'qemu' else 'containers']
+            group.setdefault(record.vmid, []).append(record.to_dict(now))
         
         result = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "operation": "analyze",
             "max_age_days": max_age_days,
             "cutoff_date": cutoff_date.isoformat(),
-            "old_snapshots_count": len(old_snapshots),
+            "total_snapshots": len(inventory),
+            "old_snapshots_count": len(old_records),
             "analysis_data": analysis_data,
-            "old_snapshots": old_snapshots[:50]  # Limit output size
+            "old_snapshots": [record.to_dict(now) for record in old_records[:50]],  # Limit output size
+            "guest_errors": inventory.guest_errors
         }
         
         return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
@@ -977,12 +1341,13 @@ class ProxmoxMCPServer:
         self.security.validate_destructive_operation('snapshot_cleanup', args)
         
         max_age_days = args.get('max_age_days', 90)
+        cutoff_date = datetime.now() - timedelta(days=max_age_days)
         
-        # First analyze to get old snapshots
-        analyze_result = await self._analyze_snapshots(client, args)
-        analyze_data = json.loads(analyze_result[0].text)
-        
-        old_snapshots = analyze_data['old_snapshots']
+        # Oldest snapshots first, capped at the per-operation limit
+        inventory = await collect_snapshot_inventory(client, node=args.get('node'), vmid=args.get('vmid'))
+        old_records = inventory.older_than(cutoff_date)
+        batch = old_records[:self.config.security.max_cleanup_items_per_operation]
+        old_snapshots = [record.to_dict() for record in batch]
         
         # Validate cleanup limits
         self.security.validate_cleanup_operation('snapshot_cleanup', len(old_snapshots), old_snapshots)
@@ -990,28 +1355,22 @@ class ProxmoxMCPServer:
         cleanup_results = []
         
         if not self.security.is_dry_run_enabled():
-            for snapshot_info in old_snapshots:
-                try:
-                    node = snapshot_info['node']
-                    vmid = snapshot_info['vmid']
-                    snapshot_name = snapshot_info['snapshot']['name']
-                    
-                    if snapshot_info['type'] == 'vm':
-                        await client.delete_vm_snapshot(node, vmid, snapshot_name)
-                    else:
-                        await client.delete_container_snapshot(node, vmid, snapshot_name)
-                    
-                    cleanup_results.append({
-                        'status': 'success',
-                        'snapshot': snapshot_info
-                    })
-                    
-                except Exception as e:
-                    cleanup_results.append({
-                        'status': 'failed',
-                        'snapshot': snapshot_info,
-                        'error': str(e)
-                    })
+            # Snapshot deletes lock the guest config, so each guest is its own serial scope
+            items = [
+                CleanupItem(
+                    node=record.node,
+                    scope=record.guest_key,
+                    delete=(
+                        (lambda r=record: client.delete_vm_snapshot(r.node, r.vmid, r.name))
+                        if record.guest_type == 'qemu' else
+                        (lambda r=record: client.delete_container_snapshot(r.node, r.vmid, r.name))
+                    ),
+                    info=snapshot_info
+                )
+                for record, snapshot_info in zip(batch, old_snapshots)
+            ]
+            executor = CleanupExecutor(client, self.config.automation, scope_concurrency=1)
+            cleanup_results = await executor.run(items, info_key='snapshot')
         
         result = {
             "timestamp": datetime.now().isoformat(),
@@ -1019,7 +1378,9 @@ class ProxmoxMCPServer:
             "dry_run": self.security.is_dry_run_enabled(),
             "max_age_days": max_age_days,
             "snapshots_processed": len(old_snapshots),
-            "cleanup_results": cleanup_results
+            "snapshots_remaining": len(old_records) - len(old_snapshots),
+            "cleanup_results": cleanup_results,
+            "summary": summarize_cleanup(cleanup_results)
         }
         
         return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
@@ -1044,64 +1405,58 @@ class ProxmoxMCPServer:
     
     async def _list_backups(self, client: ProxmoxClient, args: Dict[str, Any]) -> Sequence[TextContent]:
         """List all backup files."""
-        backups_data = {}
+        storage = args.get('storage')
+        results = await client.fan_out_nodes(lambda node_name: client.get_backups(node_name, storage), args.get('node'))
+        node_backups, node_errors = client.fanout.split(results)
         
-        if args.get('node'):
-            nodes_to_check = [{'node': args['node']}]
+        if storage:
+            backups_data = {f"{node_name}:{storage}": backups for node_name, backups in node_backups.items()}
         else:
-            nodes_to_check = await client.get_nodes()
-        
-        for node in nodes_to_check:
-            node_name = node['node']
-            
-            if args.get('storage'):
-                backups = await client.get_backups(node_name, args['storage'])
-                backups_data[f"{node_name}:{args['storage']}"] = backups
-            else:
-                backups = await client.get_backups(node_name)
-                backups_data[node_name] = backups
+            backups_data = node_backups
         
         result = {
             "timestamp": datetime.now().isoformat(),
             "operation": "list",
             "backups": backups_data,
-            "total_backups": sum(len(backups) for backups in backups_data.values())
+            "total_backups": sum(len(backups) for backups in backups_data.values()),
+            "node_errors": node_errors
         }
         
         return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
     
-    async def _analyze_backups(self, client: ProxmoxClient, args: Dict[str, Any]) -> Sequence[TextContent]:
-        """Analyze backups for cleanup."""
-        max_age_days = args.get('max_age_days', 30)
-        cutoff_date = datetime.now() - timedelta(days=max_age_days)
+    async def _collect_old_backups(self, client: ProxmoxClient, args: Dict[str, Any], cutoff_date: datetime):
+        """Collect backups older than the cutoff, oldest first, with per-node errors."""
+        storage = args.get('storage')
+        results = await client.fan_out_nodes(lambda node_name: client.get_backups(node_name, storage), args.get('node'))
+        node_backups, node_errors = client.fanout.split(results)
         
+        now = datetime.now()
         old_backups = []
-        analysis_data = {}
-        
-        if args.get('node'):
-            nodes_to_check = [{'node': args['node']}]
-        else:
-            nodes_to_check = await client.get_nodes()
-        
-        for node in nodes_to_check:
-            node_name = node['node']
-            backups = await client.get_backups(node_name, args.get('storage'))
-            
-            node_old_backups = []
+        for node_name, backups in node_backups.items():
             for backup in backups:
                 # Parse backup creation time
                 if 'ctime' in backup:
                     backup_time = datetime.fromtimestamp(backup['ctime'])
                     if backup_time < cutoff_date:
-                        node_old_backups.append({
+                        old_backups.append({
                             'node': node_name,
                             'backup': backup,
-                            'age_days': (datetime.now() - backup_time).days
+                            'age_days': (now - backup_time).days
                         })
-            
-            if node_old_backups:
-                analysis_data[node_name] = node_old_backups
-                old_backups.extend(node_old_backups)
+        
+        old_backups.sort(key=lambda item: item['backup']['ctime'])
+        return old_backups, node_errors
+    
+    async def _analyze_backups(self, client: ProxmoxClient, args: Dict[str, Any]) -> Sequence[TextContent]:
+        """Analyze backups for cleanup."""
+        max_age_days = args.get('max_age_days', 30)
+        cutoff_date = datetime.now() - timedelta(days=max_age_days)
+        
+        old_backups, node_errors = await self._collect_old_backups(client, args, cutoff_date)
+        
+        analysis_data = {}
+        for backup_info in old_backups:
+            analysis_data.setdefault(backup_info['node'], []).append(backup_info)
         
         result = {
             "timestamp": datetime.now().isoformat(),
@@ -1110,7 +1465,8 @@ class ProxmoxMCPServer:
             "cutoff_date": cutoff_date.isoformat(),
             "old_backups_count": len(old_backups),
             "analysis_data": analysis_data,
-            "old_backups": old_backups[:50]
+            "old_backups": old_backups[:50],
+            "node_errors": node_errors
         }
         
         return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
@@ -1123,11 +1479,22 @@ class ProxmoxMCPServer:
         # Validate with security
         self.security.validate_destructive_operation('backup_cleanup', args)
         
-        # Get old backups to clean
-        analyze_result = await self._analyze_backups(client, args)
-        analyze_data = json.loads(analyze_result[0].text)
+        max_age_days = args.get('max_age_days', 30)
+        cutoff_date = datetime.now() - timedelta(days=max_age_days)
         
-        old_backups = analyze_data['old_backups']
+        # Shared storages list the same volume on every node; delete each volume once
+        candidates, _ = await self._collect_old_backups(client, args, cutoff_date)
+        seen_volids = set()
+        old_backups = []
+        for backup_info in candidates:
+            volid = backup_info['backup'].get('volid')
+            if volid not in seen_volids:
+                seen_volids.add(volid)
+                old_backups.append(backup_info)
+        
+        # Oldest backups first, capped at the per-operation limit
+        remaining = max(0, len(old_backups) - self.config.security.max_cleanup_items_per_operation)
+        old_backups = old_backups[:self.config.security.max_cleanup_items_per_operation]
         
         # Validate cleanup limits
         self.security.validate_cleanup_operation('backup_cleanup', len(old_backups), old_backups)
@@ -1135,33 +1502,29 @@ class ProxmoxMCPServer:
         cleanup_results = []
         
         if not self.security.is_dry_run_enabled():
-            for backup_info in old_backups:
-                try:
-                    node = backup_info['node']
-                    backup = backup_info['backup']
-                    storage = backup['storage']
-                    volid = backup['volid']
-                    
-                    await client.delete_backup(node, storage, volid)
-                    
-                    cleanup_results.append({
-                        'status': 'success',
-                        'backup': backup_info
-                    })
-                    
-                except Exception as e:
-                    cleanup_results.append({
-                        'status': 'failed',
-                        'backup': backup_info,
-                        'error': str(e)
-                    })
+            items = [
+                CleanupItem(
+                    node=backup_info['node'],
+                    scope=f"{backup_info['node']}:{backup_info['backup']['storage']}",
+                    delete=lambda b=backup_info: client.delete_backup(b['node'], b['backup']['storage'], b['backup']['volid']),
+                    info=backup_info
+                )
+                for backup_info in old_backups
+            ]
+            executor = CleanupExecutor(
+                client, self.config.automation,
+                scope_concurrency=self.config.automation.cleanup_storage_concurrency
+            )
+            cleanup_results = await executor.run(items, info_key='backup')
         
         result = {
             "timestamp": datetime.now().isoformat(),
             "operation": "cleanup",
             "dry_run": self.security.is_dry_run_enabled(),
             "backups_processed": len(old_backups),
-            "cleanup_results": cleanup_results
+            "backups_remaining": remaining,
+            "cleanup_results": cleanup_results,
+            "summary": summarize_cleanup(cleanup_results)
         }
         
         return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
@@ -1308,68 +1671,199 @@ class ProxmoxMCPServer:
         client = await self._get_client(args.get('server'))
         include_detailed = args.get('include_detailed_analysis', True)
         format_type = args.get('format', 'json')
+        if format_type not in REPORT_FORMATS:
+            raise ProxmoxValidationError(f"Unknown report format: {format_type}")
+        output_path = resolve_report_path(self.config.report_output_dir, args['output_file']) if args.get('output_file') else None
         
         try:
-            # Gather comprehensive data
+            started = datetime.now()
+            producers = await self._audit_section_producers(client, args, include_detailed)
+            sections = stream_sections(producers, timeout=args.get('timeout_seconds', 120))
+            
+            if format_type in ('jsonl', 'markdown'):
+                return await self._stream_audit_report(client, sections, len(producers), format_type, output_path, started)
+            
+            # Whole-document formats: collect sections, then render once
             audit_data = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": started.isoformat(),
                 "server_info": client.get_connection_info(),
-                "system_info": await client.gather_system_info()
+                "nodes_details": {},
+                "node_errors": {}
             }
-            
-            # Get node details
-            nodes_details = {}
-            if audit_data['system_info'].get('nodes'):
-                for node in audit_data['system_info']['nodes']:
-                    node_name = node['node']
-                    nodes_details[node_name] = await client.get_node_details(node_name)
-            
-            audit_data["nodes_details"] = nodes_details
-            
-            if include_detailed:
-                # Run health assessment
-                health_result = await self._run_health_assessment({'include_recommendations': True, 'server': args.get('server')})
-                audit_data["health_assessment"] = json.loads(health_result[0].text)
-                
-                # Get storage analysis
-                storage_result = await self._get_storage_status({'server': args.get('server')})
-                audit_data["storage_analysis"] = json.loads(storage_result[0].text)
-                
-                # Get snapshot analysis
-                snapshot_result = await self._analyze_snapshots(client, {'max_age_days': 90})
-                audit_data["snapshot_analysis"] = json.loads(snapshot_result[0].text)
-                
-                # Get backup analysis
-                backup_result = await self._analyze_backups(client, {'max_age_days': 30})
-                audit_data["backup_analysis"] = json.loads(backup_result[0].text)
+            collected = []
+            async for section in sections:
+                collected.append(section)
+                await self._report_progress(len(collected), len(producers), f"{section.name}: {section.status}")
+                if section.name.startswith('node:'):
+                    node_name = section.name.split(':', 1)[1]
+                    if section.status == 'complete':
+                        audit_data["nodes_details"][node_name] = section.data
+                    else:
+                        audit_data["node_errors"][node_name] = section.error
+                elif section.status == 'complete':
+                    audit_data[section.name] = section.data
+                else:
+                    audit_data[section.name] = None
+            audit_data["report"] = summarize_sections(collected, started)
             
             if format_type == 'json':
-                return [TextContent(type="text", text=json.dumps(audit_data, indent=2, default=str))]
+                text = json.dumps(audit_data, indent=2, default=str)
             else:
                 # Generate text format report
-                text_report = f"""
+                nodes_details = audit_data["nodes_details"]
+                text = f"""
 PROXMOX ENVIRONMENT AUDIT REPORT
 Generated: {audit_data['timestamp']}
 Server: {audit_data['server_info']['host']}:{audit_data['server_info']['port']}
 
 === SYSTEM OVERVIEW ===
-Nodes: {len(audit_data['system_info'].get('nodes', []))}
-VMs: {sum(len(details.get('vms', [])) for details in nodes_details.values())}
-Containers: {sum(len(details.get('containers', [])) for details in nodes_details.values())}
+Nodes: {len((audit_data.get('system_info') or {}).get('nodes') or [])}
+VMs: {sum(len(details.get('vms') or []) for details in nodes_details.values())}
+Containers: {sum(len(details.get('containers') or []) for details in nodes_details.values())}
 
 === HEALTH STATUS ===
 """
-                if include_detailed:
-                    health = audit_data['health_assessment']
-                    text_report += f"Health Score: {health['health_score']}/100\n"
-                    text_report += f"Status: {health['status']}\n"
-                    text_report += f"Issues Found: {health['issues_found']}\n"
+                health = audit_data.get('health_assessment')
+                if health:
+                    text += f"Health Score: {health['health_score']}/100\n"
+                    text += f"Status: {health['status']}\n"
+                    text += f"Issues Found: {health['issues_found']}\n"
+                
+                operation_audit = audit_data.get('operation_audit')
+                if operation_audit:
+                    text += f"\n=== OPERATIONS (last {operation_audit['window_hours']}h) ===\n"
+                    text += f"Total: {operation_audit['summary']['total']}\n"
+                    for operation, count in list(operation_audit['summary']['by_operation'].items())[:10]:
+                        text += f"  {operation}: {count}\n"
                 
-                return [TextContent(type="text", text=text_report)]
+                report = audit_data['report']
+                if report['partial']:
+                    text += f"\nPARTIAL REPORT: failed={report['sections_failed']} timed_out={report['sections_timed_out']}\n"
             
+            if output_path:
+                report_file = IncrementalReportFile(output_path)
+                await report_file.open()
+                try:
+                    await report_file.write(text)
+                finally:
+                    await report_file.close()
+            
+            return [TextContent(type="text", text=text)]
+            
+        except ProxmoxMCPError:
+            raise
         except Exception as e:
             raise ProxmoxOperationError(f"Failed to generate audit report: {e}")
     
+    async def _audit_section_producers(self, client: ProxmoxClient, args: Dict[str, Any],
+                                       include_detailed: bool) -> Dict[str, Any]:
+        """Independent report sections, keyed by section name."""
+        server = args.get('server')
+        window_hours = args.get('audit_window_hours', 24)
+        
+        async def operation_audit() -> Dict[str, Any]:
+            # Operation audit trail, read from the bounded buffer and on-disk log
+            since = datetime.now() - timedelta(hours=window_hours)
+            return {
+                "window_hours": window_hours,
+                "summary": await self.security.get_operation_summary(since=since),
+                "recent_entries": await self.security.query_operation_log(since=since, limit=args.get('audit_entries_limit', 50)),
+                "log": self.security.audit.get_stats()
+            }
+        
+        async def node_details(node_name: str) -> Dict[str, Any]:
+            result = await client.fanout.run(node_name, client.get_node_details)
+            if not result.ok:
+                raise ProxmoxOperationError(result.error)
+            return result.data
+        
+        async def tool_section(handler, tool_args) -> Dict[str, Any]:
+            content = await handler(tool_args)
+            return json.loads(content[0].text)
+        
+        producers = {
+            "system_info": client.gather_system_info,
+            "operation_audit": operation_audit
+        }
+        # Node list comes from the (cached) nodes endpoint so node sections start immediately
+        for node_name in [node['node'] for node in await client.get_nodes()]:
+            producers[f"node:{node_name}"] = lambda n=node_name: node_details(n)
+        
+        if include_detailed:
+            producers["health_assessment"] = lambda: tool_section(
+                self._run_health_assessment, {'include_recommendations': True, 'server': server}
+            )
+            producers["storage_analysis"] = lambda: tool_section(self._get_storage_status, {'server': server})
+            producers["snapshot_analysis"] = lambda: tool_section(
+                lambda a: self._analyze_snapshots(client, a), {'max_age_days': 90}
+            )
+            producers["backup_analysis"] = lambda: tool_section(
+                lambda a: self._analyze_backups(client, a), {'max_age_days': 30}
+            )
+        return producers
+    
+    async def _stream_audit_report(self, client: ProxmoxClient, sections, total: int, format_type: str,
+                                   output_path: Optional[str], started: datetime) -> Sequence[TextContent]:
+        """Render sections as they complete into chunks and/or an incrementally written file."""
+        renderer = ReportRenderer(format_type)
+        report_file = IncrementalReportFile(output_path) if output_path else None
+        chunks: List[TextContent] = []
+        collected = []
+        
+        async def emit(chunk: str) -> None:
+            if report_file:
+                await report_file.write(chunk)
+            else:
+                chunks.append(TextContent(type="text", text=chunk))
+        
+        if report_file:
+            await report_file.open()
+        try:
+            server_info = client.get_connection_info()
+            await emit(renderer.header({
+                "generated": started.isoformat(),
+                "server": f"{server_info['host']}:{server_info['port']}",
+                "sections": total
+            }))
+            async for section in sections:
+                await emit(renderer.section(section))
+                # Keep only the outcome; section data has already been rendered
+                collected.append(ReportSection(section.name, section.status, error=section.error,
+                                               elapsed_ms=section.elapsed_ms))
+                await self._report_progress(len(collected), total, f"{section.name}: {section.status}")
+            summary = summarize_sections(collected, started)
+            await emit(renderer.footer(summary))
+        finally:
+            if report_file:
+                await report_file.close()
+        
+        if report_file:
+            result = {"output_file": report_file.path, "bytes_written": report_file.bytes_written, **summary}
+            return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+        return chunks
+    
+    async def _get_performance_stats(self, args: Dict[str, Any]) -> Sequence[TextContent]:
+        """Report response cache, tool latency and metrics history statistics."""
+        if args.get('server'):
+            clients = {args['server']: await self._get_client(args['server'])}
+        else:
+            clients = dict(self._clients)
+        
+        cache_stats = {}
+        for server_name, client in clients.items():
+            cache_stats[server_name] = client.get_cache_stats()
+            if args.get('clear_cache') and client.cache:
+                client.cache.clear()
+        
+        result = {
+            "timestamp": datetime.now().isoformat(),
+            "cache": cache_stats,
+            "tools": self.tools.get_stats(),
+            "metrics_history": self.metrics.get_stats()
+        }
+        
+        return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+    
     async def run(self):
         """Run the MCP server."""
         try:
@@ -1378,6 +1872,7 @@ Containers: {sum(len(details.get('containers', [])) for details in nodes_details
             # Initialize any required connections
             default_client = await self._get_client()
             logger.info(f"Connected to default Proxmox server: {default_client.host}")
+            self._start_metrics_collector()
             
             # Start the MCP server
             from mcp.server.stdio import stdio_server
@@ -1399,6 +1894,8 @@ Containers: {sum(len(details.get('containers', [])) for details in nodes_details
             logger.error(f"Failed to start Proxmox MCP Server: {e}")
             raise
         finally:
+            await self._stop_metrics_collector()
+            self.security.close()
             # Cleanup connections
             for client in self._clients.values():
                 await client.disconnect()
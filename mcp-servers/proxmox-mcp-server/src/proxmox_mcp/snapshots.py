@@ -0,0 +1,140 @@
+"""
+Snapshot inventory engine for Proxmox MCP Server.
+
+Builds a typed, age-indexed view of every guest snapshot in the cluster from a
+single ``cluster/resources`` sweep plus concurrent per-guest snapshot fetches.
+Listing, analysis and cleanup all work from the same inventory.
+"""
+
+import bisect
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+GUEST_TYPES = ('qemu', 'lxc')
+
+
+@dataclass
+class SnapshotRecord:
+    """A single guest snapshot."""
+
+    node: str
+    guest_type: str
+    vmid: int
+    name: str
+    snaptime: Optional[int] = None
+    guest_name: Optional[str] = None
+    raw: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def kind(self) -> str:
+        """Guest kind as reported by the snapshot tools ('vm' or 'container')."""
+        return 'vm' if self.guest_type == 'qemu' else 'container'
+
+    @property
+    def guest_key(self) -> str:
+        """Stable guest key, e.g. ``pve1:vm:100`` or ``pve1:ct:200``."""
+        return f"{self.node}:{'vm' if self.guest_type == 'qemu' else 'ct'}:{self.vmid}"
+
+    def created_at(self) -> Optional[datetime]:
+        """Snapshot creation time, if Proxmox reported one."""
+        return datetime.fromtimestamp(self.snaptime) if self.snaptime is not None else None
+
+    def age_days(self, now: Optional[datetime] = None) -> Optional[int]:
+        """Snapshot age in whole days."""
+        created = self.created_at()
+        if created is None:
+            return None
+        return ((now or datetime.now()) - created).days
+
+    def to_dict(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Serialize in the shape used by the snapshot analysis output."""
+        return {
+            'node': self.node,
+            'type': self.kind,
+            'vmid': self.vmid,
+            'guest_name': self.guest_name,
+            'snapshot': self.raw,
+            'age_days': self.age_days(now)
+        }
+
+
+class SnapshotInventory:
+    """Snapshots for a set of guests, sorted and indexed by creation time."""
+
+    def __init__(self, records: List[SnapshotRecord], guests_scanned: int = 0,
+                 guest_errors: Optional[Dict[str, str]] = None):
+        dated = sorted((r for r in records if r.snaptime is not None), key=lambda r: r.snaptime)
+        undated = [r for r in records if r.snaptime is None]
+        self.records: List[SnapshotRecord] = dated + undated
+        self.guests_scanned = guests_scanned
+        self.guest_errors: Dict[str, str] = guest_errors or {}
+        self._snaptimes = [r.snaptime for r in dated]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def older_than(self, cutoff: datetime) -> List[SnapshotRecord]:
+        """Snapshots created before ``cutoff``, oldest first."""
+        index = bisect.bisect_left(self._snaptimes, cutoff.timestamp())
+        return self.records[:index]
+
+    def by_guest(self, records: Optional[List[SnapshotRecord]] = None) -> Dict[str, List[SnapshotRecord]]:
+        """Group snapshots by guest key, preserving age order within each guest."""
+        grouped: Dict[str, List[SnapshotRecord]] = {}
+        for record in self.records if records is None else records:
+            grouped.setdefault(record.guest_key, []).append(record)
+        return grouped
+
+
+async def collect_snapshot_inventory(client, node: Optional[str] = None,
+                                     vmid: Optional[int] = None) -> SnapshotInventory:
+    """Collect snapshots for all matching guests.
+
+    Guests come from one ``cluster/resources`` call; snapshot lists are then
+    fetched concurrently through the client's fan-out limit. Guests whose
+    snapshot list cannot be fetched are reported in ``guest_errors``.
+    """
+    resources = await client.get_cluster_resources()
+    guests = {}
+    for resource in resources:
+        if resource.get('type') not in GUEST_TYPES or resource.get('template'):
+            continue
+        if node and resource.get('node') != node:
+            continue
+        if vmid is not None and resource.get('vmid') != vmid:
+            continue
+        key = f"{resource['node']}:{'vm' if resource['type'] == 'qemu' else 'ct'}:{resource['vmid']}"
+        guests[key] = resource
+
+    async def fetch(key: str) -> List[Dict[str, Any]]:
+        guest = guests[key]
+        if guest['type'] == 'qemu':
+            return await client.get_vm_snapshots(guest['node'], guest['vmid'])
+        return await client.get_container_snapshots(guest['node'], guest['vmid'])
+
+    results = await client.fanout.map(guests.keys(), fetch)
+    snapshot_lists, guest_errors = client.fanout.split(results)
+
+    records = []
+    for key, snapshots in snapshot_lists.items():
+        guest = guests[key]
+        for snapshot in snapshots:
+            # 'current' is the live state pseudo-entry, not a snapshot
+            if snapshot.get('name') == 'current':
+                continue
+            records.append(SnapshotRecord(
+                node=guest['node'],
+                guest_type=guest['type'],
+                vmid=guest['vmid'],
+                name=snapshot.get('name'),
+                snaptime=snapshot.get('snaptime'),
+                guest_name=guest.get('name'),
+                raw=snapshot
+            ))
+
+    logger.info(f"Snapshot inventory: {len(records)} snapshots across {len(guests)} guests")
+    return SnapshotInventory(records, guests_scanned=len(guests), guest_errors=guest_errors)
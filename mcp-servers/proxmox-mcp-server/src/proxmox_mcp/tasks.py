@@ -0,0 +1,255 @@
+"""
+UPID task tracking for Proxmox MCP Server.
+
+Every UPID returned by a mutating API call is registered with the client's
+TaskTracker. A single background poller lists ``nodes/{node}/tasks`` once per
+node per interval and resolves all pending tasks on that node from the
+listing, instead of polling each task separately. A task whose status cannot
+be fetched for ``max_poll_failures`` consecutive polls is given up on with
+status ``unknown``, so waiters are released when a node stops answering.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from .exceptions import ProxmoxValidationError
+
+logger = logging.getLogger(__name__)
+
+
+def extract_upid(response: Any) -> Optional[str]:
+    """Return the UPID from a mutating API response, if the call spawned a task."""
+    data = response.get('data') if isinstance(response, dict) else None
+    if isinstance(data, str) and data.startswith('UPID:'):
+        return data
+    return None
+
+
+def parse_upid(upid: str) -> Dict[str, Any]:
+    """Split a UPID (``UPID:node:pid:pstart:starttime:type:id:user:``) into fields."""
+    parts = upid.split(':')
+    if len(parts) < 8 or parts[0] != 'UPID':
+        raise ProxmoxValidationError(f"Invalid UPID: {upid}")
+    return {
+        'node': parts[1],
+        'starttime': int(parts[4], 16),
+        'type': parts[5],
+        'id': parts[6],
+        'user': parts[7]
+    }
+
+
+@dataclass
+class TrackedTask:
+    """State of a registered Proxmox task."""
+
+    upid: str
+    node: str
+    task_type: str
+    guest_id: str
+    starttime: int
+    origin: Optional[str] = None
+    status: str = 'running'
+    exitstatus: Optional[str] = None
+    endtime: Optional[int] = None
+    poll_failures: int = 0
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the task finished successfully (warnings count as success)."""
+        return self.status == 'stopped' and bool(self.exitstatus) and (
+            self.exitstatus == 'OK' or self.exitstatus.startswith('WARNINGS')
+        )
+
+    def finish(self, exitstatus: Optional[str], endtime: Optional[int] = None) -> None:
+        self.status = 'stopped'
+        self.exitstatus = exitstatus
+        self.endtime = endtime
+        self.done.set()
+
+    def give_up(self, reason: str) -> None:
+        """Stop tracking a task whose state can no longer be determined."""
+        self.status = 'unknown'
+        self.exitstatus = reason
+        self.done.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'upid': self.upid,
+            'node': self.node,
+            'type': self.task_type,
+            'id': self.guest_id,
+            'status': self.status,
+            'exitstatus': self.exitstatus,
+            'success': self.ok if self.status == 'stopped' else None,
+            'duration_seconds': (self.endtime - self.starttime) if self.endtime else None
+        }
+
+
+class TaskTracker:
+    """Track Proxmox tasks and resolve them with batched per-node polling."""
+
+    def __init__(self, client, poll_interval: float = 1.0, list_limit: int = 500, history_size: int = 1000,
+                 on_finish: Optional[Callable[[TrackedTask], None]] = None, max_poll_failures: int = 30):
+        self.client = client
+        self.on_finish = on_finish
+        self.poll_interval = poll_interval
+        self.max_poll_failures = max_poll_failures
+        self.list_limit = list_limit
+        self.history_size = history_size
+        self._tasks: "OrderedDict[str, TrackedTask]" = OrderedDict()
+        self._poller: Optional[asyncio.Task] = None
+        self.stats = {'registered': 0, 'list_polls': 0, 'fallback_polls': 0, 'poll_failures': 0, 'given_up': 0}
+
+    def register(self, upid: str, origin: Optional[str] = None) -> TrackedTask:
+        """Start tracking a task; idempotent for already known UPIDs.
+
+        ``origin`` is the API endpoint that spawned the task.
+        """
+        task = self._tasks.get(upid)
+        if task is None:
+            fields = parse_upid(upid)
+            task = TrackedTask(
+                upid=upid,
+                node=fields['node'],
+                task_type=fields['type'],
+                guest_id=fields['id'],
+                starttime=fields['starttime'],
+                origin=origin
+            )
+            self._tasks[upid] = task
+            self.stats['registered'] += 1
+            self._trim_history()
+        if task.status == 'running' and (self._poller is None or self._poller.done()):
+            self._poller = asyncio.ensure_future(self._poll_loop())
+        return task
+
+    def get(self, upid: str) -> Optional[TrackedTask]:
+        return self._tasks.get(upid)
+
+    def pending(self) -> List[TrackedTask]:
+        return [task for task in self._tasks.values() if task.status == 'running']
+
+    async def wait(self, upids: Iterable[str], timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """Wait for tasks to finish (up to ``timeout``) and return their states."""
+        tasks = [self.register(upid) for upid in upids]
+        waiters = [asyncio.ensure_future(task.done.wait()) for task in tasks if task.status == 'running']
+        if waiters:
+            _, still_running = await asyncio.wait(waiters, timeout=timeout)
+            for waiter in still_running:
+                waiter.cancel()
+        return {task.upid: task.to_dict() for task in tasks}
+
+    async def as_completed(self, upids: Iterable[str], timeout: Optional[float] = None) -> AsyncIterator[TrackedTask]:
+        """Yield tasks as they finish; stops at ``timeout`` leaving the rest running."""
+        tasks = {task.upid: task for task in (self.register(upid) for upid in upids)}
+        waiters = {asyncio.ensure_future(task.done.wait()): task for task in tasks.values()}
+        deadline = time.monotonic() + timeout if timeout else None
+        try:
+            while waiters:
+                remaining = deadline - time.monotonic() if deadline else None
+                if remaining is not None and remaining <= 0:
+                    break
+                finished, _ = await asyncio.wait(waiters, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                if not finished:
+                    break
+                for waiter in finished:
+                    yield waiters.pop(waiter)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _poll_loop(self) -> None:
+        """Poll each node with pending tasks until nothing is pending."""
+        while True:
+            by_node: Dict[str, List[TrackedTask]] = {}
+            for task in self.pending():
+                by_node.setdefault(task.node, []).append(task)
+            if not by_node:
+                return
+            await asyncio.gather(*(self._poll_node(node, tasks) for node, tasks in by_node.items()))
+            if self.pending():
+                await asyncio.sleep(self.poll_interval)
+
+    async def _poll_node(self, node: str, tasks: List[TrackedTask]) -> None:
+        """Resolve a node's pending tasks from a single task listing."""
+        since = min(task.starttime for task in tasks)
+        try:
+            listing = await self.client.get_node_tasks(node, since=since, limit=self.list_limit)
+            self.stats['list_polls'] += 1
+        except Exception as e:
+            logger.warning(f"Task listing failed on node {node}: {e}")
+            for task in tasks:
+                self._poll_failed(task, e)
+            return
+
+        entries = {entry.get('upid'): entry for entry in listing}
+        missing = []
+        for task in tasks:
+            entry = entries.get(task.upid)
+            if entry is None:
+                missing.append(task)
+                continue
+            task.poll_failures = 0
+            if entry.get('endtime'):
+                self._finish(task, entry.get('status'), entry.get('endtime'))
+
+        # Not in the (possibly truncated) listing; ask for these tasks directly
+        await asyncio.gather(*(self._poll_single(task) for task in missing))
+
+    async def _poll_single(self, task: TrackedTask) -> None:
+        try:
+            status = await self.client.get_task_status(task.node, task.upid)
+            self.stats['fallback_polls'] += 1
+        except Exception as e:
+            logger.warning(f"Task status lookup failed for {task.upid}: {e}")
+            self._poll_failed(task, e)
+            return
+        task.poll_failures = 0
+        if status.get('status') == 'stopped':
+            self._finish(task, status.get('exitstatus'), status.get('endtime'))
+
+    def _poll_failed(self, task: TrackedTask, error: Exception) -> None:
+        """Count a failed status poll; give up on the task after too many in a row."""
+        task.poll_failures += 1
+        self.stats['poll_failures'] += 1
+        if task.poll_failures < self.max_poll_failures:
+            return
+        task.give_up(f"poll_failed: no status after {task.poll_failures} attempts ({error})")
+        self.stats['given_up'] += 1
+        logger.warning(f"Giving up on task {task.upid}: {task.exitstatus}")
+        if self.on_finish:
+            try:
+                self.on_finish(task)
+            except Exception as e:
+                logger.warning(f"Task completion hook failed for {task.upid}: {e}")
+
+    def _finish(self, task: TrackedTask, exitstatus: Optional[str], endtime: Optional[int]) -> None:
+        task.finish(exitstatus, endtime)
+        logger.info(f"Task {task.upid} finished: {exitstatus}")
+        if self.on_finish:
+            try:
+                self.on_finish(task)
+            except Exception as e:
+                logger.warning(f"Task completion hook failed for {task.upid}: {e}")
+
+    def _trim_history(self) -> None:
+        """Forget the oldest finished tasks beyond the history size."""
+        excess = len(self._tasks) - self.history_size
+        if excess <= 0:
+            return
+        for upid in [upid for upid, task in self._tasks.items() if task.status != 'running'][:excess]:
+            del self._tasks[upid]
+
+    async def close(self) -> None:
+        if self._poller and not self._poller.done():
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
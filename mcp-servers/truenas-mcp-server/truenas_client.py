@@ -0,0 +1,261 @@
+"""
+TrueNAS HTTP Client
+Connection pooling, retries and circuit breaking for the TrueNAS REST API
+
+The client is a regular httpx.AsyncClient whose transport retries idempotent
+requests on transport errors and 502/503/504 responses with exponential
+backoff and full jitter, and opens a circuit after repeated failures so calls
+fail fast while the NAS is unreachable instead of each waiting for a timeout.
+Every failed attempt, retries included, counts towards opening the circuit,
+and read timeouts are not retried since each one already cost a full timeout.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRYABLE_STATUS = frozenset({502, 503, 504})
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+@dataclass
+class ClientSettings:
+    """Transport settings, read from TRUENAS_* environment variables"""
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    pool_timeout: float = 10.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 8.0
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "ClientSettings":
+        return cls(
+            connect_timeout=_env_float("TRUENAS_CONNECT_TIMEOUT", cls.connect_timeout),
+            read_timeout=_env_float("TRUENAS_TIMEOUT", cls.read_timeout),
+            pool_timeout=_env_float("TRUENAS_POOL_TIMEOUT", cls.pool_timeout),
+            max_connections=_env_int("TRUENAS_MAX_CONNECTIONS", cls.max_connections),
+            max_keepalive_connections=_env_int("TRUENAS_MAX_KEEPALIVE", cls.max_keepalive_connections),
+            keepalive_expiry=_env_float("TRUENAS_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+            http2=os.getenv("TRUENAS_HTTP2", "false").lower() == "true",
+            max_retries=_env_int("TRUENAS_MAX_RETRIES", cls.max_retries),
+            backoff_base=_env_float("TRUENAS_RETRY_BACKOFF", cls.backoff_base),
+            circuit_failure_threshold=_env_int("TRUENAS_CIRCUIT_THRESHOLD", cls.circuit_failure_threshold),
+            circuit_reset_timeout=_env_float("TRUENAS_CIRCUIT_RESET", cls.circuit_reset_timeout),
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.read_timeout,
+            pool=self.pool_timeout
+        )
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without contacting the NAS while the circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    After ``failure_threshold`` failed requests the circuit opens and requests
+    are rejected for ``reset_timeout`` seconds; then a single probe request is
+    let through, and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._probe_in_flight = False
+
+    def before_request(self, request: httpx.Request) -> None:
+        if self.state == "closed":
+            return
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+        self.rejected += 1
+        retry_in = max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(
+            f"TrueNAS circuit open after {self.failures} consecutive failures; retrying in {retry_in:.0f}s",
+            request=request
+        )
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info("TrueNAS circuit closed")
+        self.state = "closed"
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"TrueNAS circuit opened after {self.failures} consecutive failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        self._probe_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Wrap a transport with retries for idempotent requests and a circuit breaker"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, settings: ClientSettings):
+        self.transport = transport
+        self.settings = settings
+        self.breaker = CircuitBreaker(settings.circuit_failure_threshold, settings.circuit_reset_timeout)
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    def _backoff(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        # Full jitter: uniform over [0, base * 2^attempt], capped
+        delay = random.uniform(0, min(self.settings.backoff_max, self.settings.backoff_base * 2 ** attempt))
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), self.settings.backoff_max))
+        return delay
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.breaker.before_request(request)
+        self.stats["requests"] += 1
+        try:
+            return await self._send(request)
+        except (asyncio.CancelledError, Exception) as e:
+            if not isinstance(e, httpx.TransportError):
+                # Cancelled or failed outside the transport: neither outcome says anything about the NAS
+                self.breaker.release_probe()
+            raise
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        retries = self.settings.max_retries if request.method in IDEMPOTENT_METHODS else 0
+
+        attempt = 0
+        while True:
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                # A read timeout has already cost a full timeout; do not spend another on a retry
+                if self._give_up(attempt, attempt if isinstance(e, httpx.ReadTimeout) else retries):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    self.breaker.record_success()
+                    return response
+                self.breaker.record_failure()
+                if self._give_up(attempt, retries):
+                    return response
+                delay = self._backoff(attempt, response)
+                await response.aclose()
+                await asyncio.sleep(delay)
+            try:
+                # Other requests may have opened the circuit during the backoff
+                self.breaker.before_request(request)
+            except CircuitOpenError:
+                self.stats["failures"] += 1
+                raise
+            attempt += 1
+            self.stats["retries"] += 1
+
+    def _give_up(self, attempt: int, retries: int) -> bool:
+        """Whether a failed attempt is final: retries used up or the circuit now open."""
+        if attempt < retries and self.breaker.state != "open":
+            return False
+        self.stats["failures"] += 1
+        return True
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "circuit": self.breaker.get_stats()}
+
+
+class TrueNASHTTPClient(httpx.AsyncClient):
+    """httpx client for the TrueNAS v2.0 API with pooling, retries and circuit breaking"""
+
+    def __init__(self, base_url: str, api_key: str, verify_ssl: bool = True,
+                 settings: Optional[ClientSettings] = None):
+        self.settings = settings or ClientSettings.from_env()
+        http2 = self.settings.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("TRUENAS_HTTP2 is enabled but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+
+        self.resilience = ResilientTransport(
+            httpx.AsyncHTTPTransport(verify=verify_ssl, http2=http2, limits=self.settings.limits()),
+            self.settings
+        )
+        super().__init__(
+            base_url=f"{base_url}/api/v2.0",
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            },
+            transport=self.resilience,
+            timeout=self.settings.timeout()
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "timeouts": {
+                "connect": self.settings.connect_timeout,
+                "read": self.settings.read_timeout,
+                "pool": self.settings.pool_timeout
+            },
+            "limits": {
+                "max_connections": self.settings.max_connections,
+                "max_keepalive_connections": self.settings.max_keepalive_connections,
+                "keepalive_expiry": self.settings.keepalive_expiry
+            },
+            "max_retries": self.settings.max_retries,
+            **self.resilience.get_stats()
+        }
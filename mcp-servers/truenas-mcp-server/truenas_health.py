@@ -0,0 +1,293 @@
+"""
+TrueNAS Pool Health
+Cached pool health snapshots with capacity trends from sampled history
+
+Each refresh gathers pools (with topology and scrub state), scrub
+schedules and alerts concurrently, records a capacity sample per
+pool and derives used %, fragmentation trend and projected days-to-full from
+the sampled history. The snapshot is served from cache for a configurable
+interval so frequent health checks do not hit the middleware.
+"""
+
+import asyncio
+import json
+import re
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+SECONDS_PER_DAY = 86400
+
+# Thresholds used to grade a pool
+USED_WARNING_PCT = 80.0
+USED_CRITICAL_PCT = 90.0
+DAYS_TO_FULL_WARNING = 30.0
+DAYS_TO_FULL_CRITICAL = 7.0
+SCRUB_MAX_AGE_DAYS = 35.0
+
+# Minimum span of history before a growth rate is projected
+MIN_TREND_SPAN_SECONDS = 3600
+
+
+def _parsed(value: Any) -> Optional[float]:
+    """Numeric value of a middleware property ({"parsed": ...}) or plain number"""
+    if isinstance(value, dict):
+        value = value.get("parsed", value.get("rawvalue"))
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _timestamp(value: Any) -> Optional[float]:
+    """Epoch seconds from a middleware date ({"$date": ms}) or epoch number"""
+    if isinstance(value, dict):
+        value = value.get("$date")
+    if value is None:
+        return None
+    value = float(value)
+    return value / 1000 if value > 1e11 else value
+
+
+def linear_slope(points: List[Tuple[float, float]]) -> Optional[float]:
+    """Least-squares slope (units per second) of (time, value) points"""
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    variance = sum((t - mean_t) ** 2 for t, _ in points)
+    if variance == 0:
+        return None
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / variance
+
+
+class PoolHistory:
+    """Bounded capacity samples per pool"""
+
+    def __init__(self, max_samples: int = 1440):
+        self.max_samples = max_samples
+        self._samples: Dict[str, Deque[Tuple[float, float, float, Optional[float]]]] = {}
+
+    def record(self, pool: str, ts: float, used: float, capacity: float, fragmentation: Optional[float]) -> None:
+        samples = self._samples.setdefault(pool, deque(maxlen=self.max_samples))
+        samples.append((ts, used, capacity, fragmentation))
+
+    def trends(self, pool: str) -> Dict[str, Any]:
+        samples = list(self._samples.get(pool, ()))
+        span = samples[-1][0] - samples[0][0] if len(samples) > 1 else 0.0
+        result: Dict[str, Any] = {
+            "samples": len(samples),
+            "span_hours": round(span / 3600, 2),
+            "growth_bytes_per_day": None,
+            "fragmentation_change_per_day": None,
+            "days_to_full": None
+        }
+        if span < MIN_TREND_SPAN_SECONDS:
+            return result
+
+        growth = linear_slope([(ts, used) for ts, used, _, _ in samples])
+        if growth is not None:
+            result["growth_bytes_per_day"] = round(growth * SECONDS_PER_DAY)
+            _, used, capacity, _ = samples[-1]
+            if growth > 0 and capacity > used:
+                result["days_to_full"] = round((capacity - used) / (growth * SECONDS_PER_DAY), 1)
+
+        frag_points = [(ts, frag) for ts, _, _, frag in samples if frag is not None]
+        frag_slope = linear_slope(frag_points) if len(frag_points) > 1 else None
+        if frag_slope is not None:
+            result["fragmentation_change_per_day"] = round(frag_slope * SECONDS_PER_DAY, 3)
+        return result
+
+
+def _walk_vdevs(vdevs: List[Dict[str, Any]], problems: List[Dict[str, Any]]) -> int:
+    """Count leaf devices and collect the ones that are not ONLINE or report errors"""
+    disks = 0
+    for vdev in vdevs:
+        children = vdev.get("children") or []
+        if children:
+            disks += _walk_vdevs(children, problems)
+            if vdev.get("status") not in (None, "ONLINE"):
+                problems.append({"device": vdev.get("name") or vdev.get("type"), "status": vdev.get("status")})
+            continue
+        disks += 1
+        stats = vdev.get("stats") or {}
+        errors = {key: stats.get(f"{key}_errors", 0) for key in ("read", "write", "checksum")}
+        if vdev.get("status") not in (None, "ONLINE") or any(errors.values()):
+            problems.append({
+                "device": vdev.get("disk") or vdev.get("path") or vdev.get("name"),
+                "status": vdev.get("status"),
+                **errors
+            })
+    return disks
+
+
+def summarize_topology(topology: Dict[str, Any]) -> Dict[str, Any]:
+    problems: List[Dict[str, Any]] = []
+    vdevs = {}
+    disks = 0
+    for role, entries in (topology or {}).items():
+        if not entries:
+            continue
+        vdevs[role] = len(entries)
+        disks += _walk_vdevs(entries, problems)
+    return {"vdevs": vdevs, "disks": disks, "problem_devices": problems}
+
+
+def summarize_scrub(scan: Optional[Dict[str, Any]], now: float) -> Dict[str, Any]:
+    scan = scan or {}
+    finished = _timestamp(scan.get("end_time"))
+    return {
+        "function": scan.get("function"),
+        "state": scan.get("state"),
+        "percentage": round(scan["percentage"], 1) if isinstance(scan.get("percentage"), (int, float)) else None,
+        "errors": scan.get("errors"),
+        "last_finished": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(finished)) if finished else None,
+        "days_since_scrub": round((now - finished) / SECONDS_PER_DAY, 1) if finished else None
+    }
+
+
+def scrub_schedule(tasks: Optional[List[Dict[str, Any]]], pool_id: Any, pool_name: str) -> Optional[Dict[str, Any]]:
+    """The pool's scrub task; None when the schedule could not be fetched"""
+    if tasks is None:
+        return None
+    for task in tasks:
+        if task.get("pool") == pool_id or task.get("pool_name") == pool_name:
+            return {"enabled": task.get("enabled"), "threshold_days": task.get("threshold"), "cron": task.get("schedule")}
+    return {"enabled": False}
+
+
+def alerts_for_pool(alerts: List[Dict[str, Any]], pool_name: str) -> List[Dict[str, Any]]:
+    # Match the name as a whole word so "tank" does not claim alerts for "tank2"
+    pattern = re.compile(rf"(?<![\w.-]){re.escape(pool_name)}(?![\w.-])")
+    matched = []
+    for alert in alerts:
+        if alert.get("dismissed"):
+            continue
+        text = f"{alert.get('formatted') or ''} {json.dumps(alert.get('args'), default=str)}"
+        if pattern.search(text):
+            matched.append({"level": alert.get("level"), "klass": alert.get("klass"), "message": alert.get("formatted")})
+    return matched
+
+
+def grade_pool(pool: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """Overall status and the reasons for it"""
+    critical, warning = [], []
+    if pool["healthy"] is False or pool["status"] not in ("ONLINE", None):
+        critical.append(f"pool status {pool['status']}")
+    used_pct = pool["capacity"]["used_pct"]
+    if used_pct is not None and used_pct >= USED_CRITICAL_PCT:
+        critical.append(f"{used_pct}% used")
+    elif used_pct is not None and used_pct >= USED_WARNING_PCT:
+        warning.append(f"{used_pct}% used")
+    days_to_full = pool["trends"]["days_to_full"]
+    if days_to_full is not None and days_to_full <= DAYS_TO_FULL_CRITICAL:
+        critical.append(f"full in {days_to_full} days")
+    elif days_to_full is not None and days_to_full <= DAYS_TO_FULL_WARNING:
+        warning.append(f"full in {days_to_full} days")
+    if pool["topology"]["problem_devices"]:
+        warning.append(f"{len(pool['topology']['problem_devices'])} device(s) degraded or reporting errors")
+    days_since_scrub = pool["scrub"]["days_since_scrub"]
+    if days_since_scrub is not None and days_since_scrub > SCRUB_MAX_AGE_DAYS:
+        warning.append(f"last scrub {days_since_scrub} days ago")
+    schedule = pool["scrub"]["schedule"]
+    if schedule is not None and not schedule.get("enabled"):
+        warning.append("no scheduled scrub")
+    if pool["scrub"]["errors"]:
+        warning.append(f"{pool['scrub']['errors']} scrub errors")
+    for alert in pool["alerts"]:
+        if alert["level"] == "CRITICAL":
+            critical.append(alert["message"] or alert["klass"])
+        elif alert["level"] in ("ERROR", "WARNING"):
+            warning.append(alert["message"] or alert["klass"])
+    if critical:
+        return "critical", critical + warning
+    if warning:
+        return "warning", warning
+    return "healthy", []
+
+
+class PoolHealthMonitor:
+    """Builds pool health snapshots and serves them from cache for ``cache_seconds``"""
+
+    def __init__(self, cache_seconds: float = 60.0, history_samples: int = 1440):
+        self.cache_seconds = cache_seconds
+        self.history = PoolHistory(history_samples)
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._taken_at = 0.0
+        self._lock = asyncio.Lock()
+        self.stats = {"refreshes": 0, "cache_hits": 0}
+
+    async def get(
+        self,
+        gather: Callable[[], Awaitable[Dict[str, Any]]],
+        max_age: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Return the cached snapshot, refreshing it with ``gather`` when older than ``max_age``
+
+        ``gather`` returns {"pools": [...], "scrub_tasks": [...], "alerts": [...], "errors": {...}}.
+        """
+        max_age = self.cache_seconds if max_age is None else max_age
+        async with self._lock:
+            age = time.monotonic() - self._taken_at
+            if self._snapshot is not None and age < max_age:
+                self.stats["cache_hits"] += 1
+                return {**self._snapshot, "cached": True, "age_seconds": round(age, 1)}
+            start = time.perf_counter()
+            data = await gather()
+            self._snapshot = self._build(data, round((time.perf_counter() - start) * 1000, 1))
+            self._taken_at = time.monotonic()
+            self.stats["refreshes"] += 1
+            return {**self._snapshot, "cached": False, "age_seconds": 0.0}
+
+    def _build(self, data: Dict[str, Any], gather_ms: float) -> Dict[str, Any]:
+        now = time.time()
+        alerts = data.get("alerts") or []
+        pools = []
+        for raw in data.get("pools") or []:
+            name = raw.get("name")
+            used, capacity = _parsed(raw.get("allocated")), _parsed(raw.get("size"))
+            fragmentation = _parsed(raw.get("fragmentation"))
+            if used is not None and capacity:
+                self.history.record(name, now, used, capacity, fragmentation)
+
+            pool = {
+                "name": name,
+                "status": raw.get("status"),
+                "healthy": raw.get("healthy"),
+                "capacity": {
+                    "used_bytes": used,
+                    "available_bytes": capacity - used if used is not None and capacity else None,
+                    "total_bytes": capacity,
+                    "used_pct": round(used / capacity * 100, 1) if used is not None and capacity else None,
+                    "fragmentation_pct": fragmentation
+                },
+                "trends": self.history.trends(name),
+                "topology": summarize_topology(raw.get("topology") or {}),
+                "scrub": {
+                    **summarize_scrub(raw.get("scan"), now),
+                    "schedule": scrub_schedule(data.get("scrub_tasks"), raw.get("id"), name)
+                },
+                "alerts": alerts_for_pool(alerts, name)
+            }
+            pool["overall"], pool["reasons"] = grade_pool(pool)
+            pools.append(pool)
+
+        levels = ("critical", "warning", "healthy")
+        overall = next((level for level in levels if any(pool["overall"] == level for pool in pools)), "healthy")
+        alert_levels: Dict[str, int] = {}
+        for alert in alerts:
+            if not alert.get("dismissed"):
+                alert_levels[alert.get("level")] = alert_levels.get(alert.get("level"), 0) + 1
+        return {
+            "overall": overall,
+            "taken_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now)),
+            "gather_ms": gather_ms,
+            "pools": pools,
+            "alerts_by_level": alert_levels,
+            "errors": data.get("errors") or {}
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "cache_seconds": self.cache_seconds}
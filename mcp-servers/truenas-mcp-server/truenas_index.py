@@ -0,0 +1,152 @@
+"""
+TrueNAS Lookup Index
+Name-keyed TTL index of users, datasets and pools
+
+Tools that act on a single resource resolve it here instead of downloading the
+whole collection: a miss issues a filtered query (e.g. /pool/dataset?name=tank/data),
+and a stale entry is refreshed with a targeted /<collection>/id/{id} request,
+sent as a conditional request when the middleware returned ETag/Last-Modified.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import quote
+
+import httpx
+
+
+@dataclass
+class IndexEntry:
+    """A cached resource with its id and HTTP validators"""
+    id: Any
+    value: Dict[str, Any]
+    fetched_at: float
+    validators: Dict[str, str] = field(default_factory=dict)
+
+
+class ResourceIndex:
+    """TTL index over one TrueNAS collection, keyed by a name field"""
+
+    def __init__(self, endpoint: str, key_field: str, get_client: Callable[[], httpx.AsyncClient], ttl: float):
+        self.endpoint = endpoint
+        self.key_field = key_field
+        self.get_client = get_client
+        self.ttl = ttl
+        self._entries: Dict[str, IndexEntry] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0, "not_modified": 0, "invalidations": 0}
+
+    async def get(self, name: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Return the resource named ``name``, or None if it does not exist
+
+        Args:
+            name: Value of the key field (username, dataset name, pool name)
+            refresh: Revalidate even if the cached entry is within its TTL
+        """
+        entry = self._entries.get(name)
+        if entry and not refresh and time.monotonic() - entry.fetched_at < self.ttl:
+            self.stats["hits"] += 1
+            return entry.value
+
+        # Concurrent lookups of the same name share one request
+        task = self._inflight.get(name)
+        if task is None:
+            task = asyncio.ensure_future(self._load(name, entry))
+            self._inflight[name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(name, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, name: str, entry: Optional[IndexEntry]) -> Optional[Dict[str, Any]]:
+        http_client = self.get_client()
+
+        if entry is not None:
+            self.stats["refreshes"] += 1
+            response = await http_client.get(
+                f"{self.endpoint}/id/{quote(str(entry.id), safe='')}",
+                headers=entry.validators
+            )
+            if response.status_code == 304:
+                self.stats["not_modified"] += 1
+                entry.fetched_at = time.monotonic()
+                return entry.value
+            if response.status_code != 404:
+                response.raise_for_status()
+                value = response.json()
+                if value.get(self.key_field) == name:
+                    return self._store(name, value, response.headers)
+            # Deleted or renamed since it was indexed; fall back to a name query
+            self._entries.pop(name, None)
+
+        self.stats["misses"] += 1
+        response = await http_client.get(self.endpoint, params={self.key_field: name})
+        response.raise_for_status()
+        matches = response.json()
+        if not matches:
+            return None
+        return self._store(name, matches[0])
+
+    def _store(self, name: str, value: Dict[str, Any], headers: Optional[httpx.Headers] = None) -> Dict[str, Any]:
+        validators = {}
+        if headers is not None:
+            if headers.get("etag"):
+                validators["If-None-Match"] = headers["etag"]
+            if headers.get("last-modified"):
+                validators["If-Modified-Since"] = headers["last-modified"]
+        self._entries[name] = IndexEntry(
+            id=value.get("id", name),
+            value=value,
+            fetched_at=time.monotonic(),
+            validators=validators
+        )
+        return value
+
+    def put(self, name: str, value: Dict[str, Any]) -> None:
+        """Replace an entry with a representation returned by a create/update call"""
+        self._store(name, value)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop one entry, or every entry when ``name`` is None"""
+        if name is None:
+            self.stats["invalidations"] += len(self._entries)
+            self._entries.clear()
+        elif self._entries.pop(name, None) is not None:
+            self.stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["refreshes"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else None
+        }
+
+
+class LookupIndex:
+    """Users by username, datasets by name and pools by name"""
+
+    def __init__(self, get_client: Callable[[], httpx.AsyncClient], ttl: float = 60.0):
+        self.ttl = ttl
+        self.users = ResourceIndex("/user", "username", get_client, ttl)
+        self.datasets = ResourceIndex("/pool/dataset", "name", get_client, ttl)
+        self.pools = ResourceIndex("/pool", "name", get_client, ttl)
+
+    def invalidate_dataset(self, name: str) -> None:
+        """Drop a dataset and its ancestors, whose entries embed their children"""
+        parts = name.split("/")
+        for depth in range(len(parts), 0, -1):
+            self.datasets.invalidate("/".join(parts[:depth]))
+
+    def invalidate_all(self) -> None:
+        for index in (self.users, self.datasets, self.pools):
+            index.invalidate()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "ttl_seconds": self.ttl,
+            "users": self.users.get_stats(),
+            "datasets": self.datasets.get_stats(),
+            "pools": self.pools.get_stats()
+        }
@@ -7,8 +7,17 @@ A Model Context Protocol server for interacting with TrueNAS Core systems
 import os
 import httpx
 from typing import Dict, List, Any, Optional, Union
+from urllib.parse import quote
 from mcp.server.fastmcp import FastMCP
 import asyncio
+import time
+
+from truenas_client import TrueNASHTTPClient
+from truenas_health import PoolHealthMonitor
+from truenas_index import LookupIndex
+from truenas_pipeline import Step, error_message, run_bounded, run_transaction
+from truenas_query import FilterSpec, Query, fetch_page, iterate_pages
+from truenas_ws import JOB_FINAL_STATES, TrueNASWebSocket
 
 # Initialize the MCP server
 mcp = FastMCP("TrueNAS Core MCP Server")
@@ -16,8 +25,17 @@ mcp = FastMCP("TrueNAS Core MCP Server")
 # Global client instance
 client = None
 
-def get_client():
-    """Get or create the HTTP client"""
+# Global lookup index (users, datasets, pools by name)
+lookup_index = None
+
+# Global websocket transport (enabled with TRUENAS_WEBSOCKET=true)
+ws_client = None
+
+# Global pool health monitor (cached snapshots and capacity history)
+health_monitor = None
+
+def get_client() -> TrueNASHTTPClient:
+    """Get or create the HTTP client (pooled, retrying, circuit-breaking)"""
     global client
     if client is None:
         base_url = os.getenv("TRUENAS_URL", "https://truenas.local")
@@ -27,18 +45,46 @@ def get_client():
         if not api_key:
             raise ValueError("TRUENAS_API_KEY environment variable is required")
         
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
+        client = TrueNASHTTPClient(base_url, api_key, verify_ssl=verify_ssl)
+    return client
+
+def get_lookup_index() -> LookupIndex:
+    """Get or create the name-keyed lookup index"""
+    global lookup_index
+    if lookup_index is None:
+        ttl = float(os.getenv("TRUENAS_INDEX_TTL", "60"))
+        lookup_index = LookupIndex(get_client, ttl=ttl)
+    return lookup_index
+
+def get_ws() -> Optional[TrueNASWebSocket]:
+    """Get or create the websocket transport, or None when it is disabled"""
+    global ws_client
+    if ws_client is None and os.getenv("TRUENAS_WEBSOCKET", "false").lower() == "true":
+        base_url = os.getenv("TRUENAS_URL", "https://truenas.local")
+        api_key = os.getenv("TRUENAS_API_KEY", "")
+        verify_ssl = os.getenv("TRUENAS_VERIFY_SSL", "true").lower() == "true"
+        
+        if not api_key:
+            raise ValueError("TRUENAS_API_KEY environment variable is required")
         
-        client = httpx.AsyncClient(
-            base_url=f"{base_url}/api/v2.0",
-            headers=headers,
-            verify=verify_ssl,
-            timeout=30.0
+        ws_url = base_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1) + "/websocket"
+        ws_client = TrueNASWebSocket(
+            ws_url,
+            api_key,
+            verify_ssl=verify_ssl,
+            call_timeout=float(os.getenv("TRUENAS_TIMEOUT", "30"))
         )
-    return client
+    return ws_client
+
+def get_health_monitor() -> PoolHealthMonitor:
+    """Get or create the pool health monitor"""
+    global health_monitor
+    if health_monitor is None:
+        health_monitor = PoolHealthMonitor(
+            cache_seconds=float(os.getenv("TRUENAS_POOL_HEALTH_CACHE", "60")),
+            history_samples=int(os.getenv("TRUENAS_POOL_HEALTH_SAMPLES", "1440"))
+        )
+    return health_monitor
 
 # Debug Tools
 
@@ -52,44 +98,56 @@ async def debug_connection() -> Dict[str, Any]:
             "TRUENAS_VERIFY_SSL": os.getenv("TRUENAS_VERIFY_SSL", "NOT SET")
         },
         "client_status": "initialized" if client else "not initialized",
-        "client_base_url": client.base_url if client else "N/A"
+        "client_base_url": client.base_url if client else "N/A",
+        "client_stats": client.get_stats() if client else "N/A",
+        "lookup_index": lookup_index.get_stats() if lookup_index else "not initialized",
+        "websocket": ws_client.get_stats() if ws_client else "disabled",
+        "pool_health_cache": health_monitor.get_stats() if health_monitor else "not initialized"
     }
 
 @mcp.tool()
 async def reset_connection() -> Dict[str, Any]:
-    """Reset the HTTP client to force re-initialization"""
-    global client
+    """Reset the HTTP client (connection pool and circuit breaker) and websocket to force re-initialization"""
+    global client, ws_client
     if client:
         await client.aclose()
     client = None
+    if ws_client:
+        await ws_client.close()
+    ws_client = None
+    if lookup_index:
+        lookup_index.invalidate_all()
     return {"success": True, "message": "Connection reset. Next API call will create new client."}
 
 # User Management Tools
 
+# Fields returned by list_users when no selection is given
+USER_FIELDS = ["id", "username", "full_name", "email", "groups", "shell", "home", "locked", "sudo", "builtin"]
+
 @mcp.tool()
-async def list_users() -> Dict[str, Any]:
-    """List all users in TrueNAS"""
+async def list_users(
+    filters: Optional[FilterSpec] = None,
+    select: Optional[List[str]] = None,
+    sort: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    List users in TrueNAS
+    
+    Args:
+        filters: {"field": value} or [["field", "op", value], ...] (ops: =, !=, >, <, >=, <=, ~, ^, $)
+        select: Fields to return (default: a summary of each user)
+        sort: Fields to sort by, "-" prefix for descending (e.g. ["username"])
+        limit: Maximum number of users to return
+        cursor: next_cursor from a previous call with the same query
+    """
     try:
-        http_client = get_client()
-        response = await http_client.get("/user")
-        response.raise_for_status()
-        users = response.json()
-        
-        # Return simplified user info
-        user_list = [{
-            "id": user.get("id"),
-            "username": user.get("username"),
-            "full_name": user.get("full_name"),
-            "email": user.get("email"),
-            "groups": user.get("groups", []),
-            "shell": user.get("shell"),
-            "home": user.get("home"),
-            "locked": user.get("locked", False),
-            "sudo": user.get("sudo", False),
-            "builtin": user.get("builtin", False)
-        } for user in users]
-        
-        return {"success": True, "users": user_list, "count": len(user_list)}
+        query = Query.build(filters, select or USER_FIELDS, sort, limit, cursor)
+        users, next_cursor = await fetch_page(get_client(), "/user", query)
+        return {"success": True, "users": users, "count": len(users), "next_cursor": next_cursor}
+    except ValueError as e:
+        return {"success": False, "error": f"Invalid query: {str(e)}"}
     except httpx.HTTPError as e:
         return {"success": False, "error": f"Failed to list users: {str(e)}"}
     except Exception as e:
@@ -104,17 +162,7 @@ async def get_user(username: str) -> Dict[str, Any]:
         username: Username to look up
     """
     try:
-        http_client = get_client()
-        response = await http_client.get("/user")
-        response.raise_for_status()
-        users = response.json()
-        
-        # Find the user by username
-        target_user = None
-        for user in users:
-            if user.get("username") == username:
-                target_user = user
-                break
+        target_user = await get_lookup_index().users.get(username)
         
         if not target_user:
             return {"success": False, "error": f"User '{username}' not found"}
@@ -147,34 +195,73 @@ async def get_user(username: str) -> Dict[str, Any]:
 async def get_system_info() -> Dict[str, Any]:
     """Get TrueNAS system information"""
     try:
+        ws = get_ws()
+        if ws:
+            return {"success": True, "info": await ws.call("system.info")}
         http_client = get_client()
         response = await http_client.get("/system/info")
         response.raise_for_status()
         return {"success": True, "info": response.json()}
     except httpx.HTTPError as e:
         return {"success": False, "error": f"Failed to get system info: {str(e)}"}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
 
 # Storage Management Tools
 
 @mcp.tool()
-async def list_pools() -> Dict[str, Any]:
-    """List all storage pools"""
+async def list_pools(
+    filters: Optional[FilterSpec] = None,
+    select: Optional[List[str]] = None,
+    sort: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    List storage pools
+    
+    Args:
+        filters: {"field": value} or [["field", "op", value], ...] (ops: =, !=, >, <, >=, <=, ~, ^, $)
+        select: Fields to return, dotted paths for nested values (default: all)
+        sort: Fields to sort by, "-" prefix for descending
+        limit: Maximum number of pools to return
+        cursor: next_cursor from a previous call with the same query
+    """
     try:
-        http_client = get_client()
-        response = await http_client.get("/pool")
-        response.raise_for_status()
-        return {"success": True, "pools": response.json()}
+        query = Query.build(filters, select, sort, limit, cursor)
+        pools, next_cursor = await fetch_page(get_client(), "/pool", query)
+        return {"success": True, "pools": pools, "count": len(pools), "next_cursor": next_cursor}
+    except ValueError as e:
+        return {"success": False, "error": f"Invalid query: {str(e)}"}
     except httpx.HTTPError as e:
         return {"success": False, "error": f"Failed to list pools: {str(e)}"}
 
 @mcp.tool()
-async def list_datasets() -> Dict[str, Any]:
-    """List all datasets"""
+async def list_datasets(
+    filters: Optional[FilterSpec] = None,
+    select: Optional[List[str]] = None,
+    sort: Optional[List[str]] = None,
+    limit: Optional[int] = 100,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    List datasets, one page at a time
+    
+    Args:
+        filters: {"field": value} or [["field", "op", value], ...] (ops: =, !=, >, <, >=, <=, ~, ^, $)
+                 Example: [["name", "^", "tank/k8s/"]]
+        select: Fields to return, dotted paths for nested values
+                (e.g. ["name", "used.parsed", "compression.value"]; default: all)
+        sort: Fields to sort by, "-" prefix for descending
+        limit: Datasets per page (default: 100; null reads the whole tree page by page)
+        cursor: next_cursor from a previous call with the same query
+    """
     try:
-        http_client = get_client()
-        response = await http_client.get("/pool/dataset")
-        response.raise_for_status()
-        return {"success": True, "datasets": response.json()}
+        query = Query.build(filters, select, sort, limit, cursor)
+        datasets, next_cursor = await fetch_page(get_client(), "/pool/dataset", query)
+        return {"success": True, "datasets": datasets, "count": len(datasets), "next_cursor": next_cursor}
+    except ValueError as e:
+        return {"success": False, "error": f"Invalid query: {str(e)}"}
     except httpx.HTTPError as e:
         return {"success": False, "error": f"Failed to list datasets: {str(e)}"}
 
@@ -187,10 +274,10 @@ async def get_pool_status(pool_name: str) -> Dict[str, Any]:
         pool_name: Name of the pool
     """
     try:
-        http_client = get_client()
-        response = await http_client.get(f"/pool/id/{pool_name}")
-        response.raise_for_status()
-        pool_data = response.json()
+        # Pool ids are numeric; resolve by name and always revalidate the status
+        pool_data = await get_lookup_index().pools.get(pool_name, refresh=True)
+        if not pool_data:
+            return {"success": False, "error": f"Pool '{pool_name}' not found"}
         
         # Extract relevant status information
         return {
@@ -209,6 +296,56 @@ async def get_pool_status(pool_name: str) -> Dict[str, Any]:
     except httpx.HTTPError as e:
         return {"success": False, "error": f"Failed to get pool status: {str(e)}"}
 
+async def _gather_pool_health() -> Dict[str, Any]:
+    """Fetch pools, scrub schedules and alerts concurrently"""
+    http_client = get_client()
+    
+    async def fetch(path: str) -> Any:
+        response = await http_client.get(path)
+        response.raise_for_status()
+        return response.json()
+    
+    async def fetch_alerts() -> List[Dict[str, Any]]:
+        ws = get_ws()
+        return await ws.call("alert.list") if ws else await fetch("/alert/list")
+    
+    pools, scrub_tasks, alerts = await asyncio.gather(
+        fetch("/pool"), fetch("/pool/scrub"), fetch_alerts(), return_exceptions=True
+    )
+    if isinstance(pools, BaseException):
+        raise pools
+    
+    # Scrub schedules and alerts are optional; report what could not be fetched
+    errors = {}
+    if isinstance(scrub_tasks, BaseException):
+        errors["scrub_tasks"] = error_message(scrub_tasks)
+        scrub_tasks = None
+    if isinstance(alerts, BaseException):
+        errors["alerts"] = error_message(alerts)
+        alerts = []
+    return {"pools": pools, "scrub_tasks": scrub_tasks, "alerts": alerts, "errors": errors}
+
+@mcp.tool()
+async def pool_health_overview(max_age_seconds: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Health and capacity overview of all pools
+    
+    Gathers pools, topology, scrub state and alerts in one call and derives
+    used %, fragmentation trend and projected days-to-full from sampled
+    history. Snapshots are cached (TRUENAS_POOL_HEALTH_CACHE seconds).
+    
+    Args:
+        max_age_seconds: Accept a cached snapshot up to this old (0 forces a refresh)
+    """
+    try:
+        monitor = get_health_monitor()
+        overview = await monitor.get(_gather_pool_health, max_age_seconds)
+        return {"success": True, **overview}
+    except httpx.HTTPError as e:
+        return {"success": False, "error": f"Failed to get pool health: {str(e)}"}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+
 @mcp.tool()
 async def create_dataset(
     pool: str,
@@ -237,6 +374,7 @@ async def create_dataset(
         
         response = await http_client.post("/pool/dataset", json=data)
         response.raise_for_status()
+        get_lookup_index().invalidate_dataset(data["name"])
         return {"success": True, "dataset": response.json()}
     except httpx.HTTPError as e:
         return {"success": False, "error": f"Failed to create dataset: {str(e)}"}
@@ -244,13 +382,29 @@ async def create_dataset(
 # Sharing Tools
 
 @mcp.tool()
-async def list_smb_shares() -> Dict[str, Any]:
-    """List all SMB shares"""
+async def list_smb_shares(
+    filters: Optional[FilterSpec] = None,
+    select: Optional[List[str]] = None,
+    sort: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    List SMB shares
+    
+    Args:
+        filters: {"field": value} or [["field", "op", value], ...] (ops: =, !=, >, <, >=, <=, ~, ^, $)
+        select: Fields to return (default: all)
+        sort: Fields to sort by, "-" prefix for descending
+        limit: Maximum number of shares to return
+        cursor: next_cursor from a previous call with the same query
+    """
     try:
-        http_client = get_client()
-        response = await http_client.get("/sharing/smb")
-        response.raise_for_status()
-        return {"success": True, "shares": response.json()}
+        query = Query.build(filters, select, sort, limit, cursor)
+        shares, next_cursor = await fetch_page(get_client(), "/sharing/smb", query)
+        return {"success": True, "shares": shares, "count": len(shares), "next_cursor": next_cursor}
+    except ValueError as e:
+        return {"success": False, "error": f"Invalid query: {str(e)}"}
     except httpx.HTTPError as e:
         return {"success": False, "error": f"Failed to list SMB shares: {str(e)}"}
 
@@ -319,6 +473,59 @@ async def create_snapshot(
 
 # Dataset Permission Management Tools
 
+def _setperm_payload(
+    dataset: str,
+    mode: Optional[str],
+    owner: Optional[str],
+    group: Optional[str],
+    recursive: bool
+) -> Dict[str, Any]:
+    """Build the /filesystem/setperm payload for a dataset"""
+    data = {
+        "path": f"/mnt/{dataset}",
+        "options": {}
+    }
+    
+    if mode:
+        data["mode"] = mode
+    if owner:
+        data["uid"] = owner if isinstance(owner, int) else None
+        data["user"] = owner if isinstance(owner, str) else None
+    if group:
+        data["gid"] = group if isinstance(group, int) else None
+        data["group"] = group if isinstance(group, str) else None
+    
+    if recursive:
+        data["options"]["recursive"] = True
+        data["options"]["traverse"] = True
+    return data
+
+def _setacl_payload(
+    dataset: str,
+    acl_entries: List[Dict[str, Any]],
+    recursive: bool,
+    strip_acl: bool
+) -> Dict[str, Any]:
+    """Build the /filesystem/setacl payload for a dataset"""
+    if strip_acl:
+        # Strip ACLs and revert to Unix permissions
+        return {
+            "path": f"/mnt/{dataset}",
+            "options": {
+                "stripacl": True,
+                "recursive": recursive
+            }
+        }
+    # Apply new ACL entries
+    return {
+        "path": f"/mnt/{dataset}",
+        "dacl": acl_entries,
+        "options": {
+            "recursive": recursive,
+            "traverse": recursive
+        }
+    }
+
 @mcp.tool()
 async def modify_dataset_permissions(
     dataset: str,
@@ -339,28 +546,11 @@ async def modify_dataset_permissions(
     """
     try:
         http_client = get_client()
-        
-        # Build the permission update payload
-        data = {
-            "path": f"/mnt/{dataset}",
-            "options": {}
-        }
-        
-        if mode:
-            data["mode"] = mode
-        if owner:
-            data["uid"] = owner if isinstance(owner, int) else None
-            data["user"] = owner if isinstance(owner, str) else None
-        if group:
-            data["gid"] = group if isinstance(group, int) else None
-            data["group"] = group if isinstance(group, str) else None
-        
-        if recursive:
-            data["options"]["recursive"] = True
-            data["options"]["traverse"] = True
+        data = _setperm_payload(dataset, mode, owner, group, recursive)
         
         response = await http_client.post("/filesystem/setperm", json=data)
         response.raise_for_status()
+        get_lookup_index().invalidate_dataset(dataset)
         
         return {
             "success": True,
@@ -396,29 +586,11 @@ async def update_dataset_acl(
     """
     try:
         http_client = get_client()
-        
-        if strip_acl:
-            # Strip ACLs and revert to Unix permissions
-            data = {
-                "path": f"/mnt/{dataset}",
-                "options": {
-                    "stripacl": True,
-                    "recursive": recursive
-                }
-            }
-        else:
-            # Apply new ACL entries
-            data = {
-                "path": f"/mnt/{dataset}",
-                "dacl": acl_entries,
-                "options": {
-                    "recursive": recursive,
-                    "traverse": recursive
-                }
-            }
+        data = _setacl_payload(dataset, acl_entries, recursive, strip_acl)
         
         response = await http_client.post("/filesystem/setacl", json=data)
         response.raise_for_status()
+        get_lookup_index().invalidate_dataset(dataset)
         
         return {
             "success": True,
@@ -475,6 +647,16 @@ async def get_dataset_permissions(dataset: str) -> Dict[str, Any]:
 
 # Dataset Property Management
 
+def _convert_properties(properties: Dict[str, Union[str, int, bool]]) -> Dict[str, Any]:
+    """Convert human-readable sizes ("10G") in size properties to bytes"""
+    converted_props = {}
+    for key, value in properties.items():
+        if key in ["quota", "refquota", "reservation", "refreservation"] and isinstance(value, str):
+            converted_props[key] = _parse_size(value)
+        else:
+            converted_props[key] = value
+    return converted_props
+
 @mcp.tool()
 async def modify_dataset_properties(
     dataset: str,
@@ -490,39 +672,29 @@ async def modify_dataset_properties(
     """
     try:
         http_client = get_client()
-        
-        # Convert human-readable sizes to bytes if needed
-        converted_props = {}
-        for key, value in properties.items():
-            if key in ["quota", "refquota", "reservation", "refreservation"] and isinstance(value, str):
-                # Convert sizes like "10G" to bytes
-                converted_props[key] = _parse_size(value)
-            else:
-                converted_props[key] = value
+        converted_props = _convert_properties(properties)
         
         # Get dataset ID first
-        datasets_response = await http_client.get("/pool/dataset")
-        datasets_response.raise_for_status()
-        datasets = datasets_response.json()
+        index = get_lookup_index()
+        target_dataset = await index.datasets.get(dataset)
         
-        dataset_id = None
-        for ds in datasets:
-            if ds.get("name") == dataset:
-                dataset_id = ds.get("id")
-                break
-        
-        if not dataset_id:
+        if not target_dataset:
             return {"success": False, "error": f"Dataset '{dataset}' not found"}
         
         # Update dataset properties
+        dataset_id = quote(str(target_dataset.get("id", dataset)), safe="")
         response = await http_client.put(f"/pool/dataset/id/{dataset_id}", json=converted_props)
         response.raise_for_status()
+        updated = response.json()
+        
+        index.invalidate_dataset(dataset)
+        index.datasets.put(dataset, updated)
         
         return {
             "success": True,
             "message": f"Properties updated for dataset {dataset}",
             "updated_properties": list(properties.keys()),
-            "dataset": response.json()
+            "dataset": updated
         }
     except httpx.HTTPError as e:
         return {"success": False, "error": f"Failed to modify properties: {str(e)}"}
@@ -538,18 +710,8 @@ async def get_dataset_properties(dataset: str) -> Dict[str, Any]:
         dataset: Dataset path (e.g., "tank/data")
     """
     try:
-        http_client = get_client()
-        
         # Get dataset information
-        response = await http_client.get("/pool/dataset")
-        response.raise_for_status()
-        datasets = response.json()
-        
-        target_dataset = None
-        for ds in datasets:
-            if ds.get("name") == dataset:
-                target_dataset = ds
-                break
+        target_dataset = await get_lookup_index().datasets.get(dataset)
         
         if not target_dataset:
             return {"success": False, "error": f"Dataset '{dataset}' not found"}
@@ -585,6 +747,190 @@ async def get_dataset_properties(dataset: str) -> Dict[str, Any]:
     except Exception as e:
         return {"success": False, "error": f"Unexpected error: {str(e)}"}
 
+# Bulk Dataset Operations
+
+def _common_dataset_prefix(names: List[str]) -> str:
+    """Longest dataset path shared by all names (e.g. "tank/k8s"), or "" """
+    parts = [name.split("/") for name in names]
+    common = []
+    for components in zip(*parts):
+        if len(set(components)) != 1:
+            break
+        common.append(components[0])
+    return "/".join(common)
+
+async def _resolve_datasets(datasets: List[str], include_children: bool) -> Dict[str, Any]:
+    """
+    Resolve dataset names, and optionally their descendants, from one listing
+    
+    The listing is narrowed to the common parent of the requested datasets and
+    only ids and names are kept from each page.
+    """
+    prefix = _common_dataset_prefix(datasets)
+    query = Query.build(filters=[["name", "^", prefix]] if prefix else None, select=["id", "name"])
+    known = {}
+    async for page in iterate_pages(get_client(), "/pool/dataset", query):
+        for entry in page:
+            known[entry["name"]] = entry.get("id", entry["name"])
+    
+    resolved: Dict[str, Any] = {}
+    for name in datasets:
+        if name not in known:
+            continue
+        resolved[name] = known[name]
+        if include_children:
+            for child in sorted(known):
+                if child.startswith(f"{name}/"):
+                    resolved[child] = known[child]
+    return {
+        "resolved": resolved,
+        "missing": [name for name in datasets if name not in known]
+    }
+
+async def _apply_to_datasets(
+    datasets: List[str],
+    include_children: bool,
+    max_concurrency: int,
+    apply
+) -> Dict[str, Any]:
+    """Resolve datasets once, run ``apply(name, id)`` on each with bounded concurrency and time every call"""
+    start = time.perf_counter()
+    resolution = await _resolve_datasets(datasets, include_children)
+    resolve_ms = round((time.perf_counter() - start) * 1000, 1)
+    
+    async def run(item) -> Dict[str, Any]:
+        name, dataset_id = item
+        item_start = time.perf_counter()
+        try:
+            await apply(name, dataset_id)
+            result = {"dataset": name, "success": True}
+        except Exception as e:
+            result = {"dataset": name, "success": False, "error": error_message(e)}
+        finally:
+            get_lookup_index().invalidate_dataset(name)
+        result["elapsed_ms"] = round((time.perf_counter() - item_start) * 1000, 1)
+        return result
+    
+    results = await run_bounded(list(resolution["resolved"].items()), run, max_concurrency)
+    failed = [result["dataset"] for result in results if not result["success"]]
+    return {
+        "success": not failed and not resolution["missing"],
+        "updated": len(results) - len(failed),
+        "failed": failed,
+        "missing": resolution["missing"],
+        "max_concurrency": max_concurrency,
+        "timing": {
+            "resolve_ms": resolve_ms,
+            "total_ms": round((time.perf_counter() - start) * 1000, 1)
+        },
+        "results": results
+    }
+
+@mcp.tool()
+async def bulk_modify_dataset_properties(
+    datasets: List[str],
+    properties: Dict[str, Union[str, int, bool]],
+    include_children: bool = False,
+    max_concurrency: int = 8
+) -> Dict[str, Any]:
+    """
+    Modify ZFS properties on many datasets at once
+    
+    Args:
+        datasets: Dataset paths (e.g., ["tank/k8s/vol1", "tank/k8s/vol2"])
+        properties: Properties to set on each, e.g. {"compression": "zstd", "quota": "10G"}
+        include_children: Also apply to every descendant dataset
+        max_concurrency: Maximum concurrent updates
+    """
+    try:
+        http_client = get_client()
+        converted_props = _convert_properties(properties)
+        
+        async def apply(name: str, dataset_id: Any) -> None:
+            response = await http_client.put(f"/pool/dataset/id/{quote(str(dataset_id), safe='')}", json=converted_props)
+            response.raise_for_status()
+        
+        summary = await _apply_to_datasets(datasets, include_children, max_concurrency, apply)
+        return {"updated_properties": list(properties.keys()), **summary}
+    except httpx.HTTPError as e:
+        return {"success": False, "error": f"Failed to resolve datasets: {str(e)}"}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+
+@mcp.tool()
+async def bulk_modify_dataset_permissions(
+    datasets: List[str],
+    mode: Optional[str] = None,
+    owner: Optional[str] = None,
+    group: Optional[str] = None,
+    recursive: bool = False,
+    include_children: bool = False,
+    max_concurrency: int = 8
+) -> Dict[str, Any]:
+    """
+    Modify permissions (chmod/chown equivalent) on many datasets at once
+    
+    Args:
+        datasets: Dataset paths (e.g., ["tank/share1", "tank/share2"])
+        mode: Unix permission mode (e.g., "755", "644")
+        owner: Owner username or UID
+        group: Group name or GID
+        recursive: Apply to files and directories inside each dataset
+        include_children: Also apply to every descendant dataset
+        max_concurrency: Maximum concurrent updates
+    """
+    try:
+        http_client = get_client()
+        
+        async def apply(name: str, dataset_id: Any) -> None:
+            response = await http_client.post(
+                "/filesystem/setperm",
+                json=_setperm_payload(name, mode, owner, group, recursive)
+            )
+            response.raise_for_status()
+        
+        return await _apply_to_datasets(datasets, include_children, max_concurrency, apply)
+    except httpx.HTTPError as e:
+        return {"success": False, "error": f"Failed to resolve datasets: {str(e)}"}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+
+@mcp.tool()
+async def bulk_update_dataset_acl(
+    datasets: List[str],
+    acl_entries: List[Dict[str, Any]],
+    recursive: bool = False,
+    strip_acl: bool = False,
+    include_children: bool = False,
+    max_concurrency: int = 8
+) -> Dict[str, Any]:
+    """
+    Update Access Control Lists on many datasets at once
+    
+    Args:
+        datasets: Dataset paths (e.g., ["tank/share1", "tank/share2"])
+        acl_entries: ACL entries applied to each dataset
+        recursive: Apply to files and directories inside each dataset
+        strip_acl: Remove all ACLs and revert to Unix permissions
+        include_children: Also apply to every descendant dataset
+        max_concurrency: Maximum concurrent updates
+    """
+    try:
+        http_client = get_client()
+        
+        async def apply(name: str, dataset_id: Any) -> None:
+            response = await http_client.post(
+                "/filesystem/setacl",
+                json=_setacl_payload(name, acl_entries, recursive, strip_acl)
+            )
+            response.raise_for_status()
+        
+        return await _apply_to_datasets(datasets, include_children, max_concurrency, apply)
+    except httpx.HTTPError as e:
+        return {"success": False, "error": f"Failed to resolve datasets: {str(e)}"}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+
 # Kubernetes Storage Integration
 
 @mcp.tool()
@@ -641,77 +987,231 @@ async def create_nfs_export(
     except Exception as e:
         return {"success": False, "error": f"Unexpected error: {str(e)}"}
 
+def _iscsi_target_steps(
+    name: str,
+    dataset: str,
+    size: str,
+    portal_id: int = 1,
+    initiator_id: Optional[int] = None,
+    create_zvol: bool = True,
+    sparse: bool = False
+) -> List[Step]:
+    """Ordered zvol -> extent -> target -> mapping steps, each with a compensating delete"""
+    http_client = get_client()
+    zvol = f"{dataset}/{name}"
+    volsize = _parse_size(size)
+    
+    async def post(path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        response = await http_client.post(path, json=data)
+        response.raise_for_status()
+        return response.json()
+    
+    async def delete(path: str) -> None:
+        response = await http_client.delete(path)
+        response.raise_for_status()
+    
+    async def create_volume(context: Dict[str, Any]) -> Dict[str, Any]:
+        volume = await post("/pool/dataset", {
+            "name": zvol,
+            "type": "VOLUME",
+            "volsize": volsize,
+            "sparse": sparse
+        })
+        get_lookup_index().invalidate_dataset(zvol)
+        return volume
+    
+    async def delete_volume(volume: Dict[str, Any]) -> None:
+        await delete(f"/pool/dataset/id/{quote(zvol, safe='')}")
+        get_lookup_index().invalidate_dataset(zvol)
+    
+    group = {"portal": portal_id, "authmethod": "NONE"}
+    if initiator_id is not None:
+        group["initiator"] = initiator_id
+    
+    steps = []
+    if create_zvol:
+        steps.append(Step("zvol", create_volume, delete_volume))
+    steps += [
+        Step(
+            "extent",
+            lambda context: post("/iscsi/extent", {
+                "name": f"{name}-extent",
+                "type": "DISK",
+                "disk": f"zvol/{zvol}",
+                "blocksize": 512,
+                "rpm": "SSD",
+                "enabled": True
+            }),
+            lambda extent: delete(f"/iscsi/extent/id/{extent['id']}")
+        ),
+        Step(
+            "target",
+            lambda context: post("/iscsi/target", {
+                "name": f"iqn.2025-01.com.truenas:{name}",
+                "alias": name,
+                "mode": "ISCSI",
+                "groups": [group]
+            }),
+            lambda target: delete(f"/iscsi/target/id/{target['id']}")
+        ),
+        Step(
+            "mapping",
+            lambda context: post("/iscsi/targetextent", {
+                "target": context["target"]["id"],
+                "extent": context["extent"]["id"],
+                "lunid": 0
+            }),
+            lambda mapping: delete(f"/iscsi/targetextent/id/{mapping['id']}")
+        ),
+    ]
+    return steps
+
 @mcp.tool()
 async def create_iscsi_target(
     name: str,
     dataset: str,
     size: str,
-    portal_id: int = 1
+    portal_id: int = 1,
+    create_zvol: bool = False
 ) -> Dict[str, Any]:
     """
     Create an iSCSI target for Kubernetes block storage
     
+    Extent, target and mapping are created in order; if a step fails the
+    ones already created are deleted again.
+    
     Args:
         name: Target name (e.g., "k8s-block-01")
-        dataset: Dataset for storing the iSCSI extent
+        dataset: Dataset holding the zvol (the extent uses zvol/<dataset>/<name>)
         size: Size of the iSCSI extent (e.g., "100G")
         portal_id: iSCSI portal ID to use
+        create_zvol: Also create the backing zvol
     """
     try:
-        http_client = get_client()
-        
-        # First, create the extent (LUN)
-        extent_data = {
-            "name": f"{name}-extent",
-            "type": "DISK",
-            "disk": f"zvol/{dataset}/{name}",
-            "filesize": _parse_size(size),
-            "blocksize": 512,
-            "rpm": "SSD",
-            "enabled": True
-        }
-        
-        extent_response = await http_client.post("/iscsi/extent", json=extent_data)
-        extent_response.raise_for_status()
-        extent = extent_response.json()
-        
-        # Create the target
-        target_data = {
-            "name": f"iqn.2025-01.com.truenas:{name}",
-            "alias": name,
-            "mode": "ISCSI",
-            "groups": []
-        }
-        
-        target_response = await http_client.post("/iscsi/target", json=target_data)
-        target_response.raise_for_status()
-        target = target_response.json()
-        
-        # Create target-extent mapping
-        mapping_data = {
-            "target": target["id"],
-            "extent": extent["id"],
-            "lunid": 0
-        }
-        
-        mapping_response = await http_client.post("/iscsi/targetextent", json=mapping_data)
-        mapping_response.raise_for_status()
+        outcome = await run_transaction(
+            _iscsi_target_steps(name, dataset, size, portal_id, create_zvol=create_zvol)
+        )
+        if not outcome["success"]:
+            return {
+                "success": False,
+                "error": f"Failed to create iSCSI target at step '{outcome['failed_step']}': {outcome['error']}",
+                "steps": outcome["steps"],
+                "rollback": outcome["rollback"]
+            }
         
         return {
             "success": True,
             "message": f"iSCSI target created: {name}",
-            "target": target,
-            "extent": extent,
+            "target": outcome["results"]["target"],
+            "extent": outcome["results"]["extent"],
+            "steps": outcome["steps"],
             "k8s_example": {
                 "storage_class": _generate_iscsi_storageclass(name),
                 "pv_example": _generate_iscsi_pv_example(name, size)
             }
         }
-    except httpx.HTTPError as e:
-        return {"success": False, "error": f"Failed to create iSCSI target: {str(e)}"}
     except Exception as e:
         return {"success": False, "error": f"Unexpected error: {str(e)}"}
 
+@mcp.tool()
+async def provision_iscsi_targets(
+    targets: List[Dict[str, Any]],
+    dataset: Optional[str] = None,
+    portal_id: int = 1,
+    initiator_id: Optional[int] = None,
+    create_zvol: bool = True,
+    sparse: bool = False,
+    max_concurrency: int = 4
+) -> Dict[str, Any]:
+    """
+    Provision many iSCSI targets (zvol, extent, target, LUN mapping) in one call
+    
+    Targets are provisioned concurrently; the steps of each target run in
+    order and a failure deletes whatever that target had already created.
+    
+    Args:
+        targets: [{"name": "k8s-block-01", "size": "100G", "dataset": "tank/k8s", "sparse": true}, ...]
+                 ("dataset" and "sparse" default to the arguments below)
+        dataset: Default dataset holding the zvols
+        portal_id: iSCSI portal ID for every target
+        initiator_id: Optional authorized initiator group ID
+        create_zvol: Create each backing zvol (disable for existing zvols)
+        sparse: Create thin-provisioned zvols
+        max_concurrency: Maximum number of targets provisioned at once
+    """
+    start = time.perf_counter()
+    
+    # Validate everything up front so a bad entry costs no API calls
+    seen = set()
+    plans = []
+    for index, spec in enumerate(targets):
+        name = spec.get("name")
+        parent = spec.get("dataset", dataset)
+        problem = None
+        if not name or not spec.get("size") or not parent:
+            problem = "each target needs name, size and dataset"
+        elif name in seen:
+            problem = f"duplicate target name '{name}'"
+        else:
+            try:
+                _parse_size(str(spec["size"]))
+            except ValueError:
+                problem = f"invalid size '{spec['size']}'"
+        seen.add(name)
+        plans.append((index, spec, parent, problem))
+    
+    async def provision(plan) -> Dict[str, Any]:
+        index, spec, parent, problem = plan
+        name = spec.get("name") or f"#{index}"
+        if problem:
+            return {"name": name, "success": False, "error": problem, "steps": [], "elapsed_ms": 0.0}
+        outcome = await run_transaction(_iscsi_target_steps(
+            name,
+            parent,
+            str(spec["size"]),
+            portal_id,
+            initiator_id=initiator_id,
+            create_zvol=create_zvol,
+            sparse=spec.get("sparse", sparse)
+        ))
+        result = {
+            "name": name,
+            "success": outcome["success"],
+            "steps": outcome["steps"],
+            "elapsed_ms": outcome["elapsed_ms"]
+        }
+        if outcome["success"]:
+            result.update({
+                "iqn": outcome["results"]["target"].get("name"),
+                "target_id": outcome["results"]["target"].get("id"),
+                "extent_id": outcome["results"]["extent"].get("id"),
+                "zvol": f"{parent}/{name}"
+            })
+        else:
+            result.update({
+                "error": f"step '{outcome['failed_step']}': {outcome['error']}",
+                "rollback": outcome["rollback"],
+                "rolled_back": outcome["rolled_back"]
+            })
+        return result
+    
+    try:
+        results = await run_bounded(plans, provision, max_concurrency)
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+    
+    succeeded = [result["name"] for result in results if result["success"]]
+    failed = [result["name"] for result in results if not result["success"]]
+    return {
+        "success": not failed,
+        "message": f"Provisioned {len(succeeded)} of {len(results)} iSCSI targets",
+        "succeeded": succeeded,
+        "failed": failed,
+        "max_concurrency": max_concurrency,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        "targets": results
+    }
+
 # Snapshot Policy Management
 
 @mcp.tool()
@@ -762,6 +1262,161 @@ async def create_snapshot_policy(
     except Exception as e:
         return {"success": False, "error": f"Unexpected error: {str(e)}"}
 
+# Job Tracking
+
+async def _start_job(method: str, params: List[Any], rest_path: str, body: Any = None) -> int:
+    """Start a middleware job over the websocket when enabled, else over REST; returns the job id"""
+    ws = get_ws()
+    if ws:
+        return await ws.call(method, *params)
+    response = await get_client().post(rest_path, json=body)
+    response.raise_for_status()
+    return response.json()
+
+async def _wait_for_job(job_id: int, timeout: float) -> Dict[str, Any]:
+    """
+    Wait for a job to finish; returns the last known job state
+    
+    With the websocket transport the job's completion event is awaited; over
+    REST the job is polled every TRUENAS_JOB_POLL_INTERVAL seconds.
+    """
+    ws = get_ws()
+    if ws:
+        try:
+            return {**await ws.wait_job(job_id, timeout), "timed_out": False}
+        except asyncio.TimeoutError:
+            return {**ws.jobs.get(job_id, {"id": job_id}), "timed_out": True}
+    
+    http_client = get_client()
+    interval = float(os.getenv("TRUENAS_JOB_POLL_INTERVAL", "2"))
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        response = await http_client.get("/core/get_jobs", params={"id": job_id})
+        response.raise_for_status()
+        jobs = response.json()
+        job = jobs[0] if jobs else {"id": job_id, "state": None}
+        if job.get("state") in JOB_FINAL_STATES:
+            return {**job, "timed_out": False}
+        if asyncio.get_running_loop().time() + interval > deadline:
+            return {**job, "timed_out": True}
+        await asyncio.sleep(interval)
+
+def _job_summary(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": job.get("id"),
+        "method": job.get("method"),
+        "state": job.get("state"),
+        "progress": job.get("progress"),
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "time_started": job.get("time_started"),
+        "time_finished": job.get("time_finished"),
+        "timed_out": job.get("timed_out", False)
+    }
+
+@mcp.tool()
+async def get_job_status(job_id: int, wait: bool = False, timeout: int = 300) -> Dict[str, Any]:
+    """
+    Get the state of a middleware job (scrub, replication, ...)
+    
+    Args:
+        job_id: Job ID returned by the tool that started it
+        wait: Wait until the job finishes (SUCCESS, FAILED or ABORTED)
+        timeout: Maximum seconds to wait
+    """
+    try:
+        if wait:
+            return {"success": True, "job": _job_summary(await _wait_for_job(job_id, timeout))}
+        ws = get_ws()
+        if ws:
+            jobs = await ws.call("core.get_jobs", [["id", "=", job_id]])
+        else:
+            response = await get_client().get("/core/get_jobs", params={"id": job_id})
+            response.raise_for_status()
+            jobs = response.json()
+        if not jobs:
+            return {"success": False, "error": f"Job {job_id} not found"}
+        return {"success": True, "job": _job_summary(jobs[0])}
+    except httpx.HTTPError as e:
+        return {"success": False, "error": f"Failed to get job status: {str(e)}"}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+
+@mcp.tool()
+async def start_pool_scrub(pool_name: str, wait: bool = False, timeout: int = 3600) -> Dict[str, Any]:
+    """
+    Start a scrub of a pool, optionally waiting for it to finish
+    
+    Args:
+        pool_name: Name of the pool
+        wait: Wait for the scrub job to finish
+        timeout: Maximum seconds to wait
+    """
+    try:
+        pool = await get_lookup_index().pools.get(pool_name)
+        if not pool:
+            return {"success": False, "error": f"Pool '{pool_name}' not found"}
+        
+        job_id = await _start_job("pool.scrub", [pool["id"], "START"], f"/pool/id/{pool['id']}/scrub", "START")
+        result = {"success": True, "message": f"Scrub started on pool {pool_name}", "job_id": job_id}
+        if wait:
+            job = _job_summary(await _wait_for_job(job_id, timeout))
+            get_lookup_index().pools.invalidate(pool_name)
+            result["job"] = job
+            result["success"] = job["timed_out"] or job["state"] == "SUCCESS"
+        return result
+    except httpx.HTTPError as e:
+        return {"success": False, "error": f"Failed to start scrub: {str(e)}"}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+
+@mcp.tool()
+async def run_replication_task(task_id: int, wait: bool = False, timeout: int = 3600) -> Dict[str, Any]:
+    """
+    Run a replication task now, optionally waiting for it to finish
+    
+    Args:
+        task_id: Replication task ID
+        wait: Wait for the replication job to finish
+        timeout: Maximum seconds to wait
+    """
+    try:
+        job_id = await _start_job("replication.run", [task_id], f"/replication/id/{task_id}/run")
+        result = {"success": True, "message": f"Replication task {task_id} started", "job_id": job_id}
+        if wait:
+            job = _job_summary(await _wait_for_job(job_id, timeout))
+            result["job"] = job
+            result["success"] = job["timed_out"] or job["state"] == "SUCCESS"
+        return result
+    except httpx.HTTPError as e:
+        return {"success": False, "error": f"Failed to run replication task: {str(e)}"}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+
+@mcp.tool()
+async def list_alerts(include_dismissed: bool = False) -> Dict[str, Any]:
+    """
+    List current system alerts
+    
+    Args:
+        include_dismissed: Include alerts that have been dismissed
+    """
+    try:
+        ws = get_ws()
+        if ws:
+            alerts = await ws.call("alert.list")
+        else:
+            response = await get_client().get("/alert/list")
+            response.raise_for_status()
+            alerts = response.json()
+        if not include_dismissed:
+            alerts = [alert for alert in alerts if not alert.get("dismissed")]
+        return {"success": True, "alerts": alerts, "count": len(alerts)}
+    except httpx.HTTPError as e:
+        return {"success": False, "error": f"Failed to list alerts: {str(e)}"}
+    except Exception as e:
+        return {"success": False, "error": f"Unexpected error: {str(e)}"}
+
 # Helper functions
 
 def _parse_size(size_str: str) -> int:
@@ -868,11 +1523,14 @@ def _generate_iscsi_pv_example(name: str, size: str) -> dict:
 
 # Cleanup function
 async def cleanup():
-    """Cleanup the HTTP client"""
-    global client
+    """Cleanup the HTTP client and websocket"""
+    global client, ws_client
     if client:
         await client.aclose()
         client = None
+    if ws_client:
+        await ws_client.close()
+        ws_client = None
 
 def main():
     """Main entry point for the TrueNAS MCP server"""
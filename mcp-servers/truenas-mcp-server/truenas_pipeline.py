@@ -0,0 +1,109 @@
+"""
+TrueNAS Operation Pipelines
+Ordered steps with compensating actions, and bounded concurrency across items
+
+A transaction runs its steps in order, passing each step's result to later
+steps through a shared context. When a step fails, the steps that already
+completed are undone in reverse order. Independent items (e.g. one iSCSI
+target each) run concurrently under a semaphore, and every step is timed.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def error_message(error: BaseException) -> str:
+    """Error text, including the middleware's validation message for HTTP errors"""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"{error.response.status_code}: {error.response.text[:500]}"
+    return str(error) or type(error).__name__
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+@dataclass
+class Step:
+    """One pipeline step; ``undo`` receives the step's own result"""
+    name: str
+    action: Callable[[Dict[str, Any]], Awaitable[Any]]
+    undo: Optional[Callable[[Any], Awaitable[Any]]] = None
+
+
+async def _rollback(completed: List[Step], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    results = []
+    for step in reversed(completed):
+        if step.undo is None:
+            continue
+        start = time.perf_counter()
+        try:
+            await step.undo(context[step.name])
+            results.append({"step": step.name, "status": "undone", "elapsed_ms": _elapsed_ms(start)})
+        except Exception as e:
+            results.append({
+                "step": step.name,
+                "status": "undo_failed",
+                "error": error_message(e),
+                "elapsed_ms": _elapsed_ms(start)
+            })
+    return results
+
+
+async def run_transaction(steps: Sequence[Step]) -> Dict[str, Any]:
+    """
+    Run steps in order; on failure or cancellation undo completed steps in reverse
+
+    Returns the step results keyed by step name, per-step timing, and on
+    failure the failed step, its error and the rollback outcome.
+    """
+    context: Dict[str, Any] = {}
+    completed: List[Step] = []
+    timings: List[Dict[str, Any]] = []
+    start = time.perf_counter()
+
+    for step in steps:
+        step_start = time.perf_counter()
+        try:
+            context[step.name] = await step.action(context)
+        except (asyncio.CancelledError, Exception) as e:
+            timings.append({
+                "step": step.name,
+                "status": "failed",
+                "error": error_message(e),
+                "elapsed_ms": _elapsed_ms(step_start)
+            })
+            rollback = await _rollback(completed, context)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return {
+                "success": False,
+                "failed_step": step.name,
+                "error": error_message(e),
+                "steps": timings,
+                "rollback": rollback,
+                "rolled_back": all(entry["status"] == "undone" for entry in rollback),
+                "elapsed_ms": _elapsed_ms(start)
+            }
+        timings.append({"step": step.name, "status": "done", "elapsed_ms": _elapsed_ms(step_start)})
+        completed.append(step)
+
+    return {"success": True, "results": context, "steps": timings, "elapsed_ms": _elapsed_ms(start)}
+
+
+async def run_bounded(items: Sequence[T], worker: Callable[[T], Awaitable[R]], limit: int) -> List[R]:
+    """Apply ``worker`` to every item with at most ``limit`` running at once; results keep item order"""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            return await worker(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
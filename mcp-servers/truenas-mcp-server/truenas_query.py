@@ -0,0 +1,201 @@
+"""
+TrueNAS Query Builder
+Query filters, sorting, pagination and field selection for collection endpoints
+
+The v2.0 REST API takes query filters as ``field__op=value`` parameters and
+``limit``/``offset``/``sort`` as query options, so paging and filtering happen
+in the middleware. Field selection is applied to each page as it arrives, so
+only the selected fields are kept and returned to the caller. Cursors are
+opaque tokens bound to the query they were issued for.
+"""
+
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+import httpx
+
+# Filter operator -> REST parameter suffix
+FILTER_OPERATORS = {
+    "=": "",
+    "!=": "__neq",
+    ">": "__gt",
+    "<": "__lt",
+    ">=": "__gte",
+    "<=": "__lte",
+    "~": "__regex",
+    "^": "__^",
+    "$": "__$",
+}
+
+# Page size used when a caller asks for a whole collection
+DEFAULT_PAGE_SIZE = 500
+
+FilterSpec = Union[Dict[str, Any], List[List[Any]]]
+
+
+def _encode_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _select_path(item: Dict[str, Any], path: str, target: Dict[str, Any]) -> None:
+    """Copy ``item[a][b]`` for path "a.b" into ``target``, keeping the nesting"""
+    keys = path.split(".")
+    value: Any = item
+    for key in keys:
+        if not isinstance(value, dict) or key not in value:
+            return
+        value = value[key]
+    for key in keys[:-1]:
+        target = target.setdefault(key, {})
+    target[keys[-1]] = value
+
+
+@dataclass
+class Query:
+    """A filtered, sorted and paged view of one collection"""
+    filters: List[Tuple[str, str, Any]] = field(default_factory=list)
+    select: List[str] = field(default_factory=list)
+    sort: List[str] = field(default_factory=list)
+    limit: Optional[int] = None
+    offset: int = 0
+
+    @classmethod
+    def build(
+        cls,
+        filters: Optional[FilterSpec] = None,
+        select: Optional[List[str]] = None,
+        sort: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> "Query":
+        """
+        Validate tool arguments into a query
+
+        Args:
+            filters: {"field": value} for equality, or [["field", "op", value], ...]
+                     with op one of =, !=, >, <, >=, <=, ~ (regex), ^ (starts with), $ (ends with)
+            select: Fields to return; dotted paths select nested values ("compression.value")
+            sort: Fields to sort by; prefix with "-" for descending
+            limit: Maximum number of entries to return
+            cursor: next_cursor from a previous page of the same query
+
+        Raises:
+            ValueError: If a filter, limit or cursor is invalid
+        """
+        parsed = []
+        if isinstance(filters, dict):
+            parsed = [(name, "=", value) for name, value in filters.items()]
+        elif filters:
+            for spec in filters:
+                if not isinstance(spec, (list, tuple)) or len(spec) != 3:
+                    raise ValueError(f"Filter must be [field, operator, value], got {spec!r}")
+                name, op, value = spec
+                if op not in FILTER_OPERATORS:
+                    raise ValueError(f"Unsupported filter operator '{op}'")
+                parsed.append((str(name), op, value))
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1")
+
+        query = cls(filters=parsed, select=list(select or []), sort=list(sort or []), limit=limit)
+        if cursor:
+            query.offset = query._decode_cursor(cursor)
+        return query
+
+    def fingerprint(self) -> str:
+        spec = json.dumps([self.filters, self.select, self.sort, self.limit], default=str, sort_keys=True)
+        return hashlib.sha1(spec.encode()).hexdigest()[:12]
+
+    def cursor_at(self, offset: int) -> str:
+        token = json.dumps({"o": offset, "q": self.fingerprint()})
+        return base64.urlsafe_b64encode(token.encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> int:
+        try:
+            token = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            offset, fingerprint = int(token["o"]), token["q"]
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {e}")
+        if fingerprint != self.fingerprint():
+            raise ValueError("Cursor was issued for a different query")
+        return offset
+
+    def to_params(self, limit: Optional[int] = None, offset: Optional[int] = None) -> Dict[str, str]:
+        """REST query parameters for one page"""
+        params = {f"{name}{FILTER_OPERATORS[op]}": _encode_value(value) for name, op, value in self.filters}
+        if self.sort:
+            params["sort"] = ",".join(self.sort)
+        if limit is not None:
+            params["limit"] = str(limit)
+        offset = self.offset if offset is None else offset
+        if offset:
+            params["offset"] = str(offset)
+        return params
+
+    def project(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.select:
+            return item
+        selected: Dict[str, Any] = {}
+        for path in self.select:
+            _select_path(item, path, selected)
+        return selected
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "filters": [list(spec) for spec in self.filters],
+            "select": self.select or None,
+            "sort": self.sort or None,
+            "limit": self.limit,
+            "offset": self.offset
+        }
+
+
+async def iterate_pages(
+    http_client: httpx.AsyncClient,
+    endpoint: str,
+    query: Query,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield projected pages of a query until the collection is exhausted"""
+    offset = query.offset
+    while True:
+        response = await http_client.get(endpoint, params=query.to_params(limit=page_size, offset=offset))
+        response.raise_for_status()
+        items = response.json()
+        yield [query.project(item) for item in items]
+        # A short page ends the collection; an oversized one means the middleware ignored paging
+        if len(items) != page_size:
+            return
+        offset += page_size
+
+
+async def fetch_page(
+    http_client: httpx.AsyncClient,
+    endpoint: str,
+    query: Query,
+    page_size: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch the entries selected by ``query`` and the cursor of the next page
+
+    With a limit, one extra entry is requested to detect a following page.
+    Without one, the collection is read ``page_size`` entries at a time.
+    """
+    if query.limit is None:
+        results: List[Dict[str, Any]] = []
+        async for page in iterate_pages(http_client, endpoint, query, page_size):
+            results.extend(page)
+        return results, None
+
+    response = await http_client.get(endpoint, params=query.to_params(limit=query.limit + 1))
+    response.raise_for_status()
+    items = response.json()
+    next_cursor = None
+    if len(items) > query.limit:
+        items = items[:query.limit]
+        next_cursor = query.cursor_at(query.offset + query.limit)
+    return [query.project(item) for item in items], next_cursor
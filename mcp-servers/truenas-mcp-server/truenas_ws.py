@@ -0,0 +1,248 @@
+"""
+TrueNAS WebSocket Transport
+Persistent, authenticated middleware connection with job and alert subscriptions
+
+Method calls are multiplexed over one connection to the middleware's
+/websocket endpoint: each call carries an id and its result is matched by the
+reader task, so concurrent tool calls share the session instead of opening
+HTTPS requests. The connection subscribes to core.get_jobs and alert.list, so
+job progress and alerts arrive as events and callers can await a job's
+completion without polling.
+"""
+
+import asyncio
+import json
+import logging
+import ssl
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+logger = logging.getLogger(__name__)
+
+JOB_FINAL_STATES = frozenset({"SUCCESS", "FAILED", "ABORTED"})
+
+# Finished jobs kept for late waiters and get_job_status
+MAX_TRACKED_JOBS = 500
+
+
+class MiddlewareError(Exception):
+    """A middleware method call returned an error"""
+
+    def __init__(self, method: str, error: Dict[str, Any]):
+        self.method = method
+        self.error = error
+        super().__init__(f"{method}: {error.get('reason') or error.get('error') or error}")
+
+
+class TrueNASWebSocket:
+    """Multiplexed middleware connection (DDP-style protocol used by /websocket)"""
+
+    def __init__(self, url: str, api_key: str, verify_ssl: bool = True, call_timeout: float = 30.0):
+        if websockets is None:
+            raise RuntimeError("TRUENAS_WEBSOCKET requires the 'websockets' package (pip install websockets)")
+        self.url = url
+        self.api_key = api_key
+        self.verify_ssl = verify_ssl
+        self.call_timeout = call_timeout
+
+        self.jobs: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.alerts: Dict[str, Dict[str, Any]] = {}
+
+        self._ws = None
+        self._reader: Optional[asyncio.Task] = None
+        self._authenticated = False
+        self._connect_lock = asyncio.Lock()
+        self._pending: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self._job_waiters: Dict[int, List[asyncio.Future]] = {}
+        self.stats = {"connects": 0, "calls": 0, "errors": 0, "events": 0, "total_call_ms": 0.0}
+
+    @property
+    def connected(self) -> bool:
+        return (
+            self._authenticated and self._ws is not None
+            and self._reader is not None and not self._reader.done()
+        )
+
+    async def connect(self) -> None:
+        """Open, authenticate and subscribe; a no-op while connected"""
+        async with self._connect_lock:
+            if self.connected:
+                return
+            ssl_context = None
+            if self.url.startswith("wss://"):
+                ssl_context = ssl.create_default_context()
+                if not self.verify_ssl:
+                    ssl_context.check_hostname = False
+                    ssl_context.verify_mode = ssl.CERT_NONE
+
+            # Fully close a half-open session so the next call reconnects from scratch
+            await self.close()
+            ws = await websockets.connect(self.url, ssl=ssl_context, max_size=None)
+            try:
+                await ws.send(json.dumps({"msg": "connect", "version": "1", "support": ["1"]}))
+                reply = json.loads(await asyncio.wait_for(ws.recv(), self.call_timeout))
+                if reply.get("msg") != "connected":
+                    raise ConnectionError(f"Middleware refused the websocket session: {reply}")
+            except BaseException:
+                await ws.close()
+                raise
+
+            self._ws = ws
+            self._reader = asyncio.create_task(self._read_loop(ws))
+            self.stats["connects"] += 1
+
+            # Not connected until logged in and subscribed; any failure tears the session down
+            try:
+                if not await self._call("auth.login_with_api_key", [self.api_key]):
+                    raise PermissionError("Middleware rejected the API key")
+                for collection in ("core.get_jobs", "alert.list"):
+                    await ws.send(json.dumps({"id": str(uuid.uuid4()), "msg": "sub", "name": collection}))
+            except BaseException:
+                await self.close()
+                raise
+            self._authenticated = True
+            logger.info(f"Connected to TrueNAS middleware at {self.url}")
+
+    async def call(self, method: str, *params: Any, timeout: Optional[float] = None) -> Any:
+        """Call a middleware method, connecting first if needed"""
+        await self.connect()
+        return await self._call(method, list(params), timeout)
+
+    async def _call(self, method: str, params: List[Any], timeout: Optional[float] = None) -> Any:
+        ws = self._ws
+        if ws is None:
+            # The reader dropped the socket after connect() returned
+            raise ConnectionError("TrueNAS websocket connection closed")
+        call_id = str(uuid.uuid4())
+        future = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = (method, future)
+        start = time.perf_counter()
+        try:
+            await ws.send(json.dumps({"id": call_id, "msg": "method", "method": method, "params": params}))
+            return await asyncio.wait_for(future, timeout or self.call_timeout)
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            self._pending.pop(call_id, None)
+            self.stats["calls"] += 1
+            self.stats["total_call_ms"] += (time.perf_counter() - start) * 1000
+
+    async def wait_job(self, job_id: int, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for a job to reach SUCCESS, FAILED or ABORTED
+
+        Raises:
+            asyncio.TimeoutError: If the job is still running after ``timeout`` seconds
+        """
+        await self.connect()
+        job = self.jobs.get(job_id)
+        if job and job.get("state") in JOB_FINAL_STATES:
+            return job
+
+        future = asyncio.get_running_loop().create_future()
+        self._job_waiters.setdefault(job_id, []).append(future)
+        try:
+            # The job may have finished before the subscription saw it
+            if job is None:
+                found = await self._call("core.get_jobs", [[["id", "=", job_id]]])
+                if found:
+                    self._update_job(job_id, found[0])
+                if found and found[0].get("state") in JOB_FINAL_STATES:
+                    return found[0]
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            waiters = self._job_waiters.get(job_id, [])
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters:
+                self._job_waiters.pop(job_id, None)
+
+    async def _read_loop(self, ws) -> None:
+        try:
+            async for raw in ws:
+                self._dispatch(json.loads(raw))
+        except Exception as e:
+            logger.warning(f"TrueNAS websocket closed: {e}")
+        finally:
+            error = ConnectionError("TrueNAS websocket connection closed")
+            for _, future in list(self._pending.values()):
+                if not future.done():
+                    future.set_exception(error)
+            for waiters in self._job_waiters.values():
+                for future in waiters:
+                    if not future.done():
+                        future.set_exception(error)
+            if self._ws is ws:
+                self._ws = None
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        kind = message.get("msg")
+        if kind == "result":
+            method, future = self._pending.get(message.get("id"), (None, None))
+            if future is None or future.done():
+                return
+            if message.get("error"):
+                future.set_exception(MiddlewareError(method, message["error"]))
+            else:
+                future.set_result(message.get("result"))
+        elif kind in ("added", "changed", "removed"):
+            self.stats["events"] += 1
+            collection = message.get("collection")
+            if collection == "core.get_jobs":
+                self._update_job(message.get("id"), message.get("fields") or {})
+            elif collection == "alert.list":
+                alert_id = str(message.get("id"))
+                if kind == "removed":
+                    self.alerts.pop(alert_id, None)
+                else:
+                    self.alerts.setdefault(alert_id, {}).update(message.get("fields") or {})
+        elif kind == "ping" and self._ws is not None:
+            asyncio.ensure_future(self._ws.send(json.dumps({"msg": "pong", "id": message.get("id")})))
+
+    def _update_job(self, job_id: Any, fields: Dict[str, Any]) -> None:
+        if job_id is None:
+            return
+        job = self.jobs.setdefault(job_id, {"id": job_id})
+        job.update(fields)
+        self.jobs.move_to_end(job_id)
+        if job.get("state") in JOB_FINAL_STATES:
+            for future in self._job_waiters.get(job_id, []):
+                if not future.done():
+                    future.set_result(job)
+        while len(self.jobs) > MAX_TRACKED_JOBS:
+            oldest = next(iter(self.jobs))
+            if self.jobs[oldest].get("state") not in JOB_FINAL_STATES:
+                break
+            self.jobs.popitem(last=False)
+
+    async def close(self) -> None:
+        self._authenticated = False
+        ws, self._ws = self._ws, None
+        if ws is not None:
+            await ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        calls = self.stats["calls"]
+        return {
+            "url": self.url,
+            "connected": self.connected,
+            "connects": self.stats["connects"],
+            "calls": calls,
+            "errors": self.stats["errors"],
+            "avg_call_ms": round(self.stats["total_call_ms"] / calls, 1) if calls else None,
+            "in_flight": len(self._pending),
+            "events": self.stats["events"],
+            "tracked_jobs": len(self.jobs),
+            "active_alerts": len(self.alerts)
+        }